@@ -0,0 +1 @@
+"""Performance benchmarks; run separately from the unit tests."""
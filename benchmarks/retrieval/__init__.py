@@ -0,0 +1,8 @@
+"""Micro-benchmarks for the retrieval hot paths.
+
+Run with ``python -m benchmarks.retrieval``. Each case measures messages per
+second on synthetic data (see ``synthetic``) at each requested size, and
+results are compared with a JSON baseline. ``--save`` records a new
+baseline. Numbers depend on the machine, so only compare baselines taken
+on the same host.
+"""
@@ -0,0 +1,176 @@
+"""Run the retrieval benchmarks and compare them with a baseline.
+
+    python -m benchmarks.retrieval                      # compare with baseline.json
+    python -m benchmarks.retrieval --sizes 1000000 --cases parse,dedupe
+    python -m benchmarks.retrieval --save               # record a new baseline
+    python -m benchmarks.retrieval --recording run.jsonl.gz   # add a replay case
+    python -m benchmarks.retrieval --cases e2e_dom,e2e_network --sizes 2000
+    python -m benchmarks.retrieval --cases e2e_dom,e2e_dom_blocked   # blocking trade-off
+
+The ``e2e_*`` cases drive the full scroll loop in headless Chromium against
+``fake_discord`` and fail if any message is missing from the database.
+
+The exit status is 1 when any case is slower than its baseline by more than
+``--tolerance``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sqlite3
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from src.retrieval.replay import replay_recording
+
+from .cases import CASES, scratch_dir
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+FORMAT_VERSION = 1
+
+
+def machine() -> dict[str, str]:
+    return {
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+    }
+
+
+def measure(name: str, n: int, repeat: int) -> dict[str, float | int]:
+    """Best of ``repeat`` timed runs of one case, each on fresh state."""
+    case = CASES[name]
+    if case.max_n is not None:
+        n = min(n, case.max_n)
+    best = float("inf")
+    for _ in range(repeat):
+        with scratch_dir() as tmp:
+            state = case.setup(n, Path(tmp))
+            try:
+                started = time.perf_counter()
+                case.run(state)
+                best = min(best, time.perf_counter() - started)
+            finally:
+                if case.teardown is not None:
+                    case.teardown(state)
+    return {"n": n, "seconds": round(best, 6), "per_sec": round(n / best, 1)}
+
+
+def measure_replay(path: str, repeat: int) -> dict[str, float | int]:
+    reports = [replay_recording(path) for _ in range(repeat)]
+    best = min(reports, key=lambda r: r.seconds)
+    return {
+        "n": best.messages,
+        "seconds": round(best.seconds, 6),
+        "per_sec": round(best.messages_per_sec, 1),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, Any]],
+    baseline: dict[str, dict[str, Any]],
+    tolerance: float,
+) -> list[str]:
+    """Keys of results slower than their baseline by more than ``tolerance``."""
+    return [
+        key
+        for key, result in results.items()
+        if key in baseline
+        and result["per_sec"] < baseline[key]["per_sec"] * (1 - tolerance)
+    ]
+
+
+def load_baseline(path: Path) -> dict[str, Any] | None:
+    if not path.exists():
+        return None
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return data if data.get("version") == FORMAT_VERSION else None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.retrieval",
+        description="Messages/sec for parse, dedupe, insert and log emission",
+    )
+    parser.add_argument(
+        "--sizes", default="10000,100000", help="Comma-separated message counts"
+    )
+    parser.add_argument(
+        "--cases",
+        default=",".join(name for name, case in CASES.items() if case.default),
+        help=f"Comma-separated case names, from: {', '.join(CASES)}",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; best is kept")
+    parser.add_argument("--recording", help="Also time a replay of this --record file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.30,
+        help="Allowed slowdown before a case is flagged (0.3 = 30%%)",
+    )
+    parser.add_argument(
+        "--save", action="store_true", help="Merge these results into the baseline"
+    )
+    parser.add_argument("--out", type=Path, help="Also write these results as JSON")
+    args = parser.parse_args(argv)
+
+    names = [c for c in args.cases.split(",") if c]
+    unknown = sorted(set(names) - set(CASES))
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(unknown)}")
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    baseline = load_baseline(args.baseline)
+    base_results: dict[str, dict[str, Any]] = baseline["results"] if baseline else {}
+    if baseline and baseline.get("machine") != machine():
+        print("Note: baseline was recorded on a different machine\n")
+
+    results: dict[str, dict[str, Any]] = {}
+    for name in names:
+        for n in sizes:
+            result = measure(name, n, args.repeat)
+            key = f"{name}/{result['n']}"
+            if key in results:
+                continue  # clamped to a size already measured
+            results[key] = result
+            _print_row(key, result, base_results.get(key))
+    if args.recording:
+        results["replay"] = measure_replay(args.recording, args.repeat)
+        _print_row("replay", results["replay"], base_results.get("replay"))
+
+    document = {
+        "version": FORMAT_VERSION,
+        "created_at": datetime.now(UTC).isoformat(timespec="seconds"),
+        "machine": machine(),
+        "results": results,
+    }
+    if args.out:
+        args.out.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    if args.save:
+        if baseline and baseline.get("machine") == machine():
+            document["results"] = {**base_results, **results}
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, base_results, args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+def _print_row(key: str, result: dict[str, Any], base: dict[str, Any] | None) -> None:
+    delta = ""
+    if base:
+        delta = f"  {(result['per_sec'] / base['per_sec'] - 1) * 100:+6.1f}% vs baseline"
+    print(f"  {key:<22} {result['per_sec']:>14,.0f} msg/s  {result['seconds']:>9.4f}s{delta}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,191 @@
+"""Benchmark cases: what is timed, and the untimed setup it needs."""
+from __future__ import annotations
+
+import tempfile
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from src.retrieval.blocking import ResourceBlocker
+from src.retrieval.db import ScrapeDB
+from src.retrieval.discord_playwright_scraper import (
+    PlaywrightDiscordScraper,
+    clean_message_id,
+    parse_raw_messages,
+)
+from src.retrieval.logger import ComponentLogger
+from src.retrieval.scrape_session import ENGINES, PlaywrightScrapeSession, ScrapeProgress
+
+from . import synthetic
+from .fake_discord import FakeDiscord
+
+
+@dataclass(frozen=True)
+class Case:
+    name: str
+    # Builds fresh state for one timed run, in a scratch directory.
+    setup: Callable[[int, Path], Any]
+    run: Callable[[Any], None]
+    # Sizes above this are clamped; the clamped size is what gets reported.
+    max_n: int | None = None
+    # Untimed cleanup after the run, e.g. closing a browser.
+    teardown: Callable[[Any], None] | None = None
+    # Run when no --cases are given; cases needing Chromium are opt-in.
+    default: bool = True
+
+
+def _parse(n: int, _: Path) -> list[dict[str, Any]]:
+    return synthetic.raw_messages(n)
+
+
+def _run_parse(raw: list[dict[str, Any]]) -> None:
+    parse_raw_messages(raw, limit=len(raw))
+
+
+def _run_clean_id(raw: list[dict[str, Any]]) -> None:
+    for entry in raw:
+        clean_message_id(entry["id"])
+
+
+def _dedupe(n: int, _: Path) -> tuple[ScrapeProgress, list[Any]]:
+    progress = ScrapeProgress(synthetic.SERVER_ID, synthetic.CHANNEL_ID, None)
+    return progress, synthetic.scroll_passes(synthetic.messages(n))
+
+
+def _run_dedupe(state: tuple[ScrapeProgress, list[Any]]) -> None:
+    progress, passes = state
+    for batch in passes:
+        progress.add(batch)
+
+
+def _insert(n: int, tmp: Path) -> tuple[ScrapeDB, list[Any]]:
+    db = ScrapeDB(str(tmp / "bench.db"))
+    db.ensure_server(synthetic.SERVER_ID, "bench")
+    db.ensure_channel(synthetic.CHANNEL_ID, synthetic.SERVER_ID, "bench")
+    return db, synthetic.rows(n)
+
+
+def _run_insert_single(state: tuple[ScrapeDB, list[Any]]) -> None:
+    db, rows = state
+    for row in rows:
+        inserted = db.insert_message(
+            message_id=row.message_id,
+            channel_id=row.channel_id,
+            author_id=row.author_id,
+            author_name=row.author_name,
+            content=row.content,
+            timestamp=row.timestamp,
+            server_id=row.server_id,
+            reply_to_message_id=row.reply_to_message_id,
+            attachment_urls=row.attachment_urls,
+            has_attachments=row.has_attachments,
+        )
+        if not inserted:
+            raise RuntimeError(f"synthetic message {row.message_id} was not inserted")
+    db.close()
+
+
+def _run_insert_bulk(state: tuple[ScrapeDB, list[Any]]) -> None:
+    db, rows = state
+    # One transaction per scroll pass, as a scrape does.
+    for i in range(0, len(rows), 200):
+        db.insert_messages(rows[i : i + 200])
+    db.close()
+
+
+def _log(n: int, tmp: Path) -> tuple[ComponentLogger, int]:
+    return ComponentLogger("bench", "info", str(tmp / "logs"), use_console=False), n
+
+
+def _run_log(state: tuple[ComponentLogger, int]) -> None:
+    log, n = state
+    for i in range(n):
+        log.info("Batch extracted", {"pass": i, "count": 200})
+    log.close()
+
+
+@dataclass
+class _Browser:
+    session: PlaywrightScrapeSession
+    scraper: PlaywrightDiscordScraper
+    db: ScrapeDB
+    expected: int
+
+
+def _e2e(engine: str, block: bool = False) -> Callable[[int, Path], _Browser]:
+    def setup(n: int, tmp: Path) -> _Browser:
+        fake = FakeDiscord(messages=n, latency_ms=50)
+        scraper = PlaywrightDiscordScraper(
+            user_data_dir=str(tmp / "profile"),
+            headless=True,
+            scroll_timeout_ms=1000,
+            blocker=ResourceBlocker() if block else None,
+        )
+        scraper.start()
+        fake.install(scraper.page.context)
+        db = ScrapeDB(str(tmp / "bench.db"))
+        session = PlaywrightScrapeSession(
+            server_id=fake.server_id,
+            channel_id=fake.channel_id,
+            max_scrolls=n // fake.page_size + 2,
+            scraper=scraper,
+            db=db,
+            engine=engine,
+        )
+        return _Browser(session, scraper, db, len(fake.history))
+
+    return setup
+
+
+def _run_e2e(state: _Browser) -> None:
+    # Ends on the scroll that shows the channel start, without waiting out
+    # scroll_timeout_ms.
+    result = state.session.run()
+    if result.get("messages_inserted") != state.expected:
+        raise RuntimeError(
+            f"incomplete scrape: {result.get('messages_inserted')} of {state.expected}"
+        )
+
+
+def _close_e2e(state: _Browser) -> None:
+    state.scraper.close()
+    state.db.close()
+
+
+CASES = {
+    case.name: case
+    for case in (
+        Case("parse", _parse, _run_parse),
+        Case("clean_id", _parse, _run_clean_id),
+        Case("dedupe", _dedupe, _run_dedupe),
+        Case("insert_single", _insert, _run_insert_single, max_n=5_000),
+        Case("insert_bulk", _insert, _run_insert_bulk),
+        Case("log", _log, _run_log, max_n=200_000),
+        *(
+            Case(
+                f"e2e_{engine}",
+                _e2e(engine),
+                _run_e2e,
+                max_n=5_000,
+                teardown=_close_e2e,
+                default=False,
+            )
+            for engine in ENGINES
+        ),
+        # Against e2e_dom: the cost of installing the blocked URL patterns
+        # versus loading every avatar the fake page renders.
+        Case(
+            "e2e_dom_blocked",
+            _e2e("dom", block=True),
+            _run_e2e,
+            max_n=5_000,
+            teardown=_close_e2e,
+            default=False,
+        ),
+    )
+}
+
+
+def scratch_dir() -> tempfile.TemporaryDirectory[str]:
+    return tempfile.TemporaryDirectory(prefix="dreader-bench-")
@@ -0,0 +1,128 @@
+"""A local stand-in for discord.com, for end-to-end scroll-loop runs.
+
+``FakeDiscord.install`` routes ``https://discord.com/**`` on a Playwright
+browser context or page to a small client (``fake_discord/``). The client
+renders the DOM contract the scraper relies on:
+
+- ``li[id^="chat-messages-"]`` items, with an avatar image and an ``h3``
+  author header
+- ``time[datetime]``
+- ``message-content-*``, ``message-reply-*`` and ``message-accessories-*`` nodes
+- a ``scrollerInner`` container
+- a welcome header with a heading, shown above the first message once the
+  history runs out
+- the server list, also shown on the ``/channels/@me`` home view, and the
+  chat input, which serve as login checks
+
+Its history comes from a routed ``/api/v9/channels/{id}/messages`` endpoint
+that serves ``synthetic.api_messages``. The network engine therefore sees
+real responses. Older pages load when the scroller nears the top, after
+``latency_ms``. Only ``window`` messages stay rendered, as in Discord's
+virtualized list. Nothing leaves the machine.
+"""
+from __future__ import annotations
+
+import json
+import re
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+from playwright.sync_api import BrowserContext, Page, Route
+
+from . import synthetic
+
+_SITE = Path(__file__).with_name("fake_discord")
+_CHANNEL_PATH_RE = re.compile(r"^/channels/(\d+)/(\d+)(?:/(\d+))?/?$")
+_HISTORY_PATH_RE = re.compile(r"^/api/v\d+/channels/(\d+)/messages$")
+# A 1x1 transparent PNG, served for every avatar.
+_AVATAR_PNG = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000b49444154789c6360000200000500017a5eab3f0000"
+    "000049454e44ae426082"
+)
+
+
+class FakeDiscord:
+    """Serves one synthetic channel of ``messages`` messages."""
+
+    def __init__(
+        self,
+        messages: int = 500,
+        page_size: int = 50,
+        latency_ms: int = 100,
+        window: int = 150,
+        logged_in: bool = True,
+        seed: int = 0,
+    ) -> None:
+        self.server_id = synthetic.SERVER_ID
+        self.channel_id = synthetic.CHANNEL_ID
+        self.page_size = page_size
+        self.latency_ms = latency_ms
+        self.window = window
+        self.logged_in = logged_in
+        self.history = synthetic.api_messages(messages, seed)
+        self._keys = [int(m["id"]) for m in self.history]
+        self.api_requests = 0
+
+    @property
+    def message_ids(self) -> list[str]:
+        return [m["id"] for m in self.history]
+
+    def install(self, target: BrowserContext | Page) -> None:
+        target.route("https://discord.com/**", self._handle)
+
+    def history_page(
+        self, limit: int, before: str | None = None, around: str | None = None
+    ) -> list[dict[str, Any]]:
+        """One page of history, newest first like the real endpoint."""
+        if around is not None:
+            lo = max(0, bisect_left(self._keys, int(around)) - limit // 2)
+            hi = min(len(self.history), lo + limit)
+        else:
+            hi = bisect_left(self._keys, int(before)) if before else len(self.history)
+            lo = max(0, hi - limit)
+        return self.history[lo:hi][::-1]
+
+    def _fulfill_page(
+        self, route: Route, channel_id: str | None, around: str | None
+    ) -> None:
+        config = {
+            "channel_id": channel_id,
+            "around": around,
+            "page_size": self.page_size,
+            "latency_ms": self.latency_ms,
+            "window": self.window,
+            "threshold_px": 200,
+            "logged_in": self.logged_in,
+        }
+        html = (_SITE / "index.html").read_text(encoding="utf-8")
+        route.fulfill(
+            content_type="text/html",
+            body=html.replace("__CONFIG__", json.dumps(config).replace("</", "<\\/")),
+        )
+
+    def _handle(self, route: Route) -> None:
+        url = urlsplit(route.request.url)
+        if match := _HISTORY_PATH_RE.match(url.path):
+            self.api_requests += 1
+            query = {k: v[0] for k, v in parse_qs(url.query).items()}
+            page = (
+                self.history_page(
+                    int(query.get("limit", 50)), query.get("before"), query.get("around")
+                )
+                if match.group(1) == self.channel_id
+                else []
+            )
+            route.fulfill(content_type="application/json", body=json.dumps(page))
+        elif match := _CHANNEL_PATH_RE.match(url.path):
+            self._fulfill_page(route, match.group(2), match.group(3))
+        elif url.path.rstrip("/") == "/channels/@me":
+            self._fulfill_page(route, None, None)
+        elif url.path.startswith("/assets/avatars/"):
+            route.fulfill(content_type="image/png", body=_AVATAR_PNG)
+        elif url.path == "/assets/fake-discord.js":
+            route.fulfill(content_type="text/javascript", path=_SITE / "app.js")
+        else:
+            route.fulfill(status=404, body="")
@@ -0,0 +1,87 @@
+// Fake Discord client. Renders the message DOM PlaywrightDiscordScraper
+// reads and lazy-loads older history from the routed /api/v9 endpoint when
+// the scroller nears the top, like the real client's virtualized list.
+(() => {
+    const config = JSON.parse(document.getElementById('fake-discord-config').textContent);
+    const scroller = document.getElementById('scroller');
+    const list = document.getElementById('message-list');
+    const escapes = { '&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;' };
+    const esc = (s) => String(s == null ? '' : s).replace(/[&<>"]/g, (c) => escapes[c]);
+    const sleep = (ms) => new Promise((resolve) => setTimeout(resolve, ms));
+    const name = (author) => author.global_name || author.username;
+
+    let oldest = null;
+    let hasMore = true;
+    let loading = false;
+
+    // One message <li>. `above` is the message rendered directly above it;
+    // a message by the same author continues that group without a header.
+    function render(m, above) {
+        const id = m.id;
+        const ts = new Date(m.timestamp).toISOString();
+        const grouped = above && above.author.id === m.author.id && !m.message_reference;
+        let html = `<li id="chat-messages-${config.channel_id}-${id}" class="messageListItem__fake">`;
+        if (m.message_reference) {
+            const parent = m.referenced_message;
+            html += `<div id="message-reply-context-${id}" class="repliedMessage__fake">`;
+            if (parent) {
+                html += `<span>@${esc(name(parent.author))}</span> `
+                    + `<div id="message-content-${parent.id}">${esc(parent.content)}</div>`;
+            }
+            html += '</div>';
+        }
+        if (!grouped) {
+            html += `<img class="avatar__fake" src="/assets/avatars/${m.author.id}.png" alt="">`
+                + `<h3 class="header__fake"><span>${esc(name(m.author))}</span></h3>`;
+        }
+        html += `<time datetime="${ts}"></time>`
+            + `<div id="message-content-${id}" class="markup__fake">${esc(m.content)}</div>`
+            + `<div id="message-accessories-${id}">`;
+        for (const a of m.attachments || []) {
+            html += `<a href="${esc(a.url)}">${esc(a.filename)}</a>`;
+        }
+        return html + '</div></li>';
+    }
+
+    async function load(query) {
+        loading = true;
+        await sleep(config.latency_ms);
+        const url = `/api/v9/channels/${config.channel_id}/messages?limit=${config.page_size}${query}`;
+        const page = await (await fetch(url)).json();  // newest first
+        hasMore = page.length === config.page_size;
+        if (page.length) {
+            oldest = page[page.length - 1].id;
+            const older = page.reverse();
+            const height = scroller.scrollHeight;
+            list.insertAdjacentHTML('afterbegin', older.map((m, i) => render(m, older[i - 1])).join(''));
+            const added = scroller.scrollHeight - height;
+            // Virtualization: only `window` messages stay rendered.
+            while (list.children.length > config.window) list.lastElementChild.remove();
+            // Keep the viewport on the same messages, so the next jump to the
+            // top is a real scroll.
+            scroller.scrollTop += added;
+        }
+        document.getElementById('channel-start').hidden = hasMore;
+        loading = false;
+    }
+
+    function check() {
+        if (!loading && hasMore && oldest !== null && scroller.scrollTop < config.threshold_px) {
+            load(`&before=${oldest}`);
+        }
+    }
+
+    async function boot() {
+        if (config.logged_in) document.getElementById('guilds').hidden = false;
+        if (config.channel_id === null) return;  // the /channels/@me home view
+        await load(config.around ? `&around=${config.around}` : '');
+        scroller.scrollTop = scroller.scrollHeight;
+        // The scraper takes a visible chat input as proof of login.
+        if (config.logged_in) document.getElementById('composer').hidden = false;
+        scroller.addEventListener('scroll', check, { passive: true });
+        // Scroll events are tied to frames, which background tabs skip.
+        setInterval(check, 100);
+    }
+
+    boot();
+})();
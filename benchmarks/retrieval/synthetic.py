@@ -0,0 +1,143 @@
+"""Synthetic scrape data at benchmark scale.
+
+``raw_messages`` mirrors the in-page extraction output (the shape of
+``tests/retrieval/conftest.raw_messages``) but generates any number of
+entries, deterministically per seed. The mix of entries is representative:
+continuation messages with no author header, replies, attachment-only
+messages and the odd unusable entry. ``api_messages`` generates the same
+kind of channel as Discord history API objects, for ``fake_discord``.
+"""
+from __future__ import annotations
+
+import random
+from datetime import UTC, datetime, timedelta
+from typing import Any
+
+from src.retrieval.db import MessageRow
+from src.retrieval.discord_playwright_scraper import DiscordMessage, parse_raw_messages
+from src.retrieval.scrape_session import ScrapeProgress
+
+SERVER_ID = "900000000000000001"
+CHANNEL_ID = "900000000000000002"
+
+_FIRST_ID = 1_100_000_000_000_000_000
+_ID_STEP = 1 << 22  # about one millisecond of snowflake time
+_EPOCH = datetime(2026, 1, 1, tzinfo=UTC)
+_WORDS = (
+    "the a scraper channel message discord archive scroll batch page sqlite "
+    "index thread reply author timestamp rollup replay network engine"
+).split()
+_AUTHORS = [f"user{i:02d}" for i in range(50)]
+_FIRST_AUTHOR_ID = 800_000_000_000_000_000
+
+
+def raw_messages(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """``n`` raw message dicts in page order (oldest first)."""
+    rng = random.Random(seed)
+    out: list[dict[str, Any]] = []
+    for i in range(n):
+        message_id = str(_FIRST_ID + i * _ID_STEP)
+        if i % 50 == 49:
+            out.append(
+                {"id": None, "author": None, "timestamp": None, "content": "", "reply_id": None}
+            )
+            continue
+        attachments = (
+            [f"https://cdn.discordapp.com/attachments/{CHANNEL_ID}/{message_id}/image.png"]
+            if i % 20 == 0
+            else []
+        )
+        content = "" if attachments and i % 40 == 0 else " ".join(
+            rng.choices(_WORDS, k=rng.randint(3, 40))
+        )
+        out.append(
+            {
+                "id": f"chat-messages-{CHANNEL_ID}-{message_id}",
+                "author": None if i % 4 == 1 else rng.choice(_AUTHORS),
+                "timestamp": (_EPOCH + timedelta(seconds=i * 7)).isoformat(
+                    timespec="milliseconds"
+                ).replace("+00:00", "Z"),
+                "content": content,
+                "reply_id": (
+                    f"message-reply-context-{_FIRST_ID + (i - 1) * _ID_STEP}"
+                    if i % 10 == 3
+                    else None
+                ),
+                "attachments": attachments,
+            }
+        )
+    return out
+
+
+def api_messages(n: int, seed: int = 0) -> list[dict[str, Any]]:
+    """``n`` history API message objects, oldest first."""
+    rng = random.Random(seed)
+    out: list[dict[str, Any]] = []
+    author = rng.choice(_AUTHORS)
+    for i in range(n):
+        message_id = str(_FIRST_ID + i * _ID_STEP)
+        if i % 4 != 1:  # every fourth message continues the previous author
+            author = rng.choice(_AUTHORS)
+        attachments = (
+            [
+                {
+                    "id": message_id,
+                    "filename": "image.png",
+                    "url": f"https://cdn.discordapp.com/attachments/{CHANNEL_ID}/"
+                    f"{message_id}/image.png",
+                }
+            ]
+            if i % 20 == 0
+            else []
+        )
+        content = "" if attachments and i % 40 == 0 else " ".join(
+            rng.choices(_WORDS, k=rng.randint(3, 40))
+        )
+        message: dict[str, Any] = {
+            "id": message_id,
+            "type": 0,
+            "channel_id": CHANNEL_ID,
+            "author": {
+                "id": str(_FIRST_AUTHOR_ID + _AUTHORS.index(author)),
+                "username": author,
+                "global_name": None,
+                "avatar": None,
+            },
+            "content": content,
+            "timestamp": (_EPOCH + timedelta(seconds=i * 7)).isoformat(
+                timespec="microseconds"
+            ),
+            "edited_timestamp": None,
+            "pinned": False,
+            "attachments": attachments,
+            "embeds": [],
+        }
+        if i % 10 == 3:
+            parent = out[-1]
+            message["type"] = 19
+            message["message_reference"] = {"message_id": parent["id"], "channel_id": CHANNEL_ID}
+            message["referenced_message"] = {
+                key: parent[key] for key in ("id", "author", "content")
+            }
+        out.append(message)
+    return out
+
+
+def messages(n: int, seed: int = 0) -> list[DiscordMessage]:
+    raw = raw_messages(n, seed)
+    return parse_raw_messages(raw, limit=len(raw))
+
+
+def rows(n: int, seed: int = 0) -> list[MessageRow]:
+    """``n`` raw entries as the ``MessageRow``s a scrape would insert."""
+    batch, _ = ScrapeProgress(SERVER_ID, CHANNEL_ID, None).add(messages(n, seed))
+    return batch
+
+
+def scroll_passes(
+    items: list[DiscordMessage], size: int = 200, overlap: int = 50
+) -> list[list[DiscordMessage]]:
+    """Split ``items`` into overlapping windows, newest first, like scroll passes."""
+    newest_first = items[::-1]
+    step = size - overlap
+    return [newest_first[i : i + size] for i in range(0, len(newest_first), step)]
@@ -1,7 +1,8 @@
 """DReader retrieval subsystem — Playwright-based Discord scraper."""
 from __future__ import annotations
 
-from .db import ScrapeDB
+from .async_scraper import AsyncDiscordScraper, AsyncScrapeSession
+from .db import InsertResult, MessageRow, ScrapeDB
 from .discord_playwright_scraper import (
     DiscordMessage,
     PlaywrightDiscordScraper,
@@ -10,18 +11,33 @@ from .discord_playwright_scraper import (
 )
 from .errors import DReaderError
 from .logger import create_logger
+from .query import Cursor, MessageQuery, iter_channel_messages
 from .registry import ChannelTarget, Registry
+from .scrape_run import ScrapeRun
 from .scrape_session import PlaywrightScrapeSession
+from .search import SearchHit, search_messages
+from .writer import BackgroundWriter
 
 __all__ = [
+    "AsyncDiscordScraper",
+    "AsyncScrapeSession",
+    "BackgroundWriter",
     "ChannelTarget",
+    "Cursor",
     "DiscordMessage",
     "DReaderError",
+    "InsertResult",
+    "MessageQuery",
+    "MessageRow",
     "PlaywrightDiscordScraper",
     "PlaywrightScrapeSession",
     "Registry",
     "ScrapeDB",
+    "ScrapeRun",
+    "SearchHit",
     "clean_message_id",
     "create_logger",
+    "iter_channel_messages",
     "parse_raw_messages",
+    "search_messages",
 ]
@@ -0,0 +1,372 @@
+"""asyncio engine — the Playwright scraper and session on ``async_playwright``.
+
+A sibling of ``PlaywrightDiscordScraper``/``PlaywrightScrapeSession`` for
+running many channels cooperatively in one event loop, or embedding the
+scraper in an asyncio service. It evaluates the same page scripts and
+returns the same ``DiscordMessage``s via ``parse_raw_messages``, and rows go
+through the same ``ScrapeProgress`` bookkeeping into the same schema.
+
+Writes go to a ``BackgroundWriter`` (awaited through its futures, so the
+loop doesn't wait on SQLite; only a full write queue blocks it, which
+throttles extraction as in the sync engine) or, for small jobs, straight to
+a ``ScrapeDB`` on the loop thread. Several channels run cooperatively by
+gathering sessions that borrow tabs from one scraper (``open_tab``) and
+share one writer.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Callable, Sequence
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, TypeVar
+
+from playwright.async_api import (
+    BrowserContext,
+    Page,
+    Playwright,
+    async_playwright,
+)
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
+
+from .blocking import ResourceBlocker
+from .db import InsertResult, MessageRow, ScrapeDB
+from .discord_playwright_scraper import (
+    _DRAIN_CAPTURE_JS,
+    _EXTRACT_NEW_JS,
+    _SCROLL_JS,
+    _SCROLL_OUTCOME_JS,
+    _START_CAPTURE_JS,
+    _STOP_CAPTURE_JS,
+    DiscordMessage,
+    ScrollResult,
+    parse_raw_messages,
+    scroll_result,
+)
+from .logger import create_logger
+from .scrape_session import ScrapeProgress
+from .writer import BackgroundWriter
+
+T = TypeVar("T")
+
+
+class AsyncDiscordScraper:
+    """``PlaywrightDiscordScraper`` on the async API: one page of a persistent context."""
+
+    def __init__(
+        self,
+        user_data_dir: str = "data/playwright-profile",
+        headless: bool = False,
+        scroll_timeout_ms: int = 10_000,
+        blocker: ResourceBlocker | None = None,
+    ) -> None:
+        self._user_data_dir = str(Path(user_data_dir).resolve())
+        self._headless = headless
+        self._scroll_timeout_ms = scroll_timeout_ms
+        self.blocker = blocker
+        self._pw: Playwright | None = None
+        self._context: BrowserContext | None = None
+        self._page: Page | None = None
+        self._owns_context = True
+        self._log = create_logger("retrieval.playwright.async")
+
+    async def start(self) -> None:
+        """Launch Chrome with a persistent profile. Auth state persists across runs."""
+        Path(self._user_data_dir).mkdir(parents=True, exist_ok=True)
+        self._pw = await async_playwright().start()
+        self._context = await self._pw.chromium.launch_persistent_context(
+            user_data_dir=self._user_data_dir,
+            headless=self._headless,
+            viewport={"width": 1280, "height": 720},
+            args=["--disable-blink-features=AutomationControlled"],
+        )
+        pages = self._context.pages
+        await self._attach_page(pages[0] if pages else await self._context.new_page())
+        self._log.info("Browser launched", {"profile": self._user_data_dir})
+
+    async def _attach_page(self, page: Page) -> None:
+        self._page = page
+        if self.blocker is not None:
+            assert self._context is not None
+            await self.blocker.install_async(await self._context.new_cdp_session(page))
+
+    async def open_tab(self) -> AsyncDiscordScraper:
+        """Open another page in this context; closing it closes only the page."""
+        if not self._context:
+            raise RuntimeError("Browser not started — call start() first")
+        tab = AsyncDiscordScraper(
+            user_data_dir=self._user_data_dir,
+            headless=self._headless,
+            scroll_timeout_ms=self._scroll_timeout_ms,
+            blocker=self.blocker,
+        )
+        tab._context = self._context
+        tab._owns_context = False
+        await tab._attach_page(await self._context.new_page())
+        return tab
+
+    @property
+    def page(self) -> Page:
+        if not self._page:
+            raise RuntimeError("Browser not started — call start() first")
+        return self._page
+
+    async def navigate_to_channel(
+        self, server_id: str, channel_id: str, message_id: str | None = None
+    ) -> None:
+        """Open a channel; with ``message_id``, jump straight to that message."""
+        url = f"https://discord.com/channels/{server_id}/{channel_id}"
+        if message_id:
+            url += f"/{message_id}"
+        await self.page.goto(url, wait_until="networkidle")
+        self._log.info("Navigated", {"url": url})
+
+    async def wait_for_login(self, timeout: int = 300) -> bool:
+        """Wait for the chat input to appear, indicating a logged-in session."""
+        self._log.info("Waiting for login", {"timeout_s": timeout})
+        try:
+            await self.page.wait_for_selector(
+                '[data-slate-editor="true"]', timeout=timeout * 1000
+            )
+            self._log.info("Login detected")
+            return True
+        except PlaywrightTimeoutError:
+            self._log.error("Login timeout")
+            return False
+
+    async def extract_new_messages(self) -> list[DiscordMessage]:
+        """Extract only messages the page has not returned before (no limit)."""
+        raw: list[dict[str, Any]] = await self.page.evaluate(_EXTRACT_NEW_JS)
+        return parse_raw_messages(raw, limit=len(raw))
+
+    async def start_capture(self) -> None:
+        """Buffer message nodes in the page as they are inserted (capture mode)."""
+        await self.page.evaluate(_START_CAPTURE_JS)
+
+    async def drain_capture(self) -> list[DiscordMessage]:
+        """Return and clear everything captured since the last drain."""
+        raw: list[dict[str, Any]] = await self.page.evaluate(_DRAIN_CAPTURE_JS)
+        return parse_raw_messages(raw, limit=len(raw))
+
+    async def stop_capture(self) -> None:
+        await self.page.evaluate(_STOP_CAPTURE_JS)
+
+    async def scroll_up(self) -> ScrollResult:
+        """Scroll up and wait until older messages render or the channel start
+        shows, up to the ceiling; a timeout is a stalled scroll, not the top."""
+        started = time.monotonic()
+        snapshot: dict[str, Any] = await self.page.evaluate(_SCROLL_JS)
+        outcome: object = "start"
+        if snapshot.get("first_id") is not None:
+            try:
+                handle = await self.page.wait_for_function(
+                    _SCROLL_OUTCOME_JS,
+                    arg=snapshot,
+                    polling=100,
+                    timeout=self._scroll_timeout_ms,
+                )
+                outcome = await handle.json_value()
+            except PlaywrightTimeoutError:
+                outcome = None
+        result = scroll_result(outcome, (time.monotonic() - started) * 1000)
+        if result.at_top:
+            self._log.info("Reached top of channel", {"waited_ms": round(result.waited_ms)})
+        elif result.stalled:
+            self._log.warn(
+                "Scroll rendered no older history", {"waited_ms": round(result.waited_ms)}
+            )
+        return result
+
+    async def close(self) -> None:
+        if not self._owns_context:
+            if self._page and not self._page.is_closed():
+                await self._page.close()
+            self._page = None
+            self._context = None
+            return
+        if self.blocker is not None and self.blocker.total_blocked:
+            self._log.info("Blocked requests", self.blocker.summary())
+        if self._context:
+            await self._context.close()
+            self._context = None
+            self._page = None
+            self._log.info("Browser closed")
+        if self._pw:
+            await self._pw.stop()
+            self._pw = None
+
+
+class AsyncScrapeSession:
+    """Async counterpart of ``PlaywrightScrapeSession``.
+
+    ``batches()`` yields each pass's new rows once they have been handed to
+    the writer; ``run()`` drains it and returns the usual summary dict,
+    which is also left on ``result``. Cancelling the task running either
+    marks the scrape job failed (resumable) before the cancellation
+    propagates.
+    """
+
+    def __init__(
+        self,
+        server_id: str,
+        channel_id: str,
+        server_name: str = "",
+        channel_name: str = "",
+        db_path: str = "data/dreader.db",
+        headless: bool = False,
+        max_scrolls: int = 10,
+        scroll_timeout_ms: int = 10_000,
+        user_data_dir: str = "data/playwright-profile",
+        scraper: AsyncDiscordScraper | None = None,
+        db: ScrapeDB | BackgroundWriter | None = None,
+        check_login: bool = True,
+        incremental: bool = False,
+        resume: bool = False,
+        capture: bool = False,
+    ) -> None:
+        self.server_id = server_id
+        self.channel_id = channel_id
+        self.server_name = server_name or server_id
+        self.channel_name = channel_name or channel_id
+        self.max_scrolls = max_scrolls
+        self.check_login = check_login
+        self.incremental = incremental
+        self.resume = resume
+        self.capture = capture
+        self.result: dict[str, object] | None = None
+        self._log = create_logger("retrieval.session.async")
+        self._owns_scraper = scraper is None
+        self._scraper = scraper or AsyncDiscordScraper(
+            user_data_dir=user_data_dir,
+            headless=headless,
+            scroll_timeout_ms=scroll_timeout_ms,
+        )
+        self._owns_db = db is None
+        self._db: ScrapeDB | BackgroundWriter = (
+            db if db is not None else BackgroundWriter(db_path)
+        )
+
+    async def _call(self, fn: Callable[[ScrapeDB], T]) -> T:
+        if isinstance(self._db, BackgroundWriter):
+            return await asyncio.wrap_future(self._db.submit(fn))
+        return fn(self._db)
+
+    async def run(self) -> dict[str, object]:
+        """Execute the full scrape. Returns summary dict."""
+        async for _ in self.batches():
+            pass
+        assert self.result is not None
+        return self.result
+
+    async def batches(self) -> AsyncIterator[Sequence[MessageRow]]:
+        """Scrape the channel, yielding each non-empty batch of new rows."""
+        scrape_type = "incremental" if self.incremental else "full"
+        server_id, channel_id = self.server_id, self.channel_id
+        await self._call(lambda db: db.ensure_server(server_id, self.server_name))
+        await self._call(
+            lambda db: db.ensure_channel(channel_id, server_id, self.channel_name)
+        )
+        resume_from = (
+            await self._call(lambda db: db.find_resumable_job(channel_id))
+            if self.resume
+            else None
+        )
+        job_id = await self._call(
+            lambda db: db.create_scrape_job(
+                channel_id,
+                scrape_type,
+                resumed_from_job_id=resume_from[0] if resume_from else None,
+            )
+        )
+        self._log.info("Scrape job created", {"job_id": job_id, "type": scrape_type})
+        checkpoint = resume_from[1] if resume_from else None
+        known_id, _ = await self._call(lambda db: db.get_channel_watermark(channel_id))
+        progress = ScrapeProgress(
+            server_id, channel_id, known_id, checkpoint, self.incremental
+        )
+        scroll_wait_ms = 0.0
+        pending: list[Future[InsertResult]] = []
+        ingest = InsertResult()
+
+        try:
+            if self._owns_scraper:
+                await self._scraper.start()
+            await self._scraper.navigate_to_channel(server_id, channel_id, checkpoint)
+            if self.check_login and not await self._scraper.wait_for_login(timeout=300):
+                await self._call(
+                    lambda db: db.update_job_status(job_id, "failed", "Login timeout")
+                )
+                self.result = {
+                    "job_id": job_id, "status": "failed", "error": "login_timeout"
+                }
+                return
+
+            if self.capture:
+                await self._scraper.start_capture()
+            for scroll_num in range(self.max_scrolls + 1):
+                messages = await (
+                    self._scraper.drain_capture()
+                    if self.capture
+                    else self._scraper.extract_new_messages()
+                )
+                batch, overlap = progress.add(messages)
+                if batch:
+                    if isinstance(self._db, BackgroundWriter):
+                        pending.append(
+                            self._db.insert_messages(
+                                batch, job_id=job_id, checkpoint=progress.oldest
+                            )
+                        )
+                    else:
+                        ingest += self._db.insert_messages(
+                            batch, job_id=job_id, checkpoint=progress.oldest
+                        )
+                    yield batch
+                done = self.incremental and overlap
+                if not done and scroll_num < self.max_scrolls:
+                    scroll = await self._scraper.scroll_up()
+                    scroll_wait_ms += scroll.waited_ms
+                    done = progress.scrolled(scroll)
+                self._log.info(
+                    "Scroll pass",
+                    {
+                        "scroll": scroll_num,
+                        "new": len(batch),
+                        "total": progress.total_scraped,
+                    },
+                )
+                if done:
+                    break
+
+            if self.capture:
+                await self._scraper.stop_capture()
+            for future in pending:
+                ingest += await asyncio.wrap_future(future)
+            newest = progress.watermark
+            if newest is not None:
+                await self._call(
+                    lambda db: db.update_channel_watermark(
+                        channel_id, newest.message_id, newest.timestamp or None
+                    )
+                )
+            await self._call(lambda db: db.update_job_status(job_id, "completed"))
+            self.result = progress.summary(job_id, ingest, scroll_wait_ms, self._log)
+
+        except (asyncio.CancelledError, GeneratorExit):
+            # Cancelled task, or the consumer stopped iterating early.
+            await self._call(
+                lambda db: db.update_job_status(job_id, "failed", "Cancelled")
+            )
+            self._log.error("Scrape cancelled", {"job_id": job_id})
+            raise
+        except Exception as e:
+            error = str(e)
+            await self._call(lambda db: db.update_job_status(job_id, "failed", error))
+            self._log.error("Scrape failed", {"job_id": job_id, "error": error})
+            self.result = {"job_id": job_id, "status": "failed", "error": error}
+        finally:
+            if self._owns_scraper:
+                await self._scraper.close()
+            if self._owns_db:
+                self._db.close()
@@ -2,15 +2,38 @@
 from __future__ import annotations
 
 import argparse
+import json
+import os
+import sys
+from collections.abc import Callable
+from itertools import islice
 
+from .blocking import ResourceBlocker
+from .db import connect
+from .export import COMPRESSIONS, FORMATS, export_messages
 from .logger import create_logger
+from .logs import LogQuery, iter_log_lines
+from .metrics import ScrapeMetrics
 from .registry import ChannelTarget, Registry
-from .scrape_session import PlaywrightScrapeSession
+from .replay import replay_recording
+from .scrape_run import ScrapeRun
+from .scrape_session import ENGINES
+from .search import HIGHLIGHT_END, HIGHLIGHT_START, rebuild_index, search_messages
+from .stats import author_activity, channel_stats, rebuild_stats
 
 
-def main() -> None:
+def main(argv: list[str] | None = None) -> None:
+    args = sys.argv[1:] if argv is None else argv
+    if args and args[0] in _COMMANDS:
+        _COMMANDS[args[0]](args[1:])
+    else:
+        _scrape_main(args)
+
+
+def _scrape_main(argv: list[str]) -> None:
     parser = argparse.ArgumentParser(
-        description="Scrape Discord channel(s) via Playwright"
+        description="Scrape Discord channel(s) via Playwright",
+        epilog="Other commands: " + ", ".join(sorted(_COMMANDS)),
     )
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument(
@@ -32,7 +55,56 @@ def main() -> None:
     parser.add_argument(
         "--max-scrolls", type=int, default=10, help="Max scroll passes"
     )
+    parser.add_argument(
+        "--scroll-timeout",
+        type=float,
+        default=10.0,
+        help="Max seconds to wait for older messages after each scroll",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Stop at the channel's last known message and advance its watermark",
+    )
+    mode.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an unfinished job from its checkpoint, scrolling older",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=1,
+        help="Scrape this many channels at once, one tab each",
+    )
     parser.add_argument("--headless", action="store_true", help="Run headless")
+    parser.add_argument(
+        "--block-resources",
+        action="store_true",
+        help="Don't load images, media, fonts or Discord CDN assets",
+    )
+    parser.add_argument(
+        "--engine",
+        choices=ENGINES,
+        default="dom",
+        help="DOM rows, DOM columns (fewer Python objects), or history API responses",
+    )
+    parser.add_argument(
+        "--capture",
+        action="store_true",
+        help="Collect messages with an in-page MutationObserver as they render (dom engine)",
+    )
+    parser.add_argument(
+        "--async-writes",
+        action="store_true",
+        help="Persist on a background WAL-mode writer thread",
+    )
+    parser.add_argument(
+        "--record",
+        metavar="PATH",
+        help="Record raw page results to PATH (.jsonl.gz) for the replay command",
+    )
     parser.add_argument(
         "--profile-dir",
         default="data/playwright-profile",
@@ -44,7 +116,9 @@ def main() -> None:
         dest="list_targets",
         help="List targets and exit",
     )
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    if args.capture and args.engine != "dom":
+        parser.error("--capture only applies to --engine dom")
 
     if args.channel_id:
         if not args.server_id:
@@ -80,27 +154,280 @@ def main() -> None:
     log = create_logger("retrieval.cli")
     log.info("Scrape run starting", {"channels": len(targets)})
     results: list[dict[str, object]] = []
+    blocker = ResourceBlocker() if args.block_resources else None
 
-    for t in targets:
-        log.info(
-            "Scraping channel",
-            {"server": t.server_name, "channel": t.channel_name},
-        )
-        session = PlaywrightScrapeSession(
-            server_id=t.server_id,
-            channel_id=t.channel_id,
-            server_name=t.server_name,
-            channel_name=t.channel_name,
-            db_path=args.db_path,
-            headless=args.headless,
-            max_scrolls=args.max_scrolls,
-            user_data_dir=args.profile_dir,
-        )
-        result = session.run()
+    run = ScrapeRun(
+        targets,
+        db_path=args.db_path,
+        headless=args.headless,
+        max_scrolls=args.max_scrolls,
+        scroll_timeout_ms=int(args.scroll_timeout * 1000),
+        user_data_dir=args.profile_dir,
+        async_writes=args.async_writes,
+        incremental=args.incremental,
+        resume=args.resume,
+        capture=args.capture,
+        concurrency=args.concurrency,
+        blocker=blocker,
+        engine=args.engine,
+        record_path=args.record,
+    )
+    channel_metrics: list[ScrapeMetrics] = [run.metrics]
+    inserted = 0
+    for t, result in run.run():
         results.append(result)
         msgs = result.get("messages_scraped", 0)
-        print(f"  {t.channel_name}: {result.get('status')} ({msgs} msgs)")
+        new = result.get("messages_inserted", 0)
+        if isinstance(new, int):
+            inserted += new
+        print(f"  {t.channel_name}: {result.get('status')} ({msgs} msgs, {new} new)")
+        metrics = result.get("metrics")
+        if isinstance(metrics, ScrapeMetrics):
+            channel_metrics.append(metrics)
+            print(f"    {metrics.breakdown()}")
 
     total = sum(int(r.get("messages_scraped", 0) or 0) for r in results)
     ok = sum(1 for r in results if r.get("status") == "completed")
-    print(f"\nDone: {ok}/{len(results)} channels, {total} messages total")
+    print(
+        f"\nDone: {ok}/{len(results)} channels, {total} messages total, "
+        f"{inserted} new"
+    )
+    if blocker is not None:
+        print(
+            f"Blocked {blocker.total_blocked} requests "
+            f"(~{blocker.est_bytes_saved / 1e6:.1f} MB saved, estimated)"
+        )
+    totals = ScrapeMetrics.combine(channel_metrics)
+    if totals.samples:
+        print("\nTime by phase (p50/p95/max per call):")
+        for line in totals.table():
+            print(line)
+
+
+def _search_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.retrieval search",
+        description="Full-text search over archived messages",
+    )
+    parser.add_argument("query", nargs="?", default="", help="Words to search for")
+    parser.add_argument("--channel-id", help="Only this channel")
+    parser.add_argument("--author", help="Only this author name (case-insensitive)")
+    parser.add_argument("--since", help="ISO timestamp, inclusive")
+    parser.add_argument("--until", help="ISO timestamp, exclusive")
+    parser.add_argument("--limit", type=int, default=20, help="Max results")
+    parser.add_argument(
+        "--newest", action="store_true", help="Order by time instead of relevance"
+    )
+    parser.add_argument(
+        "--raw", action="store_true", help="Pass query through as FTS5 syntax"
+    )
+    parser.add_argument(
+        "--rebuild", action="store_true", help="Rebuild the search index first"
+    )
+    parser.add_argument(
+        "--db-path", default="data/dreader.db", help="SQLite database path"
+    )
+    args = parser.parse_args(argv)
+    if not args.query and not args.rebuild:
+        parser.error("a query is required unless --rebuild is given")
+
+    conn = connect(args.db_path)
+    try:
+        if args.rebuild:
+            indexed = rebuild_index(conn)
+            print(f"Search index rebuilt ({indexed} messages)")
+        if not args.query:
+            return
+        highlight = (
+            (HIGHLIGHT_START, HIGHLIGHT_END) if sys.stdout.isatty() else ("**", "**")
+        )
+        hits = search_messages(
+            conn,
+            args.query,
+            channel_id=args.channel_id,
+            author=args.author,
+            since=args.since,
+            until=args.until,
+            limit=args.limit,
+            raw=args.raw,
+            newest_first=args.newest,
+            highlight=highlight,
+        )
+        for hit in hits:
+            channel = hit.channel_name or hit.channel_id
+            print(f"{hit.timestamp}  #{channel}  {hit.author_name}: {hit.snippet}")
+            print(f"    {hit.message_url}")
+        print(f"\n{len(hits)} result(s)")
+    finally:
+        conn.close()
+
+
+def _export_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.retrieval export",
+        description="Stream archived messages to compressed JSONL or Parquet",
+    )
+    parser.add_argument("out", help="Output file (.jsonl.gz, .jsonl.zst, .parquet, ...)")
+    parser.add_argument(
+        "--channel-id",
+        action="append",
+        default=[],
+        help="Only this channel (repeatable); default is every channel",
+    )
+    parser.add_argument("--format", choices=FORMATS, default=None, help="Output format")
+    parser.add_argument(
+        "--compression",
+        choices=COMPRESSIONS,
+        default=None,
+        help="JSONL compression (default: from file suffix)",
+    )
+    parser.add_argument(
+        "--watermark",
+        help="Export only rows added since the last run with this name",
+    )
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows per read")
+    parser.add_argument(
+        "--db-path", default="data/dreader.db", help="SQLite database path"
+    )
+    args = parser.parse_args(argv)
+    fmt = args.format or ("parquet" if args.out.endswith(".parquet") else "jsonl")
+
+    conn = connect(args.db_path)
+    try:
+        result = export_messages(
+            conn,
+            args.out,
+            fmt=fmt,
+            compression=args.compression,
+            channel_ids=args.channel_id,
+            watermark=args.watermark,
+            chunk_size=args.chunk_size,
+        )
+    finally:
+        conn.close()
+    print(f"Exported {result.rows} messages to {result.path}")
+
+
+def _stats_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.retrieval stats",
+        description="Per-channel message counts and author activity",
+    )
+    parser.add_argument("--channel-id", help="Show top authors for this channel")
+    parser.add_argument("--since", help="ISO timestamp, inclusive (author activity)")
+    parser.add_argument("--until", help="ISO timestamp, exclusive (author activity)")
+    parser.add_argument("--limit", type=int, default=20, help="Max authors to list")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recompute counters and rollups from the messages table first",
+    )
+    parser.add_argument(
+        "--db-path", default="data/dreader.db", help="SQLite database path"
+    )
+    args = parser.parse_args(argv)
+
+    conn = connect(args.db_path)
+    try:
+        if args.rebuild:
+            rebuild_stats(conn)
+            print("Stats rebuilt")
+        if args.channel_id or args.since or args.until:
+            for author, n in author_activity(
+                conn, args.channel_id, args.since, args.until, args.limit
+            ):
+                print(f"  {n:>8}  {author}")
+            return
+        stats = channel_stats(conn)
+        for c in stats:
+            print(
+                f"  {c.server_name}/{c.channel_name}  {c.message_count} msgs  "
+                f"last scraped {c.last_scraped or 'never'}  "
+                f"newest {c.last_message_timestamp or '-'}"
+            )
+        total = sum(c.message_count for c in stats)
+        print(f"\n{total} messages across {len(stats)} channels")
+    finally:
+        conn.close()
+
+
+def _replay_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.retrieval replay",
+        description="Replay a --record recording through parse, dedupe and DB inserts",
+    )
+    parser.add_argument("recording", help="Recording file written by scrape --record")
+    parser.add_argument(
+        "--db-path",
+        default=None,
+        help="SQLite database to insert into (default: a throwaway temp DB)",
+    )
+    args = parser.parse_args(argv)
+
+    report = replay_recording(args.recording, args.db_path)
+    print(
+        f"Replayed {report.channels} channels, {report.passes} passes: "
+        f"{report.messages} messages ({report.inserted} new, "
+        f"{report.duplicates} duplicates) in {report.seconds:.3f}s"
+    )
+    print(f"{report.messages_per_sec:,.0f} messages/s")
+
+
+def _logs_main(argv: list[str]) -> None:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.retrieval logs",
+        description="Stream matching lines from the JSONL logs, rotated and gzipped included",
+    )
+    parser.add_argument(
+        "--component", help="Only this component and its children, e.g. retrieval.session"
+    )
+    parser.add_argument(
+        "--level", choices=["debug", "info", "warn", "error"], help="Minimum level"
+    )
+    parser.add_argument("--since", help="ISO timestamp, inclusive")
+    parser.add_argument("--until", help="ISO timestamp, exclusive")
+    parser.add_argument(
+        "--data",
+        action="append",
+        default=[],
+        metavar="KEY[=VALUE]",
+        help="Only lines whose data has KEY (dotted for nesting), or KEY=VALUE (repeatable)",
+    )
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many lines")
+    parser.add_argument(
+        "--pretty", action="store_true", help="Console format instead of raw JSONL"
+    )
+    parser.add_argument(
+        "--log-dir", default=os.environ.get("LOG_DIR", "data/logs"), help="Log directory"
+    )
+    args = parser.parse_args(argv)
+
+    data: dict[str, str | None] = {}
+    for item in args.data:
+        key, sep, value = item.partition("=")
+        data[key] = value if sep else None
+    query = LogQuery(
+        since=args.since,
+        until=args.until,
+        component=args.component,
+        min_level=args.level,
+        data=data,
+    )
+    for entry, line in islice(iter_log_lines(args.log_dir, query), args.limit):
+        if args.pretty:
+            ts = entry.get("timestamp", "")
+            ctx = f" {json.dumps(entry['data'])}" if entry.get("data") else ""
+            line = (
+                f"{ts[:10]} {ts[11:19]} {entry.get('level', '').upper().ljust(5)} "
+                f"[{entry.get('component', '')}] {entry.get('message', '')}{ctx}"
+            )
+        print(line)
+
+
+_COMMANDS: dict[str, Callable[[list[str]], None]] = {
+    "export": _export_main,
+    "logs": _logs_main,
+    "replay": _replay_main,
+    "search": _search_main,
+    "stats": _stats_main,
+}
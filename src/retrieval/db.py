@@ -5,29 +5,219 @@ engines produce interchangeable data.
 """
 from __future__ import annotations
 
+import json
 import sqlite3
+from collections import Counter
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from dataclasses import dataclass
 from datetime import UTC, datetime
 from pathlib import Path
+from typing import Any
+
+from .migrations import apply_migrations
+
+_INSERT_MESSAGE_SQL = """INSERT OR IGNORE INTO messages
+   (id, channel_id, author_id, author_name, author_avatar_url,
+    content, timestamp, reply_to_message_id, edited_timestamp,
+    is_pinned, attachment_urls, embed_data, message_url,
+    has_attachments, has_embeds)
+   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+
+# Bound on host parameters per "IN (...)" lookup.
+_ID_CHUNK = 500
 
 
 def _now_iso() -> str:
     return datetime.now(UTC).strftime("%Y-%m-%dT%H:%M:%S.") + "000Z"
 
 
+def snowflake(message_id: str | None) -> int:
+    """Numeric order key of a Discord ID (IDs grow over time); -1 if not numeric."""
+    if message_id and message_id.isdigit():
+        return int(message_id)
+    return -1
+
+
+@dataclass(frozen=True, slots=True)
+class MessageRow:
+    """One row destined for the ``messages`` table."""
+
+    message_id: str
+    channel_id: str
+    author_id: str
+    author_name: str
+    content: str
+    timestamp: str
+    server_id: str
+    author_avatar_url: str = ""
+    reply_to_message_id: str | None = None
+    edited_timestamp: str | None = None
+    is_pinned: bool = False
+    attachment_urls: str = "[]"
+    embed_data: str = "[]"
+    has_attachments: bool = False
+    has_embeds: bool = False
+
+    @property
+    def message_url(self) -> str:
+        return (
+            f"https://discord.com/channels/{self.server_id}/"
+            f"{self.channel_id}/{self.message_id}"
+        )
+
+    def params(self) -> tuple[object, ...]:
+        """Positional parameters matching ``_INSERT_MESSAGE_SQL``."""
+        return (
+            self.message_id, self.channel_id, self.author_id, self.author_name,
+            self.author_avatar_url, self.content, self.timestamp,
+            self.reply_to_message_id, self.edited_timestamp,
+            1 if self.is_pinned else 0, self.attachment_urls, self.embed_data,
+            self.message_url, 1 if self.has_attachments else 0,
+            1 if self.has_embeds else 0,
+        )
+
+
+@dataclass(slots=True)
+class MessageColumns:
+    """One channel's messages as parallel columns, straight from the page.
+
+    The columnar counterpart of a ``list[MessageRow]``: the page has
+    already cleaned IDs and dropped empty messages, and ``params()`` feeds
+    ``executemany`` by zipping the columns, so no per-message object is
+    built on the way to SQLite. ``attachment_urls`` holds JSON text.
+    """
+
+    channel_id: str
+    server_id: str
+    ids: list[str]
+    authors: list[str]
+    timestamps: list[str]
+    contents: list[str]
+    reply_ids: list[str | None]
+    attachment_urls: list[str]
+
+    @classmethod
+    def empty(cls, channel_id: str, server_id: str) -> MessageColumns:
+        return cls(channel_id, server_id, [], [], [], [], [], [])
+
+    @classmethod
+    def from_page(
+        cls, channel_id: str, server_id: str, raw: dict[str, list[Any]]
+    ) -> MessageColumns:
+        """Wrap the arrays returned by the page's columnar extraction.
+
+        The page encodes attachments with ``JSON.stringify``; they are
+        re-encoded with ``json.dumps`` so the stored text matches what the
+        other engines write. Most messages have none and are left as they are.
+        """
+        return cls(
+            channel_id,
+            server_id,
+            raw["ids"],
+            raw["authors"],
+            raw["timestamps"],
+            raw["contents"],
+            raw["reply_ids"],
+            [a if a == "[]" else json.dumps(json.loads(a)) for a in raw["attachments"]],
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def take(self, indices: Sequence[int]) -> MessageColumns:
+        """A new batch holding only the given positions, in that order."""
+        return MessageColumns(
+            self.channel_id,
+            self.server_id,
+            [self.ids[i] for i in indices],
+            [self.authors[i] for i in indices],
+            [self.timestamps[i] for i in indices],
+            [self.contents[i] for i in indices],
+            [self.reply_ids[i] for i in indices],
+            [self.attachment_urls[i] for i in indices],
+        )
+
+    def row(self, i: int) -> MessageRow:
+        attachments = self.attachment_urls[i]
+        return MessageRow(
+            message_id=self.ids[i],
+            channel_id=self.channel_id,
+            author_id=self.authors[i],
+            author_name=self.authors[i],
+            content=self.contents[i],
+            timestamp=self.timestamps[i],
+            server_id=self.server_id,
+            reply_to_message_id=self.reply_ids[i],
+            attachment_urls=attachments,
+            has_attachments=attachments != "[]",
+        )
+
+    def params(self) -> Iterator[tuple[object, ...]]:
+        """Positional parameters matching ``_INSERT_MESSAGE_SQL``, lazily."""
+        url = f"https://discord.com/channels/{self.server_id}/{self.channel_id}/"
+        channel = self.channel_id
+        for message_id, author, ts, content, reply_id, attachments in zip(
+            self.ids, self.authors, self.timestamps, self.contents,
+            self.reply_ids, self.attachment_urls, strict=True,
+        ):
+            yield (
+                message_id, channel, author, author, "", content, ts, reply_id,
+                None, 0, attachments, "[]", url + message_id,
+                0 if attachments == "[]" else 1, 0,
+            )
+
+
+@dataclass(frozen=True)
+class InsertResult:
+    """Outcome of a batch insert: rows written vs rows already present."""
+
+    inserted: int = 0
+    duplicates: int = 0
+
+    def __add__(self, other: InsertResult) -> InsertResult:
+        return InsertResult(
+            self.inserted + other.inserted, self.duplicates + other.duplicates
+        )
+
+
+def connect(db_path: str = "data/dreader.db", wal: bool = False) -> sqlite3.Connection:
+    """Open the shared database with pragmas set and migrations applied."""
+    path = Path(db_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(path))
+    conn.execute("PRAGMA foreign_keys = ON")
+    if wal:
+        _enable_wal(conn)
+    apply_migrations(conn)
+    return conn
+
+
+def _enable_wal(conn: sqlite3.Connection) -> None:
+    """Switch to WAL so API readers and the writer don't block each other.
+
+    WAL makes ``synchronous = NORMAL`` durable across application crashes
+    (only an OS crash can lose the last commits), which removes the fsync
+    from every commit. The journal mode is persistent in the database file,
+    so readers opened later see it too.
+    """
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA cache_size = -32000")  # KiB, i.e. ~32 MB
+    conn.execute("PRAGMA busy_timeout = 5000")
+
+
 class ScrapeDB:
     """Thin wrapper around the shared DReader SQLite database."""
 
-    def __init__(self, db_path: str = "data/dreader.db") -> None:
+    def __init__(self, db_path: str = "data/dreader.db", wal: bool = False) -> None:
         self._path = Path(db_path)
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        self._conn = sqlite3.connect(str(self._path))
-        self._conn.execute("PRAGMA foreign_keys = ON")
-        self._ensure_schema()
+        self._conn = connect(db_path, wal=wal)
+        self._insert_listeners: list[Callable[[str], None]] = []
 
-    def _ensure_schema(self) -> None:
-        schema_path = Path(__file__).resolve().parent.parent / "services" / "schema.sql"
-        if schema_path.exists():
-            self._conn.executescript(schema_path.read_text())
+    def add_insert_listener(self, callback: Callable[[str], None]) -> None:
+        """Call ``callback(channel_id)`` after a commit adds rows to that channel."""
+        self._insert_listeners.append(callback)
 
     def ensure_server(self, server_id: str, name: str) -> None:
         self._conn.execute(
@@ -43,10 +233,28 @@ class ScrapeDB:
         )
         self._conn.commit()
 
-    def create_scrape_job(self, channel_id: str, scrape_type: str = "full") -> int:
+    def create_scrape_job(
+        self,
+        channel_id: str,
+        scrape_type: str = "full",
+        resumed_from_job_id: int | None = None,
+    ) -> int:
+        """Insert a running job. A resumed job starts from its predecessor's
+        checkpoint, so failing before its first batch keeps the chain resumable."""
         cur = self._conn.execute(
-            "INSERT INTO scrape_jobs (channel_id, status, scrape_type, started_at) VALUES (?, ?, ?, ?)",
-            (channel_id, "running", scrape_type, _now_iso()),
+            """INSERT INTO scrape_jobs
+               (channel_id, status, scrape_type, started_at, resumed_from_job_id,
+                checkpoint_message_id)
+               VALUES (?, ?, ?, ?, ?,
+                       (SELECT checkpoint_message_id FROM scrape_jobs WHERE id = ?))""",
+            (
+                channel_id,
+                "running",
+                scrape_type,
+                _now_iso(),
+                resumed_from_job_id,
+                resumed_from_job_id,
+            ),
         )
         self._conn.commit()
         return cur.lastrowid or 0
@@ -55,10 +263,17 @@ class ScrapeDB:
         self, job_id: int, status: str, error_message: str | None = None
     ) -> None:
         if status in ("completed", "failed"):
+            now = _now_iso()
             self._conn.execute(
                 "UPDATE scrape_jobs SET status = ?, completed_at = ?, error_message = ? WHERE id = ?",
-                (status, _now_iso(), error_message, job_id),
+                (status, now, error_message, job_id),
             )
+            if status == "completed":
+                self._conn.execute(
+                    """UPDATE channels SET last_scraped = ?
+                       WHERE id = (SELECT channel_id FROM scrape_jobs WHERE id = ?)""",
+                    (now, job_id),
+                )
         else:
             self._conn.execute(
                 "UPDATE scrape_jobs SET status = ?, error_message = ? WHERE id = ?",
@@ -66,6 +281,54 @@ class ScrapeDB:
             )
         self._conn.commit()
 
+    def record_job_metrics(
+        self,
+        job_id: int,
+        rows: Sequence[tuple[str, str, float, int, float, float, float]],
+    ) -> None:
+        """Store a job's metrics (see ``ScrapeMetrics.rows``), replacing earlier ones."""
+        with self._conn:
+            self._conn.executemany(
+                """INSERT OR REPLACE INTO scrape_job_metrics
+                   (job_id, metric, unit, total, count, p50, p95, max)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+                [(job_id, *row) for row in rows],
+            )
+
+    def find_resumable_job(self, channel_id: str) -> tuple[int, str] | None:
+        """Return ``(job_id, checkpoint_message_id)`` of the channel's latest job
+        if it did not complete and got far enough to checkpoint."""
+        row = self._conn.execute(
+            """SELECT id, status, checkpoint_message_id FROM scrape_jobs
+               WHERE channel_id = ? ORDER BY id DESC LIMIT 1""",
+            (channel_id,),
+        ).fetchone()
+        if row is None or row[1] == "completed" or not row[2]:
+            return None
+        return int(row[0]), str(row[2])
+
+    def get_channel_watermark(self, channel_id: str) -> tuple[str | None, str | None]:
+        """Return the channel's ``(last_message_id, last_message_timestamp)``."""
+        row = self._conn.execute(
+            "SELECT last_message_id, last_message_timestamp FROM channels WHERE id = ?",
+            (channel_id,),
+        ).fetchone()
+        return (row[0], row[1]) if row else (None, None)
+
+    def update_channel_watermark(
+        self, channel_id: str, message_id: str, timestamp: str | None
+    ) -> None:
+        """Advance the channel's newest-known message; never moves it backwards."""
+        self._conn.execute(
+            """UPDATE channels
+               SET last_message_id = ?, last_message_timestamp = ?
+               WHERE id = ?
+                 AND (last_message_id IS NULL
+                      OR CAST(last_message_id AS INTEGER) < CAST(? AS INTEGER))""",
+            (message_id, timestamp, channel_id, message_id),
+        )
+        self._conn.commit()
+
     def increment_messages_scraped(self, job_id: int, count: int) -> None:
         self._conn.execute(
             "UPDATE scrape_jobs SET messages_scraped = messages_scraped + ? WHERE id = ?",
@@ -93,26 +356,148 @@ class ScrapeDB:
         has_embeds: bool = False,
     ) -> bool:
         """Insert a message. Returns True if inserted, False if duplicate."""
-        message_url = f"https://discord.com/channels/{server_id}/{channel_id}/{message_id}"
+        row = MessageRow(
+            message_id=message_id,
+            channel_id=channel_id,
+            author_id=author_id,
+            author_name=author_name,
+            content=content,
+            timestamp=timestamp,
+            server_id=server_id,
+            author_avatar_url=author_avatar_url,
+            reply_to_message_id=reply_to_message_id,
+            edited_timestamp=edited_timestamp,
+            is_pinned=is_pinned,
+            attachment_urls=attachment_urls,
+            embed_data=embed_data,
+            has_attachments=has_attachments,
+            has_embeds=has_embeds,
+        )
         try:
-            self._conn.execute(
-                """INSERT OR IGNORE INTO messages
-                   (id, channel_id, author_id, author_name, author_avatar_url,
-                    content, timestamp, reply_to_message_id, edited_timestamp,
-                    is_pinned, attachment_urls, embed_data, message_url,
-                    has_attachments, has_embeds)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                (
-                    message_id, channel_id, author_id, author_name, author_avatar_url,
-                    content, timestamp, reply_to_message_id, edited_timestamp,
-                    1 if is_pinned else 0, attachment_urls, embed_data, message_url,
-                    1 if has_attachments else 0, 1 if has_embeds else 0,
-                ),
-            )
-            self._conn.commit()
-            return self._conn.total_changes > 0
+            return self.insert_messages([row]).inserted == 1
         except sqlite3.IntegrityError:
             return False
 
+    def insert_messages(
+        self,
+        rows: Sequence[MessageRow],
+        job_id: int | None = None,
+        checkpoint: str | None = None,
+    ) -> InsertResult:
+        """Insert a batch of messages in a single transaction.
+
+        Duplicates (same channel and ID) are ignored. When ``job_id`` is
+        given, the job's ``messages_scraped`` counter is bumped by the batch
+        size, and its ``checkpoint_message_id`` set to ``checkpoint`` if
+        given, inside the same transaction — one scroll pass, one commit.
+        """
+        if not rows:
+            return InsertResult()
+        with self._conn:
+            self._begin()
+            fresh = [rows[i] for i in self._fresh_indices([r.message_id for r in rows])]
+            if fresh:
+                self._conn.executemany(
+                    _INSERT_MESSAGE_SQL, [row.params() for row in fresh]
+                )
+                self._update_rollups(
+                    (row.channel_id, row.author_id, row.timestamp) for row in fresh
+                )
+            self._record_progress(job_id, len(rows), checkpoint)
+        inserted = len(fresh)
+        if inserted:
+            self._notify({row.channel_id for row in rows})
+        return InsertResult(inserted=inserted, duplicates=len(rows) - inserted)
+
+    def insert_columns(
+        self,
+        batch: MessageColumns,
+        job_id: int | None = None,
+        checkpoint: str | None = None,
+    ) -> InsertResult:
+        """``insert_messages`` for a columnar batch; same transaction semantics."""
+        if not batch:
+            return InsertResult()
+        with self._conn:
+            self._begin()
+            fresh = batch.take(self._fresh_indices(batch.ids))
+            if fresh:
+                self._conn.executemany(_INSERT_MESSAGE_SQL, fresh.params())
+                channel = fresh.channel_id
+                self._update_rollups(
+                    (channel, author, ts)
+                    for author, ts in zip(fresh.authors, fresh.timestamps, strict=True)
+                )
+            self._record_progress(job_id, len(batch), checkpoint)
+        inserted = len(fresh)
+        if inserted:
+            self._notify({batch.channel_id})
+        return InsertResult(inserted=inserted, duplicates=len(batch) - inserted)
+
+    def _begin(self) -> None:
+        if not self._conn.in_transaction:
+            # Take the write lock before reading, so the "already stored"
+            # check and the counters see exactly what the insert sees.
+            self._conn.execute("BEGIN IMMEDIATE")
+
+    def _record_progress(
+        self, job_id: int | None, scraped: int, checkpoint: str | None
+    ) -> None:
+        if job_id is None:
+            return
+        self._conn.execute(
+            """UPDATE scrape_jobs
+               SET messages_scraped = messages_scraped + ?,
+                   checkpoint_message_id = COALESCE(?, checkpoint_message_id)
+               WHERE id = ?""",
+            (scraped, checkpoint, job_id),
+        )
+
+    def _notify(self, channel_ids: set[str]) -> None:
+        for channel_id in channel_ids:
+            for callback in self._insert_listeners:
+                callback(channel_id)
+
+    def _fresh_indices(self, ids: Sequence[str]) -> list[int]:
+        """Positions of IDs not yet stored, first occurrence of each ID only."""
+        first: dict[str, int] = {}
+        for i, message_id in enumerate(ids):
+            first.setdefault(message_id, i)
+        unique = list(first)
+        existing: set[str] = set()
+        for start in range(0, len(unique), _ID_CHUNK):
+            chunk = unique[start : start + _ID_CHUNK]
+            existing.update(
+                r[0]
+                for r in self._conn.execute(
+                    f"SELECT id FROM messages WHERE id IN ({', '.join('?' * len(chunk))})",
+                    chunk,
+                )
+            )
+        return [i for message_id, i in first.items() if message_id not in existing]
+
+    def _update_rollups(self, fresh: Iterable[tuple[str, str, str]]) -> None:
+        """Bump per-channel counters and hourly activity for newly stored rows.
+
+        ``fresh`` yields ``(channel_id, author_id, timestamp)`` per new row.
+        """
+        per_channel: Counter[str] = Counter()
+        per_hour: Counter[tuple[str, str, str]] = Counter()
+        for channel_id, author_id, timestamp in fresh:
+            per_channel[channel_id] += 1
+            per_hour[(channel_id, author_id, timestamp[:13])] += 1
+        self._conn.executemany(
+            "UPDATE channels SET message_count = COALESCE(message_count, 0) + ? "
+            "WHERE id = ?",
+            [(n, channel_id) for channel_id, n in per_channel.items()],
+        )
+        self._conn.executemany(
+            """INSERT INTO channel_activity_hourly (channel_id, author_id, hour, message_count)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT (channel_id, hour, author_id)
+               DO UPDATE SET message_count = message_count + excluded.message_count""",
+            [(ch, author, hour, n) for (ch, author, hour), n in per_hour.items()],
+        )
+
     def close(self) -> None:
         self._conn.close()
@@ -0,0 +1,60 @@
+"""Bounded message-ID deduplication for scroll passes.
+
+A scroll pass renders a contiguous slice of the channel and Discord IDs
+grow over time, so the IDs seen so far form one range ``[lo, hi]``: any
+numeric ID inside it has already been seen. Tracking two integers replaces
+a set that grew by one string per message. Non-numeric IDs, which should
+not occur, fall back to a small bounded FIFO.
+"""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Iterable
+
+from .db import snowflake
+
+
+class SeenIdWindow:
+    """Constant-memory replacement for ``set[str]`` of seen message IDs."""
+
+    __slots__ = ("lo", "hi", "_other", "_max_other")
+
+    def __init__(self, max_other: int = 4096) -> None:
+        self.lo: int | None = None
+        self.hi: int | None = None
+        self._other: OrderedDict[str, None] = OrderedDict()
+        self._max_other = max_other
+
+    def __contains__(self, message_id: object) -> bool:
+        if not isinstance(message_id, str):
+            return False
+        key = snowflake(message_id)
+        if key < 0:
+            return message_id in self._other
+        return self.lo is not None and self.hi is not None and self.lo <= key <= self.hi
+
+    def filter_new(self, message_ids: Iterable[str]) -> list[str]:
+        """Return the IDs of one pass not seen before, then absorb the pass.
+
+        Novelty is judged against the window as it was before this pass;
+        judging ID by ID would swallow a pass's own older messages once the
+        first of them had widened the range.
+        """
+        fresh: list[str] = []
+        lo, hi = self.lo, self.hi
+        batch_seen: set[str] = set()
+        for message_id in message_ids:
+            if message_id in batch_seen or message_id in self:
+                continue
+            batch_seen.add(message_id)
+            fresh.append(message_id)
+            key = snowflake(message_id)
+            if key < 0:
+                self._other[message_id] = None
+                if len(self._other) > self._max_other:
+                    self._other.popitem(last=False)
+                continue
+            lo = key if lo is None or key < lo else lo
+            hi = key if hi is None or key > hi else hi
+        self.lo, self.hi = lo, hi
+        return fresh
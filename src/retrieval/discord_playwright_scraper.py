@@ -5,7 +5,9 @@ and stable ID-attribute selectors. Never uses obfuscated CSS class names.
 """
 from __future__ import annotations
 
-from dataclasses import dataclass
+import time
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
@@ -15,8 +17,14 @@ from playwright.sync_api import (  # type: ignore[import-untyped]
     Playwright,
     sync_playwright,
 )
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
 
+from .blocking import ResourceBlocker
+from .db import MessageColumns, MessageRow
 from .logger import create_logger
+from .metrics import ScrapeMetrics, payload_bytes
+from .network_capture import NetworkCapture
+from .recording import Recorder
 
 
 @dataclass
@@ -28,6 +36,8 @@ class DiscordMessage:
     timestamp: str | None = None
     message_id: str | None = None
     is_reply: bool = False
+    reply_to_id: str | None = None
+    attachment_urls: list[str] = field(default_factory=list)
 
 
 def clean_message_id(raw_id: str | None) -> str | None:
@@ -40,12 +50,26 @@ def clean_message_id(raw_id: str | None) -> str | None:
     return raw_id
 
 
+def clean_reply_id(raw_id: str | None, message_id: str | None = None) -> str | None:
+    """Extract the replied-to message ID from a reply element's ID suffix.
+
+    Accepts a bare ID or a dashed form like 'context-1234567890'. Returns None
+    when the suffix is the message's own ID (no usable parent reference).
+    """
+    if not raw_id:
+        return None
+    ref = raw_id.rsplit("-", 1)[-1]
+    if not ref or ref == message_id:
+        return None
+    return ref
+
+
 def parse_raw_messages(
     raw: list[dict], limit: int = 200
 ) -> list[DiscordMessage]:
     """Parse raw message dicts (from DOM extraction) into DiscordMessage objects.
 
-    Skips entries with empty content or missing ID.
+    Skips entries with a missing ID, or with neither content nor attachments.
     """
     messages: list[DiscordMessage] = []
     for entry in raw:
@@ -54,7 +78,8 @@ def parse_raw_messages(
         content = (entry.get("content") or "").strip()
         raw_id = entry.get("id")
         msg_id = clean_message_id(raw_id)
-        if not content or not msg_id:
+        attachments = [url for url in entry.get("attachments") or [] if url]
+        if not msg_id or not (content or attachments):
             continue
         messages.append(
             DiscordMessage(
@@ -63,6 +88,8 @@ def parse_raw_messages(
                 timestamp=entry.get("timestamp"),
                 message_id=msg_id,
                 is_reply=entry.get("reply_id") is not None,
+                reply_to_id=clean_reply_id(entry.get("reply_id"), msg_id),
+                attachment_urls=attachments,
             )
         )
     return messages
@@ -71,40 +98,242 @@ def parse_raw_messages(
 # JavaScript executed inside the page to batch-extract message data.
 # Uses stable selectors: element IDs and semantic HTML — no CSS classes.
 # Adjust if Task 2 probe reveals different DOM structure.
+# _MESSAGE_FIELDS_JS maps one message <li> to the raw dict parse_raw_messages
+# expects; it is spliced into the extraction scripts below.
+_MESSAGE_FIELDS_JS = """
+(el) => {
+    const msgId = el.id.split('-').pop();
+    const heading = el.querySelector('h3');
+    const time = el.querySelector('time');
+    // The reply preview also holds a message-content-* node (the parent's),
+    // so match this message's own content by ID first.
+    const content = el.querySelector(`[id="message-content-${msgId}"]`)
+        || el.querySelector('[id^="message-content-"]');
+    const reply = el.querySelector('[id^="message-reply-"]');
+    const parent = reply ? reply.querySelector('[id^="message-content-"]') : null;
+    // Attachment links live in the accessories block; their href/src
+    // attributes survive even when the loads themselves are blocked.
+    const accessories = el.querySelector(`[id="message-accessories-${msgId}"]`);
+    const attachments = new Set();
+    if (accessories) {
+        for (const node of accessories.querySelectorAll('a[href], img[src], video[src]')) {
+            const url = node.getAttribute('href') || node.getAttribute('src');
+            if (url && url.includes('/attachments/')) attachments.add(url);
+        }
+    }
+    return {
+        id: el.id || null,
+        author: heading ? heading.textContent.trim() : null,
+        timestamp: time ? time.getAttribute('datetime') : null,
+        content: content ? content.textContent.trim() : null,
+        reply_id: parent
+            ? parent.id.replace('message-content-', '')
+            : (reply ? reply.id.replace('message-reply-', '') : null),
+        attachments: Array.from(attachments),
+    };
+}
+"""
+
 _EXTRACT_JS = """
 () => {
+    const extract = __FIELDS__;
     const items = document.querySelectorAll('li[id^="chat-messages-"]');
-    return Array.from(items).map(el => {
-        const heading = el.querySelector('h3');
-        const time = el.querySelector('time');
-        const content = el.querySelector('[id^="message-content-"]');
-        const reply = el.querySelector('[id^="message-reply-"]');
-        return {
-            id: el.id || null,
-            author: heading ? heading.textContent.trim() : null,
-            timestamp: time ? time.getAttribute('datetime') : null,
-            content: content ? content.textContent.trim() : null,
-            reply_id: reply ? reply.id.replace('message-reply-', '') : null,
-        };
+    return Array.from(items).map(extract);
+}
+""".replace("__FIELDS__", _MESSAGE_FIELDS_JS.strip())
+
+# Delta variant: the page remembers the [lo, hi] range of message IDs it has
+# already returned (Discord IDs grow over time and each pass renders a
+# contiguous slice) and only serializes nodes outside it. The range is
+# compared against its value before this call, then widened to cover every
+# rendered node, so every node outside it must be returned: a node left out
+# would fall inside the widened range and never be sent again. Delta calls
+# therefore take no limit.
+_EXTRACT_NEW_JS = """
+() => {
+    const extract = __FIELDS__;
+    const state = window.__dreaderSeen || (window.__dreaderSeen = { lo: null, hi: null });
+    const fresh = [];
+    let lo = state.lo, hi = state.hi;
+    for (const el of document.querySelectorAll('li[id^="chat-messages-"]')) {
+        const raw = el.id.split('-').pop();
+        const key = /^\\d+$/.test(raw) ? BigInt(raw) : null;
+        if (key !== null && state.lo !== null && key >= state.lo && key <= state.hi) {
+            continue;
+        }
+        if (key !== null) {
+            if (lo === null || key < lo) lo = key;
+            if (hi === null || key > hi) hi = key;
+        }
+        fresh.push(extract(el));
+    }
+    state.lo = lo;
+    state.hi = hi;
+    return fresh;
+}
+""".replace("__FIELDS__", _MESSAGE_FIELDS_JS.strip())
+
+# Columnar delta variant for large passes: same seen-range bookkeeping (and
+# no limit, for the same reason) as _EXTRACT_NEW_JS, but IDs are cleaned,
+# empty messages dropped and the result shipped as parallel arrays, so
+# Python does no per-message parsing.
+_EXTRACT_COLUMNS_JS = """
+() => {
+    const extract = __FIELDS__;
+    const state = window.__dreaderSeen || (window.__dreaderSeen = { lo: null, hi: null });
+    const cols = { ids: [], authors: [], timestamps: [], contents: [], reply_ids: [],
+                   attachments: [] };
+    let lo = state.lo, hi = state.hi;
+    for (const el of document.querySelectorAll('li[id^="chat-messages-"]')) {
+        const id = el.id.split('-').pop();
+        const key = /^\\d+$/.test(id) ? BigInt(id) : null;
+        if (key !== null && state.lo !== null && key >= state.lo && key <= state.hi) {
+            continue;
+        }
+        if (key !== null) {
+            if (lo === null || key < lo) lo = key;
+            if (hi === null || key > hi) hi = key;
+        }
+        if (!id) continue;
+        const m = extract(el);
+        const content = (m.content || '').trim();
+        if (!content && !m.attachments.length) continue;
+        const reply = m.reply_id ? m.reply_id.split('-').pop() : null;
+        cols.ids.push(id);
+        cols.authors.push(m.author || 'unknown');
+        cols.timestamps.push(m.timestamp || '');
+        cols.contents.push(content);
+        cols.reply_ids.push(reply && reply !== id ? reply : null);
+        cols.attachments.push(JSON.stringify(m.attachments));
+    }
+    state.lo = lo;
+    state.hi = hi;
+    return cols;
+}
+""".replace("__FIELDS__", _MESSAGE_FIELDS_JS.strip())
+
+_RESET_SEEN_JS = "() => { delete window.__dreaderSeen; }"
+
+# Capture mode: a MutationObserver serializes every message node the moment
+# it is inserted, before the virtualized list can recycle it. Records are
+# keyed by ID so re-renders between drains collapse to the latest version;
+# the buffer only holds what arrived since the last drain.
+_START_CAPTURE_JS = """
+() => {
+    if (window.__dreaderCapture) return false;
+    const extract = __FIELDS__;
+    const selector = 'li[id^="chat-messages-"]';
+    const buffer = new Map();
+    const take = (el) => { buffer.set(el.id, extract(el)); };
+    const observer = new MutationObserver((mutations) => {
+        for (const m of mutations) {
+            for (const node of m.addedNodes) {
+                if (node.nodeType !== Node.ELEMENT_NODE) continue;
+                if (node.matches(selector)) take(node);
+                else node.querySelectorAll(selector).forEach(take);
+            }
+        }
     });
+    document.querySelectorAll(selector).forEach(take);
+    observer.observe(document.body, { childList: true, subtree: true });
+    window.__dreaderCapture = { observer, buffer };
+    return true;
+}
+""".replace("__FIELDS__", _MESSAGE_FIELDS_JS.strip())
+
+_DRAIN_CAPTURE_JS = """
+() => {
+    const state = window.__dreaderCapture;
+    if (!state) return [];
+    const records = Array.from(state.buffer.values());
+    state.buffer.clear();
+    return records;
 }
 """
 
-# Scroll script: scrolls the message container up by one viewport and
-# returns whether we're at the top.
+_STOP_CAPTURE_JS = """
+() => {
+    const state = window.__dreaderCapture;
+    if (state) state.observer.disconnect();
+    delete window.__dreaderCapture;
+}
+"""
+
+# Scroll script: jumps the message container to its top, which makes
+# Discord fetch the previous page of history. Returns a snapshot of the
+# rendered list so the caller can wait for it to change.
 _SCROLL_JS = """
 () => {
+    const items = document.querySelectorAll('li[id^="chat-messages-"]');
     const scroller = document.querySelector('[class*="scrollerInner"]');
-    if (!scroller) return { at_top: true };
-    const parent = scroller.parentElement;
-    if (!parent) return { at_top: true };
-    const before = parent.scrollTop;
-    parent.scrollTop = 0;
-    const after = parent.scrollTop;
-    return { before, after, at_top: before === after || after === 0 };
+    if (scroller && scroller.parentElement) scroller.parentElement.scrollTop = 0;
+    return { first_id: items.length ? items[0].id : null, count: items.length };
+}
+"""
+
+# Resolves once a scroll has an outcome, compared with the snapshot taken by
+# _SCROLL_JS: "loaded" when older history rendered (a new first message
+# node, or a different number of nodes), "start" when the channel's welcome
+# header is shown, which Discord renders only above the very first message.
+# The header is recognised by structure, not by its text, which follows the
+# user's locale: a visible child of the list, before any message node, that
+# holds a heading. Loading placeholders and date dividers have no heading.
+_SCROLL_OUTCOME_JS = """
+(prev) => {
+    const selector = 'li[id^="chat-messages-"]';
+    const items = document.querySelectorAll(selector);
+    if (items.length > 0
+        && (items[0].id !== prev.first_id || items.length !== prev.count)) {
+        return 'loaded';
+    }
+    const heading = 'h1, h2, h3, [role="heading"]';
+    const inner = document.querySelector('[class*="scrollerInner"]');
+    for (const el of inner ? inner.children : []) {
+        if (el.matches(selector) || el.querySelector(selector)) break;
+        if (el.getClientRects().length
+            && (el.matches(heading) || el.querySelector(heading))) {
+            return 'start';
+        }
+    }
+    return false;
 }
 """
 
+_HOME_URL = "https://discord.com/channels/@me"
+
+# Floor for a scroll's wait when ``begin_scroll`` and ``finish_scroll`` are
+# split across tabs and the others used up most of the budget.
+_MIN_SCROLL_WAIT_MS = 1000
+
+
+@dataclass(frozen=True)
+class ScrollResult:
+    """Outcome of one ``scroll_up`` call.
+
+    ``at_top`` means the page showed the start of the channel. A scroll
+    that rendered nothing within the timeout is ``stalled`` instead: a
+    slow fetch, which says nothing about where the history ends.
+    """
+
+    at_top: bool
+    waited_ms: float
+    stalled: bool = False
+
+
+def scroll_result(outcome: object, waited_ms: float) -> ScrollResult:
+    """Map a _SCROLL_OUTCOME_JS result (None on timeout) to a ScrollResult."""
+    return ScrollResult(
+        at_top=outcome == "start", waited_ms=waited_ms, stalled=outcome is None
+    )
+
+
+@dataclass(frozen=True)
+class PendingScroll:
+    """A scroll issued by ``begin_scroll`` whose load has not been awaited."""
+
+    snapshot: dict[str, Any]
+    started: float
+
 
 class PlaywrightDiscordScraper:
     """Scrapes Discord messages using Playwright with a persistent browser context."""
@@ -113,12 +342,24 @@ class PlaywrightDiscordScraper:
         self,
         user_data_dir: str = "data/playwright-profile",
         headless: bool = False,
+        scroll_timeout_ms: int = 10_000,
+        blocker: ResourceBlocker | None = None,
+        recorder: Recorder | None = None,
     ) -> None:
         self._user_data_dir = str(Path(user_data_dir).resolve())
         self._headless = headless
+        self._scroll_timeout_ms = scroll_timeout_ms
+        self.blocker = blocker
+        self.recorder = recorder
+        self._record_tab = recorder.new_tab() if recorder else 0
+        # Set by the session driving this scraper (see ``metrics``).
+        self.metrics: ScrapeMetrics | None = None
         self._pw: Playwright | None = None
         self._context: BrowserContext | None = None
         self._page: Page | None = None
+        self._page_crashed = False
+        self._owns_context = True
+        self._network: NetworkCapture | None = None
         self._log = create_logger("retrieval.playwright")
 
     def start(self) -> None:
@@ -131,22 +372,90 @@ class PlaywrightDiscordScraper:
             viewport={"width": 1280, "height": 720},
             args=["--disable-blink-features=AutomationControlled"],
         )
-        self._page = (
+        self._attach_page(
             self._context.pages[0] if self._context.pages else self._context.new_page()
         )
         self._log.info("Browser launched", {"profile": self._user_data_dir})
 
+    def _attach_page(self, page: Page) -> None:
+        self._page = page
+        self._page_crashed = False
+        page.on("crash", self._on_crash)
+        if self.blocker is not None:
+            assert self._context is not None
+            self.blocker.install(self._context.new_cdp_session(page))
+
+    def _on_crash(self, _page: Page) -> None:
+        self._page_crashed = True
+        self._log.error("Page crashed")
+
+    @property
+    def page_healthy(self) -> bool:
+        """False once the current page has crashed or been closed."""
+        return (
+            self._page is not None
+            and not self._page_crashed
+            and not self._page.is_closed()
+        )
+
+    def reopen_page(self) -> None:
+        """Replace a crashed/closed page with a fresh one in the same context.
+
+        The browser process and persistent profile (and therefore the login)
+        are kept; only the tab is recycled.
+        """
+        if not self._context:
+            raise RuntimeError("Browser not started — call start() first")
+        old = self._page
+        if old is not None and not old.is_closed():
+            try:
+                old.close()
+            except Exception as e:
+                self._log.warn("Closing crashed page failed", {"error": str(e)})
+        self._attach_page(self._context.new_page())
+        self._log.info("Page reopened")
+
     @property
     def page(self) -> Page:
         if not self._page:
             raise RuntimeError("Browser not started — call start() first")
         return self._page
 
-    def navigate_to_channel(self, server_id: str, channel_id: str) -> None:
+    def navigate_to_channel(
+        self, server_id: str, channel_id: str, message_id: str | None = None
+    ) -> None:
+        """Open a channel; with ``message_id``, jump straight to that message."""
         url = f"https://discord.com/channels/{server_id}/{channel_id}"
+        if message_id:
+            url += f"/{message_id}"
+        self._record(
+            "navigate", server_id=server_id, channel_id=channel_id, message_id=message_id
+        )
         self.page.goto(url, wait_until="networkidle")
         self._log.info("Navigated", {"url": url})
 
+    def open_home(self) -> None:
+        """Open Discord's home view, which needs no channel to load."""
+        self.page.goto(_HOME_URL, wait_until="domcontentloaded")
+        self._log.info("Navigated", {"url": _HOME_URL})
+
+    def wait_for_server_list(self, timeout: int = 300) -> bool:
+        """Wait for the server list, which every logged-in view shows.
+
+        Use after ``open_home``; on a channel, ``wait_for_login`` also waits
+        for the channel itself to be ready.
+        """
+        self._log.info("Waiting for login", {"timeout_s": timeout})
+        try:
+            self.page.wait_for_selector(
+                '[data-list-id="guildsnav"]', timeout=timeout * 1000
+            )
+            self._log.info("Login detected")
+            return True
+        except Exception:
+            self._log.error("Login timeout")
+            return False
+
     def wait_for_login(self, timeout: int = 300) -> bool:
         """Wait for the chat input to appear, indicating a logged-in session."""
         self._log.info("Waiting for login", {"timeout_s": timeout})
@@ -162,20 +471,178 @@ class PlaywrightDiscordScraper:
 
     def extract_messages(self, limit: int = 200) -> list[DiscordMessage]:
         """Extract messages from the current channel using batch DOM evaluation."""
-        raw: list[dict[str, Any]] = self.page.evaluate(_EXTRACT_JS)
+        with self._phase("extract"):
+            raw: list[dict[str, Any]] = self.page.evaluate(_EXTRACT_JS)
+        self._record("extract", raw=raw)
         self._log.debug("Raw DOM elements", {"count": len(raw)})
-        return parse_raw_messages(raw, limit=limit)
+        with self._phase("parse"):
+            return parse_raw_messages(raw, limit=limit)
+
+    def extract_new_messages(self) -> list[DiscordMessage]:
+        """Extract only messages the page has not returned before (see _EXTRACT_NEW_JS).
+
+        Unlike ``extract_messages`` there is no limit: the page counts every
+        returned node as seen, so anything cut here would be lost.
+        """
+        with self._phase("extract"):
+            raw: list[dict[str, Any]] = self.page.evaluate(_EXTRACT_NEW_JS)
+        self._record("extract", raw=raw)
+        self._log.debug("New DOM elements", {"count": len(raw)})
+        with self._phase("parse"):
+            return parse_raw_messages(raw, limit=len(raw))
+
+    def extract_new_columns(self, channel_id: str, server_id: str) -> MessageColumns:
+        """``extract_new_messages`` as one columnar batch (see _EXTRACT_COLUMNS_JS)."""
+        with self._phase("extract"):
+            raw: dict[str, list[Any]] = self.page.evaluate(_EXTRACT_COLUMNS_JS)
+        self._record("columns", raw=raw)
+        self._log.debug("New DOM elements", {"count": len(raw["ids"])})
+        with self._phase("parse"):
+            return MessageColumns.from_page(channel_id, server_id, raw)
+
+    def reset_seen(self) -> None:
+        """Forget the page-side seen range, so the next delta returns everything."""
+        self.page.evaluate(_RESET_SEEN_JS)
+
+    def start_capture(self) -> None:
+        """Buffer message nodes in the page as they are inserted (capture mode).
 
-    def scroll_up(self) -> bool:
-        """Scroll up to load older messages. Returns True if at top."""
-        result: dict[str, Any] = self.page.evaluate(_SCROLL_JS)
-        at_top = result.get("at_top", True)
-        if at_top:
-            self._log.info("Reached top of channel")
-        self.page.wait_for_timeout(2000)
-        return at_top
+        The buffer starts with the currently rendered messages. Navigation
+        discards it, so call this again after ``navigate_to_channel``.
+        """
+        if self.page.evaluate(_START_CAPTURE_JS):
+            self._log.info("Capture started")
+
+    def drain_capture(self) -> list[DiscordMessage]:
+        """Return and clear everything captured since the last drain."""
+        with self._phase("extract"):
+            raw: list[dict[str, Any]] = self.page.evaluate(_DRAIN_CAPTURE_JS)
+        self._record("extract", raw=raw)
+        self._log.debug("Drained capture buffer", {"count": len(raw)})
+        with self._phase("parse"):
+            return parse_raw_messages(raw, limit=len(raw))
+
+    def stop_capture(self) -> None:
+        self.page.evaluate(_STOP_CAPTURE_JS)
+
+    def start_network_capture(self, channel_id: str, server_id: str) -> None:
+        """Collect the channel's history API responses (network engine).
+
+        Call before ``navigate_to_channel`` so the initial page of history
+        is captured too.
+        """
+        self.stop_network_capture()
+        self._network = NetworkCapture(self.page, channel_id, server_id)
+
+    def drain_network_capture(self) -> list[MessageRow]:
+        """Rows parsed from history responses received since the last drain."""
+        if self._network is None:
+            return []
+        with self._phase("extract"):
+            payloads = self._network.drain_payloads()
+        self._record("network", payloads=payloads)
+        with self._phase("parse"):
+            return self._network.parse(payloads)
+
+    def stop_network_capture(self) -> None:
+        if self._network is not None:
+            self._network.close()
+            self._network = None
+
+    def scroll_up(self) -> ScrollResult:
+        """Scroll up and wait until older messages render.
+
+        The wait ends as soon as the rendered list changes or the channel
+        start is shown, or after ``scroll_timeout_ms``. A timeout is a
+        stalled scroll, not the top (see ``ScrollResult``).
+        """
+        return self.finish_scroll(self.begin_scroll())
+
+    def begin_scroll(self) -> PendingScroll:
+        """First half of ``scroll_up``: trigger the history fetch, don't wait."""
+        started = time.monotonic()
+        snapshot: dict[str, Any] = self.page.evaluate(_SCROLL_JS)
+        return PendingScroll(snapshot=snapshot, started=started)
+
+    def finish_scroll(self, pending: PendingScroll) -> ScrollResult:
+        """Second half of ``scroll_up``: wait for the fetch ``begin_scroll`` started."""
+        # An empty list has nothing above it to load.
+        outcome: object = "start"
+        if pending.snapshot.get("first_id") is not None:
+            elapsed_ms = (time.monotonic() - pending.started) * 1000
+            try:
+                # Interval rather than "raf" polling: rAF is paused in
+                # background tabs (see ``open_tab``).
+                outcome = self.page.wait_for_function(
+                    _SCROLL_OUTCOME_JS,
+                    arg=pending.snapshot,
+                    polling=100,
+                    timeout=max(
+                        self._scroll_timeout_ms - elapsed_ms,
+                        min(self._scroll_timeout_ms, _MIN_SCROLL_WAIT_MS),
+                    ),
+                ).json_value()
+            except PlaywrightTimeoutError:
+                outcome = None
+        result = scroll_result(outcome, (time.monotonic() - pending.started) * 1000)
+        self._record(
+            "scroll",
+            at_top=result.at_top,
+            stalled=result.stalled,
+            waited_ms=round(result.waited_ms, 1),
+        )
+        self._log_scroll(result)
+        return result
+
+    def _log_scroll(self, result: ScrollResult) -> None:
+        if result.at_top:
+            self._log.info("Reached top of channel", {"waited_ms": round(result.waited_ms)})
+        elif result.stalled:
+            self._log.warn(
+                "Scroll rendered no older history", {"waited_ms": round(result.waited_ms)}
+            )
+
+    def _record(self, op: str, **data: Any) -> None:
+        """Hook for every page result: count its size, and record it if asked."""
+        if self.metrics is not None:
+            for value in data.values():
+                if isinstance(value, list | dict):
+                    self.metrics.add("payload_bytes", payload_bytes(value))
+        if self.recorder is not None:
+            self.recorder.record(self._record_tab, op, **data)
+
+    def _phase(self, name: str) -> AbstractContextManager[None]:
+        return self.metrics.phase(name) if self.metrics is not None else nullcontext()
+
+    def open_tab(self) -> PlaywrightDiscordScraper:
+        """Open another page in this browser context as a scraper of its own.
+
+        Tabs share the profile (and so the login) of the context. Closing a
+        tab closes only its page; the browser stays with this scraper.
+        """
+        if not self._context:
+            raise RuntimeError("Browser not started — call start() first")
+        tab = PlaywrightDiscordScraper(
+            user_data_dir=self._user_data_dir,
+            headless=self._headless,
+            scroll_timeout_ms=self._scroll_timeout_ms,
+            blocker=self.blocker,
+            recorder=self.recorder,
+        )
+        tab._context = self._context
+        tab._owns_context = False
+        tab._attach_page(self._context.new_page())
+        return tab
 
     def close(self) -> None:
+        if not self._owns_context:
+            if self._page and not self._page.is_closed():
+                self._page.close()
+            self._page = None
+            self._context = None
+            return
+        if self.blocker is not None and self.blocker.total_blocked:
+            self._log.info("Blocked requests", self.blocker.summary())
         if self._context:
             self._context.close()
             self._context = None
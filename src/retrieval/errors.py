@@ -54,3 +54,15 @@ class MetadataError(DReaderError):
 
 class SessionError(DReaderError):
     """Wraps any fatal abort of a RetrievalSession."""
+
+
+class ExportError(DReaderError):
+    """An export could not be written (bad format, missing optional package)."""
+
+
+class RecordingError(DReaderError):
+    """A scrape recording is unreadable or has an unsupported format."""
+
+
+class ScrollStalledError(DReaderError):
+    """Several scrolls in a row rendered no older history and no channel start."""
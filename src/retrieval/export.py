@@ -0,0 +1,253 @@
+"""Streaming exporter: messages to compressed JSONL or Parquet.
+
+Rows are read in bounded ``rowid`` keyset chunks and written as they
+arrive, so memory stays flat regardless of archive size. JSONL records use
+the ``MessageRecord.to_dict`` keys plus the message's identity fields.
+
+Incremental exports are tracked per name in ``export_watermarks`` by the
+highest ``messages.rowid`` written; the next run with the same name reads
+only rows inserted since. ``VACUUM`` may renumber rowids, so reset the
+watermark (delete its row) after vacuuming.
+
+zstd output needs ``zstandard`` and Parquet needs ``pyarrow`` (the
+``export`` extra); gzip JSONL works with the standard library alone.
+"""
+from __future__ import annotations
+
+import gzip
+import importlib
+import io
+import json
+import os
+import sqlite3
+from collections.abc import Iterator, Sequence
+from dataclasses import dataclass
+from datetime import UTC, datetime
+from pathlib import Path
+from types import ModuleType
+from typing import Any, TextIO
+
+from .errors import ExportError
+
+FORMATS = ("jsonl", "parquet")
+COMPRESSIONS = ("gzip", "zstd", "none")
+
+_SELECT = """
+    SELECT m.rowid, m.id, m.channel_id, c.name, m.author_id, m.author_name,
+           m.content, m.timestamp, m.reply_to_message_id, p.author_name,
+           m.edited_timestamp, m.is_pinned, m.attachment_urls, m.embed_data,
+           m.message_url, m.has_attachments, m.has_embeds
+    FROM messages m
+    LEFT JOIN channels c ON c.id = m.channel_id
+    LEFT JOIN messages p
+      ON p.channel_id = m.channel_id AND p.id = m.reply_to_message_id
+"""
+
+# Column names for the fields after rowid in _SELECT (Parquet schema order).
+COLUMNS = (
+    "message_id", "channel_id", "channel_name", "author_id", "author_name",
+    "content", "timestamp", "reply_to_message_id", "reply_to_author",
+    "edited_timestamp", "is_pinned", "attachment_urls", "embed_data",
+    "message_url", "has_attachments", "has_embeds",
+)
+_BOOL_COLUMNS = frozenset({"is_pinned", "has_attachments", "has_embeds"})
+
+Row = tuple[Any, ...]
+
+
+@dataclass(frozen=True)
+class ExportResult:
+    path: Path
+    rows: int
+    last_rowid: int
+
+
+def iter_export_chunks(
+    conn: sqlite3.Connection,
+    *,
+    channel_ids: Sequence[str] = (),
+    after_rowid: int = 0,
+    chunk_size: int = 1000,
+) -> Iterator[list[Row]]:
+    """Yield lists of at most ``chunk_size`` rows in insertion (rowid) order."""
+    sql = _chunk_sql(len(channel_ids))
+    last = after_rowid
+    while True:
+        rows = conn.execute(sql, (last, *channel_ids, chunk_size)).fetchall()
+        if not rows:
+            return
+        yield rows
+        last = rows[-1][0]
+
+
+def _chunk_sql(n_channels: int) -> str:
+    where = "WHERE m.rowid > ?"
+    if n_channels:
+        # The unary + keeps SQLite off idx_messages_channel_ts: through the
+        # index every chunk would re-read and re-sort the whole channel to
+        # find its rowid range, while the rowid walk seeks to ``last`` and
+        # stops after ``chunk_size`` matches.
+        where += f" AND +m.channel_id IN ({', '.join('?' * n_channels)})"
+    return f"{_SELECT} {where} ORDER BY m.rowid LIMIT ?"
+
+
+def to_record(row: Row, nav_index: int, session_id: str) -> dict[str, object]:
+    """Map an export row to the MessageRecord.to_dict shape (plus IDs).
+
+    ``nav_index`` is the row's position within this export stream and
+    ``captured_at`` is the Discord timestamp; the archive keeps no separate
+    capture clock.
+    """
+    (_, message_id, channel_id, channel_name, author_id, author_name, content,
+     timestamp, reply_to, reply_author, edited, pinned, attachments, embeds,
+     url, has_attachments, has_embeds) = row
+    return {
+        "raw_text": content or "",
+        "captured_at": timestamp,
+        "nav_index": nav_index,
+        "channel_name": channel_name or channel_id,
+        "session_id": session_id,
+        "author": author_name,
+        "discord_timestamp": timestamp,
+        "is_reply": reply_to is not None,
+        "reply_to_author": reply_author,
+        "metadata_extraction_succeeded": author_name != "unknown",
+        "copy_attempt_count": 0,
+        "message_id": message_id,
+        "channel_id": channel_id,
+        "author_id": author_id,
+        "reply_to_message_id": reply_to,
+        "edited_timestamp": edited,
+        "is_pinned": bool(pinned),
+        "attachment_urls": attachments,
+        "embed_data": embeds,
+        "message_url": url,
+        "has_attachments": bool(has_attachments),
+        "has_embeds": bool(has_embeds),
+    }
+
+
+def _require(module: str) -> ModuleType:
+    try:
+        return importlib.import_module(module)
+    except ImportError as e:
+        raise ExportError(
+            f"{module} is required for this export; install the 'export' extra",
+            {"module": module},
+        ) from e
+
+
+def infer_compression(path: Path) -> str:
+    return {".gz": "gzip", ".zst": "zstd"}.get(path.suffix, "none")
+
+
+def _open_text(path: Path, compression: str) -> TextIO:
+    if compression == "gzip":
+        return gzip.open(path, "wt", encoding="utf-8", compresslevel=6)
+    if compression == "zstd":
+        zstd = _require("zstandard")
+        raw = open(path, "wb")
+        stream = zstd.ZstdCompressor(level=3).stream_writer(raw, closefd=True)
+        return io.TextIOWrapper(stream, encoding="utf-8")
+    return open(path, "w", encoding="utf-8")
+
+
+def _write_jsonl(
+    path: Path, chunks: Iterator[list[Row]], compression: str, session_id: str
+) -> tuple[int, int]:
+    count, last_rowid = 0, 0
+    with _open_text(path, compression) as out:
+        for chunk in chunks:
+            out.writelines(
+                json.dumps(to_record(row, count + i, session_id)) + "\n"
+                for i, row in enumerate(chunk)
+            )
+            count += len(chunk)
+            last_rowid = chunk[-1][0]
+    return count, last_rowid
+
+
+def _write_parquet(path: Path, chunks: Iterator[list[Row]]) -> tuple[int, int]:
+    pa = _require("pyarrow")
+    pq = _require("pyarrow.parquet")
+    schema = pa.schema(
+        [(c, pa.bool_() if c in _BOOL_COLUMNS else pa.string()) for c in COLUMNS]
+    )
+    count, last_rowid = 0, 0
+    with pq.ParquetWriter(str(path), schema, compression="zstd") as writer:
+        for chunk in chunks:
+            columns = list(zip(*chunk, strict=True))[1:]
+            data = {
+                name: [bool(v) for v in col] if name in _BOOL_COLUMNS else list(col)
+                for name, col in zip(COLUMNS, columns, strict=True)
+            }
+            writer.write_table(pa.Table.from_pydict(data, schema=schema))
+            count += len(chunk)
+            last_rowid = chunk[-1][0]
+    return count, last_rowid
+
+
+def get_watermark(conn: sqlite3.Connection, name: str) -> int:
+    row = conn.execute(
+        "SELECT last_rowid FROM export_watermarks WHERE name = ?", (name,)
+    ).fetchone()
+    return int(row[0]) if row else 0
+
+
+def _save_watermark(conn: sqlite3.Connection, name: str, last_rowid: int, rows: int) -> None:
+    with conn:
+        conn.execute(
+            """INSERT INTO export_watermarks (name, last_rowid, rows_exported, exported_at)
+               VALUES (?, ?, ?, ?)
+               ON CONFLICT(name) DO UPDATE SET
+                 last_rowid = excluded.last_rowid,
+                 rows_exported = rows_exported + excluded.rows_exported,
+                 exported_at = excluded.exported_at""",
+            (name, last_rowid, rows, datetime.now(UTC).isoformat()),
+        )
+
+
+def export_messages(
+    conn: sqlite3.Connection,
+    out_path: str | Path,
+    *,
+    fmt: str = "jsonl",
+    compression: str | None = None,
+    channel_ids: Sequence[str] = (),
+    watermark: str | None = None,
+    chunk_size: int = 1000,
+) -> ExportResult:
+    """Stream messages to ``out_path``; optionally resume from a named watermark.
+
+    The file is written under a temporary name and renamed into place once
+    complete, and the watermark only advances after that, so a failed run
+    can simply be repeated.
+    """
+    if fmt not in FORMATS:
+        raise ExportError(f"Unknown export format: {fmt}", {"format": fmt})
+    path = Path(out_path)
+    compression = compression or infer_compression(path)
+    if compression not in COMPRESSIONS:
+        raise ExportError(
+            f"Unknown compression: {compression}", {"compression": compression}
+        )
+    after = get_watermark(conn, watermark) if watermark else 0
+    chunks = iter_export_chunks(
+        conn, channel_ids=channel_ids, after_rowid=after, chunk_size=chunk_size
+    )
+    session_id = f"export-{datetime.now(UTC).strftime('%Y%m%dT%H%M%SZ')}"
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(path.name + ".partial")
+    try:
+        if fmt == "parquet":
+            count, last_rowid = _write_parquet(tmp, chunks)
+        else:
+            count, last_rowid = _write_jsonl(tmp, chunks, compression, session_id)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+
+    if watermark and count:
+        _save_watermark(conn, watermark, last_rowid, count)
+    return ExportResult(path=path, rows=count, last_rowid=last_rowid or after)
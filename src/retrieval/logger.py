@@ -4,16 +4,34 @@ Log file:   data/logs/dreader-{YYYY-MM-DD}.jsonl
 JSONL line: {"timestamp":"...","level":"info","component":"retrieval.session",
              "message":"...","data":{...}}
 Console:    12:00:00 INFO  [retrieval.session] ... {...}
+
+All loggers of a process that share a log directory write through one
+background sink: one file handle per day, batched writes, flushed on error
+and at exit. The sink rotates files past LOG_MAX_BYTES (default 50 MB),
+gzips past days' files and deletes those older than LOG_RETENTION_DAYS
+(default 30); see ``logs`` for the layout and ``python -m src.retrieval
+logs`` to query it. LOG_DIR overrides the default directory.
 """
 from __future__ import annotations
 
+import atexit
 import json
 import os
+import queue
 import sys
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 from typing import IO, Any
 
+from .logs import (
+    MAX_BYTES,
+    RETENTION_DAYS,
+    append_index,
+    maintain,
+    rotated_path,
+)
+
 _LEVEL_ORDER: dict[str, int] = {
     "debug": 0,
     "info": 1,
@@ -27,8 +45,192 @@ def _fmt_ts(dt: datetime) -> str:
     return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{dt.microsecond // 1000:03d}Z"
 
 
+class _Flush:
+    """Queue marker: set once everything queued before it is on disk."""
+
+    __slots__ = ("done",)
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+
+
+_Item = tuple[str, str] | _Flush | None
+
+
+class _LogSink:
+    """The one writer for a log directory, shared by every logger in the process.
+
+    Loggers queue finished lines; a daemon thread drains the queue in
+    batches, writes each batch with one ``write`` per day file and flushes
+    once per batch. The same thread keeps the hour index, rotates the active
+    file past ``max_bytes`` and, at startup and when the day changes,
+    compresses closed files and applies retention (see ``logs``).
+    """
+
+    def __init__(
+        self,
+        log_dir: Path,
+        max_bytes: int = MAX_BYTES,
+        retention_days: int = RETENTION_DAYS,
+    ) -> None:
+        self._dir = log_dir
+        self._max_bytes = max_bytes
+        self._retention_days = retention_days
+        self._queue: queue.SimpleQueue[_Item] = queue.SimpleQueue()
+        self._file: IO[bytes] | None = None
+        self._date = ""
+        self._hours: set[str] = set()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="dreader-log", daemon=True)
+        self._thread.start()
+
+    def put(self, hour: str, line: str) -> None:
+        if self._stopped:
+            # Logging after shutdown (e.g. from another atexit hook).
+            self._write([(hour, line)])
+        else:
+            self._queue.put((hour, line))
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until everything queued so far has been written."""
+        if self._stopped:
+            return
+        marker = _Flush()
+        self._queue.put(marker)
+        marker.done.wait(timeout)
+
+    def stop(self) -> None:
+        if not self._stopped:
+            self._queue.put(None)
+            self._thread.join(timeout=5.0)
+            self._stopped = True
+
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < _BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(batch)
+            if None in batch:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, batch: list[_Item]) -> None:
+        markers: list[_Flush] = []
+        lines: list[str] = []
+        hours: list[str] = []
+        date = self._date
+        try:
+            for item in batch:
+                if item is None:
+                    continue
+                if isinstance(item, _Flush):
+                    markers.append(item)
+                    continue
+                hour, line = item
+                if hour[:10] != date and lines:
+                    self._emit(date, hours, lines)
+                    lines, hours = [], []
+                date = hour[:10]
+                if hour not in hours:
+                    hours.append(hour)
+                lines.append(line)
+            if lines:
+                self._emit(date, hours, lines)
+            if self._file is not None:
+                self._file.flush()
+        except OSError as e:
+            sys.stderr.write(f"dreader: log write failed: {e}\n")
+        finally:
+            for marker in markers:
+                marker.done.set()
+
+    def _emit(self, date: str, hours: list[str], lines: list[str]) -> None:
+        if date != self._date or self._file is None:
+            if self._file is not None:
+                self._file.close()
+            day_changed = date != self._date
+            self._date = date
+            self._dir.mkdir(parents=True, exist_ok=True)
+            if day_changed:
+                maintain(self._dir, date, self._retention_days)
+            self._file = open(self._active(), "ab")
+            self._hours = set()
+        # Offsets are taken before the write, so each is at or before this
+        # sink's first line of its hour. Another writer's lines of the same
+        # hour may come earlier; iter_log_lines allows for that.
+        offset = self._file.tell()
+        append_index(self._active(), [(h, offset) for h in hours if h not in self._hours])
+        self._hours.update(hours)
+        self._file.write("".join(lines).encode("utf-8"))
+        if self._file.tell() >= self._max_bytes:
+            self._rotate()
+
+    def _active(self) -> Path:
+        return self._dir / f"dreader-{self._date}.jsonl"
+
+    def _rotate(self) -> None:
+        # Rename only: the TypeScript logger may hold the same file open, and
+        # its lines must keep landing somewhere readable. The part is gzipped
+        # by ``maintain`` once its day is over.
+        assert self._file is not None
+        self._file.close()
+        self._file = None
+        active = self._active()
+        part = rotated_path(active)
+        os.replace(active, part)
+        index = active.with_name(active.name + ".idx")
+        if index.exists():
+            os.replace(index, part.with_name(part.name + ".idx"))
+
+
+_BATCH_SIZE = 1000
+_SINKS: dict[Path, _LogSink] = {}
+_SINKS_LOCK = threading.Lock()
+
+
+def _sink_for(log_dir: str) -> _LogSink:
+    key = Path(log_dir).resolve()
+    with _SINKS_LOCK:
+        sink = _SINKS.get(key)
+        if sink is None:
+            if not _SINKS:
+                atexit.register(shutdown_logging)
+            sink = _SINKS[key] = _LogSink(
+                key,
+                int(os.environ.get("LOG_MAX_BYTES", MAX_BYTES)),
+                int(os.environ.get("LOG_RETENTION_DAYS", RETENTION_DAYS)),
+            )
+        return sink
+
+
+def flush_logs() -> None:
+    """Write out every queued log line, in all log directories."""
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+    for sink in sinks:
+        sink.flush()
+
+
+def shutdown_logging() -> None:
+    """Flush and stop the writer threads; later log calls write synchronously."""
+    with _SINKS_LOCK:
+        sinks = list(_SINKS.values())
+    for sink in sinks:
+        sink.stop()
+
+
 class ComponentLogger:
-    """Structured JSONL logger that mirrors the TypeScript ComponentLogger."""
+    """Structured JSONL logger that mirrors the TypeScript ComponentLogger.
+
+    Lines are formatted on the calling thread and written by the shared
+    sink for ``log_dir``; ``error`` waits until its line is on disk.
+    """
 
     def __init__(
         self,
@@ -38,45 +240,34 @@ class ComponentLogger:
         use_console: bool = True,
     ) -> None:
         self._component = component
+        self._component_json = json.dumps(component)
         self._min_level_name = min_level
         self._min_level = _LEVEL_ORDER.get(min_level, 1)
         self._log_dir = Path(log_dir)
         self._use_console = use_console
-        self._log_file: IO[str] | None = None
-        self._current_date: str = ""
-
-    def _get_file(self) -> IO[str]:
-        today = datetime.now(UTC).strftime("%Y-%m-%d")
-        if today != self._current_date or self._log_file is None:
-            if self._log_file is not None:
-                self._log_file.close()
-            self._current_date = today
-            self._log_dir.mkdir(parents=True, exist_ok=True)
-            log_path = self._log_dir / f"dreader-{today}.jsonl"
-            self._log_file = open(log_path, "a", encoding="utf-8")
-        return self._log_file
+        self._sink = _sink_for(log_dir)
 
     def _log(self, level: str, message: str, data: dict[str, Any] | None = None) -> None:
         if _LEVEL_ORDER.get(level, 0) < self._min_level:
             return
-        now = datetime.now(UTC)
-        entry: dict[str, Any] = {
-            "timestamp": _fmt_ts(now),
-            "level": level,
-            "component": self._component,
-            "message": message,
-        }
-        if data is not None:
-            entry["data"] = data
-        line = json.dumps(entry) + "\n"
-        f = self._get_file()
-        f.write(line)
-        f.flush()
+        ts = _fmt_ts(datetime.now(UTC))
+        # Same bytes as json.dumps() of the entry dict, with ``data``
+        # serialized once for both the file and the console line.
+        data_json = json.dumps(data) if data is not None else None
+        line = (
+            f'{{"timestamp": "{ts}", "level": "{level}", '
+            f'"component": {self._component_json}, "message": {json.dumps(message)}'
+            + (f', "data": {data_json}}}\n' if data_json is not None else "}\n")
+        )
+        self._sink.put(ts[:13], line)
         if self._use_console:
-            time_part = _fmt_ts(now)[11:19]
-            lvl_part = level.upper().ljust(5)
-            ctx = f" {json.dumps(data)}" if data else ""
-            sys.stderr.write(f"{time_part} {lvl_part} [{self._component}] {message}{ctx}\n")
+            # Written straight away, so it stays in order with other output.
+            ctx = f" {data_json}" if data else ""
+            sys.stderr.write(
+                f"{ts[11:19]} {level.upper().ljust(5)} [{self._component}] {message}{ctx}\n"
+            )
+        if level == "error":
+            self._sink.flush()
 
     def debug(self, message: str, data: dict[str, Any] | None = None) -> None:
         self._log("debug", message, data)
@@ -99,10 +290,12 @@ class ComponentLogger:
             self._use_console,
         )
 
+    def flush(self) -> None:
+        self._sink.flush()
+
     def close(self) -> None:
-        if self._log_file is not None:
-            self._log_file.close()
-            self._log_file = None
+        """Flush this logger's lines; the shared file stays open for others."""
+        self._sink.flush()
 
 
 def create_logger(
@@ -113,4 +306,4 @@ def create_logger(
 ) -> ComponentLogger:
     """Factory function matching the TypeScript createLogger convention."""
     level = os.environ.get("LOG_LEVEL", log_level)
-    return ComponentLogger(component, level, log_dir, use_console)
+    return ComponentLogger(component, level, os.environ.get("LOG_DIR", log_dir), use_console)
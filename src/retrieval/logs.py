@@ -0,0 +1,262 @@
+"""Log files on disk: naming, rotation, compression, hour index and querying.
+
+A log directory holds:
+
+- ``dreader-YYYY-MM-DD.jsonl``, the day's active file.
+- ``dreader-YYYY-MM-DD.N.jsonl``, where part N was rotated out once the
+  active file passed the size limit. It is gzipped to ``.N.jsonl.gz`` once
+  its day is over.
+- ``dreader-YYYY-MM-DD.jsonl.gz``, the last part of a past day.
+
+Every file may have an ``.idx`` sidecar. Each sidecar line is
+``YYYY-MM-DDTHH offset``. Compressed files hold one gzip member per
+hour, written by ``compress_log`` from every line of the day, and the
+offset points at the start of that hour's member. For plain files the
+offset is where the Python sink wrote its first line of the hour. Other
+writers share the file, so earlier lines of that hour may sit before it;
+a reader seeks to the previous indexed hour instead, which is only ever
+too early. Offsets are seek hints, and readers still filter every line.
+
+The active file is shared: the TypeScript logger (src/logging/logger.ts)
+keeps its own append handle on it while the API runs beside a scrape, and
+only the Python sink rotates. So nothing of the current day is ever
+deleted or rewritten. Rotation only renames, and another writer's lines keep
+landing in the renamed part, where queries still find them. Both loggers
+pick their file by the current UTC date on every write. A past day's file
+therefore has no writer left, and ``maintain`` compresses and expires
+only those.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import os
+import re
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any
+
+MAX_BYTES = 50 * 1024 * 1024
+RETENTION_DAYS = 30
+
+_NAME_RE = re.compile(r"^dreader-(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.jsonl(\.gz)?$")
+_LEVELS = {"debug": 0, "info": 1, "warn": 2, "error": 3}
+
+
+@dataclass(frozen=True, order=True)
+class LogFile:
+    day: str
+    # Rotated part number; inf for the day's active (or final) file, which
+    # sorts after its numbered parts.
+    part: float
+    path: Path
+
+    @property
+    def compressed(self) -> bool:
+        return self.path.suffix == ".gz"
+
+    @property
+    def index_path(self) -> Path:
+        return self.path.with_name(self.path.name + ".idx")
+
+
+def log_files(log_dir: str | Path) -> list[LogFile]:
+    """The log files in ``log_dir``, oldest first."""
+    found: list[LogFile] = []
+    root = Path(log_dir)
+    if not root.is_dir():
+        return found
+    for path in root.iterdir():
+        match = _NAME_RE.match(path.name)
+        if match:
+            part = float(match.group(2)) if match.group(2) else float("inf")
+            found.append(LogFile(match.group(1), part, path))
+    return sorted(found)
+
+
+def line_hour(line: bytes) -> str | None:
+    """``YYYY-MM-DDTHH`` of a JSONL log line, read without parsing the JSON."""
+    key = line.find(b'"timestamp"')
+    if key < 0:
+        return None
+    start = line.find(b'"', key + 11) + 1
+    hour = line[start : start + 13]
+    return hour.decode("ascii", "replace") if len(hour) == 13 else None
+
+
+def append_index(path: Path, entries: Iterable[tuple[str, int]]) -> None:
+    lines = "".join(f"{hour} {offset}\n" for hour, offset in entries)
+    if lines:
+        with open(path.with_name(path.name + ".idx"), "a", encoding="ascii") as f:
+            f.write(lines)
+
+
+def read_index(path: Path) -> dict[str, int]:
+    """Lowest known offset per hour for a log file; empty without a sidecar."""
+    index: dict[str, int] = {}
+    try:
+        with open(path.with_name(path.name + ".idx"), encoding="ascii") as f:
+            for line in f:
+                hour, _, offset = line.partition(" ")
+                if offset.strip().isdigit():
+                    index[hour] = min(index.get(hour, int(offset)), int(offset))
+    except OSError:
+        pass
+    return index
+
+
+def rotated_path(active: Path) -> Path:
+    """The next free ``dreader-DATE.N.jsonl`` name for a full active file."""
+    stem = active.name.removesuffix(".jsonl")
+    n = 1
+    while any(
+        (active.with_name(f"{stem}.{n}.jsonl{ext}")).exists() for ext in ("", ".gz")
+    ):
+        n += 1
+    return active.with_name(f"{stem}.{n}.jsonl")
+
+
+def compress_log(path: Path) -> Path:
+    """Gzip a closed log file, one member per hour, with a matching index."""
+    target = path.with_name(path.name + ".gz")
+    tmp = target.with_name(target.name + ".tmp")
+    index: list[tuple[str, int]] = []
+    with open(path, "rb") as src, open(tmp, "wb") as raw:
+        member: gzip.GzipFile | None = None
+        hour = ""
+        for line in src:
+            line_h = line_hour(line)
+            if member is None or (line_h is not None and line_h > hour):
+                if member is not None:
+                    member.close()
+                hour = line_h or hour
+                index.append((hour, raw.tell()))
+                member = gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=6)
+            member.write(line)
+        if member is not None:
+            member.close()
+    os.replace(tmp, target)
+    idx = path.with_name(path.name + ".idx")
+    target.with_name(target.name + ".idx").unlink(missing_ok=True)
+    append_index(target, index)
+    path.unlink()
+    idx.unlink(missing_ok=True)
+    return target
+
+
+def maintain(log_dir: Path, today: str, retention_days: int = RETENTION_DAYS) -> None:
+    """Compress past days' files and delete those older than the retention period.
+
+    Files of ``today``, rotated parts included, are left alone because another
+    process may still be appending to them (see the module docstring). Files
+    that cannot be processed, e.g. because they are still open on Windows, are
+    retried on the next call.
+    """
+    cutoff = (date.fromisoformat(today) - timedelta(days=retention_days)).isoformat()
+    for log in log_files(log_dir):
+        try:
+            if log.day < cutoff:
+                log.path.unlink()
+                log.index_path.unlink(missing_ok=True)
+            elif not log.compressed and log.day < today:
+                compress_log(log.path)
+        except OSError:
+            continue
+
+
+@dataclass(frozen=True)
+class LogQuery:
+    """Filters for ``iter_log_lines``; every field is optional."""
+
+    since: str | None = None  # ISO timestamp, inclusive
+    until: str | None = None  # ISO timestamp, exclusive
+    component: str | None = None  # this component and its children
+    min_level: str | None = None
+    data: Mapping[str, str | None] | None = None  # dotted key -> value, None = present
+
+    def matches(self, entry: dict[str, Any]) -> bool:
+        ts = entry.get("timestamp", "")
+        if self.since and ts < self.since:
+            return False
+        if self.until and ts >= self.until:
+            return False
+        if self.component:
+            component = entry.get("component", "")
+            if component != self.component and not component.startswith(self.component + "."):
+                return False
+        if self.min_level and _LEVELS.get(entry.get("level", ""), 0) < _LEVELS[self.min_level]:
+            return False
+        for key, expected in (self.data or {}).items():
+            value: Any = entry.get("data")
+            for part in key.split("."):
+                value = value.get(part, _MISSING) if isinstance(value, dict) else _MISSING
+            if value is _MISSING:
+                return False
+            if expected is not None and _as_text(value) != expected:
+                return False
+        return True
+
+
+_MISSING = object()
+
+
+def _as_text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def iter_log_lines(log_dir: str | Path, query: LogQuery) -> Iterator[tuple[dict[str, Any], str]]:
+    """Stream ``(entry, raw line)`` for every matching line, oldest file first.
+
+    Files outside the time window are skipped by name. A compressed file is
+    read from the indexed offset of the window's first hour. A plain file is
+    read from the latest indexed hour before that one, because its index only
+    sees the Python sink's lines. A file is abandoned once a line is more
+    than an hour past ``until``; the slack tolerates lines that were written
+    slightly out of order.
+    """
+    first_day = query.since[:10] if query.since else None
+    last_day = query.until[:10] if query.until else None
+    stop_hour = _next_hour(query.until[:13]) if query.until else None
+    for log in log_files(log_dir):
+        if (first_day and log.day < first_day) or (last_day and log.day > last_day):
+            continue
+        offset = 0
+        if query.since:
+            index = read_index(log.path)
+            since_hour = query.since[:13]
+            hours = [
+                h
+                for h in index
+                if h < since_hour or (log.compressed and h == since_hour)
+            ]
+            offset = index[max(hours)] if hours else 0
+        for line in _read_lines(log, offset):
+            hour = line_hour(line)
+            if stop_hour and hour and hour > stop_hour:
+                break
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # a line torn by a crash mid-write
+            if isinstance(entry, dict) and query.matches(entry):
+                yield entry, line.decode("utf-8").rstrip("\n")
+
+
+def _read_lines(log: LogFile, offset: int) -> Iterator[bytes]:
+    try:
+        raw = open(log.path, "rb")
+    except OSError:
+        return  # rotated or deleted since listing
+    with raw:
+        raw.seek(offset)
+        stream: Iterable[bytes] = gzip.GzipFile(fileobj=raw) if log.compressed else raw
+        yield from stream
+
+
+def _next_hour(hour: str) -> str:
+    day, _, hh = hour.partition("T")
+    if hh == "23":
+        return (date.fromisoformat(day) + timedelta(days=1)).isoformat() + "T00"
+    return f"{day}T{int(hh) + 1:02d}"
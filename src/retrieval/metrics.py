@@ -0,0 +1,135 @@
+"""Per-phase timings and counters for scrapes.
+
+A ``ScrapeMetrics`` collects one sample per timed call. Phases are
+``launch``, ``navigate``, ``login_wait``, ``extract`` (the page evaluate or
+response read), ``parse``, ``dedupe``, ``db_write`` and ``scroll_wait``;
+``payload_bytes`` counts the JSON size of each extraction result. The
+session attaches its metrics to the scraper, so the scraper's extract and
+parse steps are timed where they happen. Results carry the metrics object
+for the CLI, the scrape_job_metrics table gets one row per metric and a
+structured log line gets the summary.
+"""
+from __future__ import annotations
+
+import json
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+PHASES = (
+    "launch",
+    "navigate",
+    "login_wait",
+    "extract",
+    "parse",
+    "dedupe",
+    "db_write",
+    "scroll_wait",
+)
+COUNTERS = {"payload_bytes": "bytes"}
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of ``samples`` (``q`` in 0..100)."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, -(-len(ordered) * q // 100))  # ceil without float error
+    return ordered[min(int(rank), len(ordered)) - 1]
+
+
+def payload_bytes(value: Any) -> int:
+    """Size of ``value`` as compact JSON, i.e. roughly what the page shipped."""
+    return len(json.dumps(value, separators=(",", ":")))
+
+
+class ScrapeMetrics:
+    """Samples per phase (ms) and per counter for one scrape or a whole run."""
+
+    def __init__(self) -> None:
+        self.samples: dict[str, list[float]] = {}
+
+    def add(self, name: str, value: float) -> None:
+        self.samples.setdefault(name, []).append(value)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, (time.perf_counter() - started) * 1000)
+
+    def total(self, name: str) -> float:
+        return sum(self.samples.get(name, ()))
+
+    @classmethod
+    def combine(cls, parts: Iterable[ScrapeMetrics]) -> ScrapeMetrics:
+        merged = cls()
+        for part in parts:
+            for name, values in part.samples.items():
+                merged.samples.setdefault(name, []).extend(values)
+        return merged
+
+    def _names(self) -> list[str]:
+        known = [n for n in (*PHASES, *COUNTERS) if n in self.samples]
+        return known + sorted(set(self.samples) - set(known))
+
+    def rows(self) -> list[tuple[str, str, float, int, float, float, float]]:
+        """``(metric, unit, total, count, p50, p95, max)`` per metric."""
+        return [
+            (
+                name,
+                COUNTERS.get(name, "ms"),
+                round(sum(values), 3),
+                len(values),
+                round(percentile(values, 50), 3),
+                round(percentile(values, 95), 3),
+                round(max(values), 3),
+            )
+            for name in self._names()
+            if (values := self.samples[name])
+        ]
+
+    def summary(self) -> dict[str, object]:
+        """Totals per phase in ms, plus counter totals, for logs and JSON."""
+        out: dict[str, object] = {
+            f"{name}_ms": round(self.total(name), 1)
+            for name in self._names()
+            if name not in COUNTERS
+        }
+        for name in COUNTERS:
+            if name in self.samples:
+                out[name] = int(self.total(name))
+        return out
+
+    def breakdown(self) -> str:
+        """One-line ``phase time`` list, largest first, for the CLI."""
+        phases = [n for n in self._names() if n not in COUNTERS]
+        parts = [
+            f"{name} {_fmt_ms(self.total(name))}"
+            for name in sorted(phases, key=self.total, reverse=True)
+        ]
+        if "payload_bytes" in self.samples:
+            parts.append(f"payload {self.total('payload_bytes') / 1e6:.1f} MB")
+        return ", ".join(parts)
+
+    def table(self) -> list[str]:
+        """Per-metric totals with p50/p95/max per call, for run totals."""
+        lines = [f"  {'phase':<13} {'total':>9} {'calls':>6} {'p50':>9} {'p95':>9} {'max':>9}"]
+        for name, unit, total, count, p50, p95, top in self.rows():
+            fmt = _fmt_ms if unit == "ms" else _fmt_bytes
+            lines.append(
+                f"  {name:<13} {fmt(total):>9} {count:>6} "
+                f"{fmt(p50):>9} {fmt(p95):>9} {fmt(top):>9}"
+            )
+        return lines
+
+
+def _fmt_ms(ms: float) -> str:
+    return f"{ms / 1000:.2f}s" if ms >= 1000 else f"{ms:.1f}ms"
+
+
+def _fmt_bytes(n: float) -> str:
+    return f"{n / 1e6:.1f}MB" if n >= 1e6 else f"{n / 1e3:.1f}kB"
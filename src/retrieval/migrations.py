@@ -0,0 +1,66 @@
+"""Versioned schema bootstrap shared with the TypeScript DatabaseService.
+
+Migrations live in ``src/services/migrations/NNNN_description.sql`` and are
+tracked through ``PRAGMA user_version``. Opening an up-to-date database
+costs a single pragma read; only missing versions are executed, each in its
+own transaction together with the version bump.
+"""
+from __future__ import annotations
+
+import re
+import sqlite3
+from functools import cache
+from pathlib import Path
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "services" / "migrations"
+
+_NAME_RE = re.compile(r"^(\d+)_[\w-]+\.sql$")
+
+
+@cache
+def _discover(directory: Path) -> tuple[tuple[int, Path], ...]:
+    found: list[tuple[int, Path]] = []
+    if directory.is_dir():
+        for path in directory.iterdir():
+            m = _NAME_RE.match(path.name)
+            if m:
+                found.append((int(m.group(1)), path))
+    found.sort()
+    return tuple(found)
+
+
+def latest_version(directory: Path = MIGRATIONS_DIR) -> int:
+    """Highest migration version available on disk (0 if none)."""
+    migrations = _discover(directory)
+    return migrations[-1][0] if migrations else 0
+
+
+def schema_version(conn: sqlite3.Connection) -> int:
+    row = conn.execute("PRAGMA user_version").fetchone()
+    return int(row[0])
+
+
+def apply_migrations(
+    conn: sqlite3.Connection, directory: Path = MIGRATIONS_DIR
+) -> int:
+    """Bring the database up to the latest version. Returns the final version."""
+    current = schema_version(conn)
+    if current >= latest_version(directory):
+        return current
+    for version, path in _discover(directory):
+        if version <= current:
+            continue
+        script = (
+            f"BEGIN IMMEDIATE;\n{path.read_text()}\n"
+            f"PRAGMA user_version = {version};\nCOMMIT;"
+        )
+        try:
+            conn.executescript(script)
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            # Another process may have applied it between our read and BEGIN.
+            if schema_version(conn) < version:
+                raise
+        current = version
+    return current
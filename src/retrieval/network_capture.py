@@ -0,0 +1,141 @@
+"""Network engine — read message history from Discord's own API responses.
+
+While the client scrolls it fetches
+``/api/v*/channels/{channel_id}/messages?before=...`` and receives JSON that
+holds everything the ``messages`` table stores. The DOM only shows a subset
+of that, such as display names and rendered text. ``NetworkCapture``
+listens for those responses on a page. ``parse_api_messages`` maps each
+payload to full ``MessageRow``s, which then enter the same ingest path as
+DOM-scraped rows.
+
+Responses are only queued in the event handler. Their bodies are read
+later, in ``drain()``, so no Playwright call runs inside an event callback.
+"""
+from __future__ import annotations
+
+import json
+import re
+from datetime import UTC, datetime
+from typing import Any
+
+from playwright.sync_api import Page, Response
+
+from .db import MessageRow
+from .logger import create_logger
+
+HISTORY_URL_RE = re.compile(r"/api/v\d+/channels/(\d+)/messages(?:\?|$)")
+
+# Default (0) and reply (19) messages; joins, pins and other system
+# notices carry no user content.
+MESSAGE_TYPES = frozenset({0, 19})
+
+_AVATAR_URL = "https://cdn.discordapp.com/avatars/{user_id}/{avatar}.png"
+
+
+def normalize_timestamp(value: str | None) -> str:
+    """API ``+00:00`` microsecond timestamps in the DOM ``datetime`` format.
+
+    ``2026-04-28T12:00:00.123456+00:00`` becomes
+    ``2026-04-28T12:00:00.123Z``, so rows from both engines sort and roll
+    up identically.
+    """
+    if not value:
+        return ""
+    try:
+        dt = datetime.fromisoformat(value.replace("Z", "+00:00")).astimezone(UTC)
+    except ValueError:
+        return value
+    return dt.strftime("%Y-%m-%dT%H:%M:%S.") + f"{dt.microsecond // 1000:03d}Z"
+
+
+def parse_api_messages(
+    payload: list[dict[str, Any]], channel_id: str, server_id: str
+) -> list[MessageRow]:
+    """Map a Discord message-history payload to ``messages`` rows."""
+    rows: list[MessageRow] = []
+    for msg in payload:
+        message_id = msg.get("id")
+        if not message_id or msg.get("type", 0) not in MESSAGE_TYPES:
+            continue
+        author = msg.get("author") or {}
+        author_id = author.get("id") or "unknown"
+        avatar = author.get("avatar")
+        attachments = [a["url"] for a in msg.get("attachments") or [] if a.get("url")]
+        embeds = msg.get("embeds") or []
+        reference = msg.get("message_reference") or {}
+        edited = msg.get("edited_timestamp")
+        rows.append(
+            MessageRow(
+                message_id=str(message_id),
+                channel_id=str(msg.get("channel_id") or channel_id),
+                author_id=str(author_id),
+                author_name=author.get("global_name") or author.get("username") or "unknown",
+                content=msg.get("content") or "",
+                timestamp=normalize_timestamp(msg.get("timestamp")),
+                server_id=server_id,
+                author_avatar_url=(
+                    _AVATAR_URL.format(user_id=author_id, avatar=avatar) if avatar else ""
+                ),
+                reply_to_message_id=reference.get("message_id"),
+                edited_timestamp=normalize_timestamp(edited) if edited else None,
+                is_pinned=bool(msg.get("pinned")),
+                attachment_urls=json.dumps(attachments),
+                embed_data=json.dumps(embeds),
+                has_attachments=bool(attachments),
+                has_embeds=bool(embeds),
+            )
+        )
+    return rows
+
+
+class NetworkCapture:
+    """Collects a channel's message-history responses from one page."""
+
+    def __init__(self, page: Page, channel_id: str, server_id: str) -> None:
+        self.channel_id = channel_id
+        self.server_id = server_id
+        self._page = page
+        self._responses: list[Response] = []
+        self._log = create_logger("retrieval.network")
+        page.on("response", self._on_response)
+
+    def _on_response(self, response: Response) -> None:
+        match = HISTORY_URL_RE.search(response.url)
+        if (
+            match
+            and match.group(1) == self.channel_id
+            and response.request.method == "GET"
+            and response.ok
+        ):
+            self._responses.append(response)
+
+    def drain(self) -> list[MessageRow]:
+        """Rows from every history response received since the last drain."""
+        return self.parse(self.drain_payloads())
+
+    def drain_payloads(self) -> list[list[dict[str, Any]]]:
+        """The raw JSON of every history response received since the last drain."""
+        responses, self._responses = self._responses, []
+        payloads: list[list[dict[str, Any]]] = []
+        for response in responses:
+            try:
+                payload = response.json()
+            except Exception as e:  # body evicted, or not JSON
+                self._log.warn(
+                    "Unreadable history response", {"url": response.url, "error": str(e)}
+                )
+                continue
+            if isinstance(payload, list):
+                payloads.append(payload)
+        return payloads
+
+    def parse(self, payloads: list[list[dict[str, Any]]]) -> list[MessageRow]:
+        return [
+            row
+            for payload in payloads
+            for row in parse_api_messages(payload, self.channel_id, self.server_id)
+        ]
+
+    def close(self) -> None:
+        self._page.remove_listener("response", self._on_response)
+        self._responses.clear()
@@ -0,0 +1,179 @@
+"""Read/query layer over the shared messages table.
+
+Pages are addressed by ``(timestamp, id)`` keyset cursors rather than
+``LIMIT/OFFSET``, so reading page N of a channel costs one index seek on
+``idx_messages_channel_ts`` regardless of N. ``iter_channel_messages``
+streams a whole channel through a generator in bounded chunks.
+``MessageQuery`` adds a small LRU cache of recently served pages that the
+in-process writer invalidates per channel.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+from .db import ScrapeDB
+from .writer import BackgroundWriter
+
+_COLUMNS = (
+    "id, channel_id, author_id, author_name, author_avatar_url, content, "
+    "timestamp, reply_to_message_id, edited_timestamp, is_pinned, "
+    "attachment_urls, embed_data, message_url, has_attachments, has_embeds"
+)
+
+
+@dataclass(frozen=True, slots=True)
+class StoredMessage:
+    """A row of the ``messages`` table, in column order."""
+
+    id: str
+    channel_id: str
+    author_id: str
+    author_name: str
+    author_avatar_url: str | None
+    content: str | None
+    timestamp: str
+    reply_to_message_id: str | None
+    edited_timestamp: str | None
+    is_pinned: int
+    attachment_urls: str | None
+    embed_data: str | None
+    message_url: str
+    has_attachments: int
+    has_embeds: int
+
+    @property
+    def cursor(self) -> Cursor:
+        return Cursor(self.timestamp, self.id)
+
+
+@dataclass(frozen=True, slots=True)
+class Cursor:
+    """Keyset position: the last ``(timestamp, id)`` already returned."""
+
+    timestamp: str
+    message_id: str
+
+
+@dataclass(frozen=True)
+class MessagePage:
+    messages: tuple[StoredMessage, ...]
+    next_cursor: Cursor | None  # None when the channel is exhausted
+
+
+def fetch_page(
+    conn: sqlite3.Connection,
+    channel_id: str,
+    *,
+    after: Cursor | None = None,
+    limit: int = 100,
+    newest_first: bool = True,
+) -> MessagePage:
+    """Return up to ``limit`` messages following ``after`` in channel order."""
+    op, direction = ("<", "DESC") if newest_first else (">", "ASC")
+    params: list[object] = [channel_id]
+    keyset = ""
+    if after is not None:
+        keyset = f"AND (timestamp, id) {op} (?, ?)"
+        params += [after.timestamp, after.message_id]
+    params.append(limit)
+    rows = conn.execute(
+        f"""SELECT {_COLUMNS} FROM messages
+            WHERE channel_id = ? {keyset}
+            ORDER BY timestamp {direction}, id {direction}
+            LIMIT ?""",
+        params,
+    ).fetchall()
+    messages = tuple(StoredMessage(*row) for row in rows)
+    next_cursor = messages[-1].cursor if len(messages) == limit else None
+    return MessagePage(messages, next_cursor)
+
+
+def iter_channel_messages(
+    conn: sqlite3.Connection,
+    channel_id: str,
+    *,
+    after: Cursor | None = None,
+    chunk_size: int = 500,
+    newest_first: bool = False,
+) -> Iterator[StoredMessage]:
+    """Stream a channel in keyset chunks; memory stays bounded by ``chunk_size``."""
+    cursor = after
+    while True:
+        page = fetch_page(
+            conn,
+            channel_id,
+            after=cursor,
+            limit=chunk_size,
+            newest_first=newest_first,
+        )
+        yield from page.messages
+        if page.next_cursor is None:
+            return
+        cursor = page.next_cursor
+
+
+_PageKey = tuple[str, Cursor | None, int, bool]
+
+
+class MessageQuery:
+    """Channel page reader with an LRU cache of recently served pages.
+
+    Attach it to the process's writer with ``watch`` so pages of a channel
+    are dropped as soon as new rows for it commit. Writes made by other
+    processes are not observed; call ``invalidate()`` when that matters.
+    """
+
+    def __init__(self, conn: sqlite3.Connection, cache_pages: int = 64) -> None:
+        self._conn = conn
+        self._cache_pages = cache_pages
+        self._cache: OrderedDict[_PageKey, MessagePage] = OrderedDict()
+        self._lock = threading.Lock()
+        self._epoch = 0
+        self._generation: dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def watch(self, writer: ScrapeDB | BackgroundWriter) -> None:
+        writer.add_insert_listener(self.invalidate)
+
+    def page(
+        self,
+        channel_id: str,
+        after: Cursor | None = None,
+        limit: int = 100,
+        newest_first: bool = True,
+    ) -> MessagePage:
+        key: _PageKey = (channel_id, after, limit, newest_first)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is not None:
+                self._cache.move_to_end(key)
+                self.hits += 1
+                return cached
+            generation = (self._epoch, self._generation.get(channel_id, 0))
+        result = fetch_page(
+            self._conn, channel_id, after=after, limit=limit, newest_first=newest_first
+        )
+        with self._lock:
+            self.misses += 1
+            # Don't cache a page an insert may have made stale mid-query.
+            if (self._epoch, self._generation.get(channel_id, 0)) == generation:
+                self._cache[key] = result
+                if len(self._cache) > self._cache_pages:
+                    self._cache.popitem(last=False)
+        return result
+
+    def invalidate(self, channel_id: str | None = None) -> None:
+        """Drop cached pages for one channel, or everything when None."""
+        with self._lock:
+            if channel_id is None:
+                self._cache.clear()
+                self._epoch += 1
+                return
+            self._generation[channel_id] = self._generation.get(channel_id, 0) + 1
+            for key in [k for k in self._cache if k[0] == channel_id]:
+                del self._cache[key]
@@ -0,0 +1,82 @@
+"""Recording of raw page results, for offline replay (see ``replay``).
+
+A recording is a gzip-compressed JSONL file. The first line is a header,
+and each further line is one event a scraper saw:
+
+- ``navigate``: a tab opened a channel.
+- ``extract``: the raw list from a DOM extraction or capture drain.
+- ``columns``: the raw arrays from the columnar extraction.
+- ``network``: the history API payloads drained in one pass.
+- ``scroll``: the outcome of a scroll, with ``at_top``, ``stalled`` and
+  ``waited_ms``.
+
+Every event carries the ``tab`` it came from, so runs with
+``--concurrency`` replay per channel.
+"""
+from __future__ import annotations
+
+import gzip
+import json
+import threading
+from collections.abc import Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any
+
+from .errors import RecordingError
+
+FORMAT_VERSION = 1
+
+
+class Recorder:
+    """Appends scraper events to a recording file; shared by all tabs of a run."""
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._out = gzip.open(self.path, "wt", encoding="utf-8", compresslevel=6)
+        self._lock = threading.Lock()
+        self._tabs = 0
+        self.events = 0
+        self._write(
+            {"version": FORMAT_VERSION, "recorded_at": datetime.now(UTC).isoformat()}
+        )
+
+    def new_tab(self) -> int:
+        """A fresh tab number for a scraper recording into this file."""
+        with self._lock:
+            self._tabs += 1
+            return self._tabs
+
+    def record(self, tab: int, op: str, **data: Any) -> None:
+        self._write({"op": op, "tab": tab, **data})
+        self.events += 1
+
+    def _write(self, event: dict[str, Any]) -> None:
+        line = json.dumps(event, separators=(",", ":")) + "\n"
+        with self._lock:
+            self._out.write(line)
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._out.closed:
+                self._out.close()
+
+
+def read_recording(path: str | Path) -> tuple[dict[str, Any], Iterator[dict[str, Any]]]:
+    """The header and a lazy iterator over the events of a recording."""
+    f = gzip.open(Path(path), "rt", encoding="utf-8")
+    header: dict[str, Any] = json.loads(f.readline() or "{}")
+    if header.get("version") != FORMAT_VERSION:
+        f.close()
+        raise RecordingError(
+            "Unsupported recording version", {"path": str(path), "header": header}
+        )
+
+    def events() -> Iterator[dict[str, Any]]:
+        with f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    return header, events()
@@ -0,0 +1,209 @@
+"""Replay recorded scrapes through the ingest pipeline, offline.
+
+``ReplayScraper`` stands in for ``PlaywrightDiscordScraper``. It returns one
+channel's recorded page results in the order they were captured, and it
+never sleeps. ``replay_recording`` runs each recorded channel through a
+real ``PlaywrightScrapeSession``: parsing, ``ScrapeProgress`` dedupe and
+``ScrapeDB`` inserts. It reports how fast that went, so the ingest side can
+be profiled and regression-tested without a browser or a Discord login.
+"""
+from __future__ import annotations
+
+import tempfile
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from .db import MessageColumns, MessageRow, ScrapeDB
+from .discord_playwright_scraper import (
+    DiscordMessage,
+    PendingScroll,
+    ScrollResult,
+    parse_raw_messages,
+)
+from .metrics import ScrapeMetrics
+from .network_capture import parse_api_messages
+from .recording import read_recording
+from .scrape_session import PlaywrightScrapeSession
+
+
+@dataclass
+class ChannelRecording:
+    """The events one tab recorded between navigating to a channel and leaving it."""
+
+    server_id: str
+    channel_id: str
+    events: list[dict[str, Any]] = field(default_factory=list)
+
+    @property
+    def engine(self) -> str:
+        ops = {e["op"] for e in self.events}
+        if "network" in ops:
+            return "network"
+        return "columns" if "columns" in ops else "dom"
+
+    @property
+    def scrolls(self) -> int:
+        return sum(1 for e in self.events if e["op"] == "scroll")
+
+
+def load_channel_recordings(path: str | Path) -> list[ChannelRecording]:
+    """Split a recording into per-channel event lists, in navigation order.
+
+    Navigations that recorded no page results (e.g. the login check in older
+    recordings) are dropped.
+    """
+    _, events = read_recording(path)
+    channels: list[ChannelRecording] = []
+    current: dict[int, ChannelRecording] = {}
+    for event in events:
+        tab = event.get("tab", 0)
+        if event["op"] == "navigate":
+            current[tab] = ChannelRecording(event["server_id"], event["channel_id"])
+            channels.append(current[tab])
+        elif tab in current:
+            current[tab].events.append(event)
+    return [c for c in channels if any(e["op"] != "scroll" for e in c.events)]
+
+
+class ReplayScraper:
+    """Scraper double that plays back one ``ChannelRecording``."""
+
+    page_healthy = True
+    metrics: ScrapeMetrics | None = None
+
+    def __init__(self, recording: ChannelRecording) -> None:
+        self.recording = recording
+        self._events = deque(recording.events)
+        self._network: tuple[str, str] | None = None
+
+    def _next(self, op: str) -> dict[str, Any] | None:
+        for i, event in enumerate(self._events):
+            if event["op"] == op:
+                del self._events[i]
+                return event
+        return None
+
+    def start(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def reopen_page(self) -> None:
+        pass
+
+    def navigate_to_channel(
+        self, server_id: str, channel_id: str, message_id: str | None = None
+    ) -> None:
+        pass
+
+    def wait_for_login(self, timeout: int = 300) -> bool:
+        return True
+
+    def extract_messages(self, limit: int = 200) -> list[DiscordMessage]:
+        event = self._next("extract")
+        return parse_raw_messages(event["raw"], limit=limit) if event else []
+
+    def extract_new_messages(self) -> list[DiscordMessage]:
+        event = self._next("extract")
+        return parse_raw_messages(event["raw"], limit=len(event["raw"])) if event else []
+
+    drain_capture = extract_new_messages
+
+    def start_capture(self) -> None:
+        pass
+
+    def stop_capture(self) -> None:
+        pass
+
+    def extract_new_columns(self, channel_id: str, server_id: str) -> MessageColumns:
+        event = self._next("columns")
+        if event is None:
+            return MessageColumns.empty(channel_id, server_id)
+        return MessageColumns.from_page(channel_id, server_id, event["raw"])
+
+    def start_network_capture(self, channel_id: str, server_id: str) -> None:
+        self._network = (channel_id, server_id)
+
+    def drain_network_capture(self) -> list[MessageRow]:
+        event = self._next("network")
+        if event is None or self._network is None:
+            return []
+        channel_id, server_id = self._network
+        return [
+            row
+            for payload in event["payloads"]
+            for row in parse_api_messages(payload, channel_id, server_id)
+        ]
+
+    def stop_network_capture(self) -> None:
+        self._network = None
+
+    def begin_scroll(self) -> PendingScroll:
+        return PendingScroll(snapshot={}, started=time.monotonic())
+
+    def finish_scroll(self, pending: PendingScroll) -> ScrollResult:
+        event = self._next("scroll")
+        if event is None:
+            return ScrollResult(at_top=True, waited_ms=0.0)
+        return ScrollResult(
+            at_top=event["at_top"], waited_ms=0.0, stalled=event.get("stalled", False)
+        )
+
+    def scroll_up(self) -> ScrollResult:
+        return self.finish_scroll(self.begin_scroll())
+
+
+@dataclass(frozen=True)
+class ReplayReport:
+    channels: int
+    passes: int
+    messages: int
+    inserted: int
+    duplicates: int
+    seconds: float
+
+    @property
+    def messages_per_sec(self) -> float:
+        return self.messages / self.seconds if self.seconds else 0.0
+
+
+def _count(result: dict[str, object], key: str) -> int:
+    value = result.get(key, 0)
+    return value if isinstance(value, int) else 0
+
+
+def replay_recording(path: str | Path, db_path: str | None = None) -> ReplayReport:
+    """Push every channel of a recording through session, dedupe and DB.
+
+    Without ``db_path`` a throwaway database in a temporary directory is
+    used, so each replay measures inserts into an empty archive.
+    """
+    channels = load_channel_recordings(path)
+    with tempfile.TemporaryDirectory(prefix="dreader-replay-") as tmp:
+        db = ScrapeDB(db_path or str(Path(tmp) / "replay.db"))
+        try:
+            messages = inserted = duplicates = passes = 0
+            started = time.perf_counter()
+            for channel in channels:
+                session = PlaywrightScrapeSession(
+                    server_id=channel.server_id,
+                    channel_id=channel.channel_id,
+                    max_scrolls=channel.scrolls,
+                    scraper=ReplayScraper(channel),  # type: ignore[arg-type]
+                    db=db,
+                    check_login=False,
+                    engine=channel.engine,
+                )
+                result = session.run()
+                messages += _count(result, "messages_scraped")
+                inserted += _count(result, "messages_inserted")
+                duplicates += _count(result, "duplicates")
+                passes += channel.scrolls + 1
+            seconds = time.perf_counter() - started
+        finally:
+            db.close()
+    return ReplayReport(len(channels), passes, messages, inserted, duplicates, seconds)
@@ -0,0 +1,183 @@
+"""Run-level orchestrator — one browser and one login for many channels."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Generator, Iterator, Sequence
+
+from .blocking import ResourceBlocker
+from .db import ScrapeDB
+from .discord_playwright_scraper import PlaywrightDiscordScraper
+from .logger import create_logger
+from .metrics import ScrapeMetrics
+from .recording import Recorder
+from .registry import ChannelTarget
+from .scrape_session import PlaywrightScrapeSession
+from .writer import BackgroundWriter
+
+_Steps = Generator[None, None, dict[str, object]]
+
+
+class ScrapeRun:
+    """Scrape several channels with a single browser launch.
+
+    The persistent context is started once, login is checked once on
+    Discord's home view, and every channel is then navigated to in the same
+    page. Checking on a channel would load the first target twice.
+    If that page crashes mid-channel, only the tab is reopened and the
+    channel is retried once; the browser keeps running.
+
+    With ``concurrency`` > 1 that many tabs are opened in the same context
+    and targets are spread across them. All tabs are driven from this thread
+    in turn: each session steps until it has requested older history, and
+    the next tab is serviced while that page loads. DB writes therefore stay
+    on one thread (or the single background writer). Results are yielded in
+    completion order.
+    """
+
+    def __init__(
+        self,
+        targets: Sequence[ChannelTarget],
+        db_path: str = "data/dreader.db",
+        headless: bool = False,
+        max_scrolls: int = 10,
+        scroll_timeout_ms: int = 10_000,
+        user_data_dir: str = "data/playwright-profile",
+        async_writes: bool = False,
+        login_timeout: int = 300,
+        incremental: bool = False,
+        resume: bool = False,
+        capture: bool = False,
+        concurrency: int = 1,
+        blocker: ResourceBlocker | None = None,
+        engine: str = "dom",
+        record_path: str | None = None,
+    ) -> None:
+        self.targets = list(targets)
+        self.db_path = db_path
+        self.max_scrolls = max_scrolls
+        self.async_writes = async_writes
+        self.login_timeout = login_timeout
+        self.incremental = incremental
+        self.resume = resume
+        self.capture = capture
+        self.concurrency = max(1, concurrency)
+        self.engine = engine
+        self._log = create_logger("retrieval.run")
+        self.recorder = Recorder(record_path) if record_path else None
+        # Browser launch and the login check; per-channel phases are in
+        # each result's "metrics".
+        self.metrics = ScrapeMetrics()
+        self._scraper = PlaywrightDiscordScraper(
+            user_data_dir=user_data_dir,
+            headless=headless,
+            scroll_timeout_ms=scroll_timeout_ms,
+            blocker=blocker,
+            recorder=self.recorder,
+        )
+
+    def run(self) -> Iterator[tuple[ChannelTarget, dict[str, object]]]:
+        """Scrape every target, yielding each result as it finishes."""
+        if not self.targets:
+            return
+        db: ScrapeDB | BackgroundWriter = (
+            BackgroundWriter(self.db_path) if self.async_writes else ScrapeDB(self.db_path)
+        )
+        try:
+            with self.metrics.phase("launch"):
+                self._scraper.start()
+            with self.metrics.phase("navigate"):
+                self._scraper.open_home()
+            with self.metrics.phase("login_wait"):
+                logged_in = self._scraper.wait_for_server_list(timeout=self.login_timeout)
+            if not logged_in:
+                for t in self.targets:
+                    yield t, {"status": "failed", "error": "login_timeout"}
+                return
+
+            tabs = [self._scraper] + [
+                self._scraper.open_tab()
+                for _ in range(min(self.concurrency, len(self.targets)) - 1)
+            ]
+            try:
+                yield from self._schedule(tabs, db)
+            finally:
+                for tab in tabs[1:]:
+                    tab.close()
+        finally:
+            self._scraper.close()
+            db.close()
+            if self.recorder:
+                self.recorder.close()
+
+    def _schedule(
+        self,
+        tabs: list[PlaywrightDiscordScraper],
+        db: ScrapeDB | BackgroundWriter,
+    ) -> Iterator[tuple[ChannelTarget, dict[str, object]]]:
+        queue = deque(self.targets)
+        # tab index -> (target, retried, session steps)
+        active: dict[int, tuple[ChannelTarget, bool, _Steps]] = {}
+        try:
+            yield from self._step_tabs(tabs, db, queue, active)
+        finally:
+            # Interrupted or abandoned: fail the jobs still in flight.
+            for _, _, steps in active.values():
+                steps.close()
+
+    def _step_tabs(
+        self,
+        tabs: list[PlaywrightDiscordScraper],
+        db: ScrapeDB | BackgroundWriter,
+        queue: deque[ChannelTarget],
+        active: dict[int, tuple[ChannelTarget, bool, _Steps]],
+    ) -> Iterator[tuple[ChannelTarget, dict[str, object]]]:
+        while queue or active:
+            for i, tab in enumerate(tabs):
+                if i not in active:
+                    if not queue:
+                        continue
+                    t = queue.popleft()
+                    active[i] = (t, False, self._scrape(t, tab, db))
+                t, retried, steps = active[i]
+                try:
+                    next(steps)
+                    continue
+                except StopIteration as done:
+                    result: dict[str, object] = done.value
+                del active[i]
+                if result.get("status") == "failed" and not tab.page_healthy:
+                    tab.reopen_page()
+                    if not retried:
+                        self._log.warn(
+                            "Page crashed, reopening tab and retrying channel",
+                            {"channel": t.channel_name},
+                        )
+                        active[i] = (t, True, self._scrape(t, tab, db))
+                        continue
+                yield t, result
+
+    def _scrape(
+        self,
+        t: ChannelTarget,
+        tab: PlaywrightDiscordScraper,
+        db: ScrapeDB | BackgroundWriter,
+    ) -> _Steps:
+        self._log.info(
+            "Scraping channel",
+            {"server": t.server_name, "channel": t.channel_name},
+        )
+        session = PlaywrightScrapeSession(
+            server_id=t.server_id,
+            channel_id=t.channel_id,
+            server_name=t.server_name,
+            channel_name=t.channel_name,
+            max_scrolls=self.max_scrolls,
+            scraper=tab,
+            db=db,
+            check_login=False,
+            incremental=self.incremental,
+            resume=self.resume,
+            capture=self.capture,
+            engine=self.engine,
+        )
+        return session.steps()
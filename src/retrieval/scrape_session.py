@@ -1,13 +1,196 @@
 """Scrape session orchestrator — browser + database."""
 from __future__ import annotations
 
-from .db import ScrapeDB
-from .discord_playwright_scraper import PlaywrightDiscordScraper
-from .logger import create_logger
+import json
+from collections.abc import Generator, Sequence
+from concurrent.futures import Future
+
+from .db import InsertResult, MessageColumns, MessageRow, ScrapeDB, snowflake
+from .dedupe import SeenIdWindow
+from .discord_playwright_scraper import DiscordMessage, PlaywrightDiscordScraper, ScrollResult
+from .errors import ScrollStalledError
+from .logger import ComponentLogger, create_logger
+from .metrics import ScrapeMetrics
+from .writer import BackgroundWriter
+
+ENGINES = ("dom", "columns", "network")
+
+# Scrolls in a row that may render nothing before the scrape gives up.
+MAX_STALLED_SCROLLS = 3
+
+
+class ScrapeProgress:
+    """Per-channel bookkeeping of a scrape, independent of how pages are driven.
+
+    Turns each pass's extracted messages into new ``MessageRow``s and tracks
+    the newest and oldest message reached, shared by the sync and async
+    sessions.
+    """
+
+    def __init__(
+        self,
+        server_id: str,
+        channel_id: str,
+        known_id: str | None,
+        checkpoint: str | None = None,
+        incremental: bool = False,
+    ) -> None:
+        self.server_id = server_id
+        self.channel_id = channel_id
+        self.incremental = incremental
+        self.known = snowflake(known_id) if known_id else None
+        # The watermark may only advance if this run connected with what was
+        # already archived (or reached the channel start); otherwise the gap
+        # below the new watermark would never be scraped incrementally.
+        self.reached_known = self.known is None
+        self.newest: MessageRow | None = None
+        # Oldest message reached so far; saved with every batch as the job's
+        # checkpoint so a later --resume can continue from here.
+        self.oldest = checkpoint
+        self.total_scraped = 0
+        self._seen = SeenIdWindow()
+        self._stalls = 0
+
+    def add(self, messages: Sequence[DiscordMessage]) -> tuple[list[MessageRow], bool]:
+        """Rows for the messages not seen before, and whether any were already known."""
+        return self.add_rows(
+            [
+                MessageRow(
+                    message_id=msg.message_id,
+                    channel_id=self.channel_id,
+                    author_id=msg.author or "unknown",
+                    author_name=msg.author or "unknown",
+                    content=msg.content,
+                    timestamp=msg.timestamp or "",
+                    server_id=self.server_id,
+                    reply_to_message_id=msg.reply_to_id,
+                    attachment_urls=json.dumps(msg.attachment_urls),
+                    has_attachments=bool(msg.attachment_urls),
+                )
+                for msg in messages
+                if msg.message_id
+            ]
+        )
+
+    def add_rows(self, rows: Sequence[MessageRow]) -> tuple[list[MessageRow], bool]:
+        """Like ``add``, for rows that were built already (network engine)."""
+        by_id = {r.message_id: r for r in rows}
+        batch: list[MessageRow] = []
+        overlap = False
+        for message_id in self._seen.filter_new(by_id):
+            if self.known is not None and snowflake(message_id) <= self.known:
+                overlap = True
+                if self.incremental:
+                    continue
+            batch.append(by_id[message_id])
+        if batch:
+            top = max(batch, key=lambda r: snowflake(r.message_id))
+            if self.newest is None or snowflake(top.message_id) > snowflake(
+                self.newest.message_id
+            ):
+                self.newest = top
+            bottom = min(batch, key=lambda r: snowflake(r.message_id))
+            if self.oldest is None or snowflake(bottom.message_id) < snowflake(
+                self.oldest
+            ):
+                self.oldest = bottom.message_id
+        self.total_scraped += len(batch)
+        self.reached_known = self.reached_known or overlap
+        return batch, overlap
+
+    def add_columns(self, cols: MessageColumns) -> tuple[MessageColumns, bool]:
+        """Like ``add``, for a columnar batch; returns the new columns."""
+        position = {message_id: i for i, message_id in enumerate(cols.ids)}
+        keep: list[int] = []
+        overlap = False
+        for message_id in self._seen.filter_new(cols.ids):
+            if self.known is not None and snowflake(message_id) <= self.known:
+                overlap = True
+                if self.incremental:
+                    continue
+            keep.append(position[message_id])
+        batch = cols.take(keep)
+        if batch:
+            keys = [snowflake(message_id) for message_id in batch.ids]
+            top = max(range(len(keys)), key=keys.__getitem__)
+            if self.newest is None or keys[top] > snowflake(self.newest.message_id):
+                self.newest = batch.row(top)
+            bottom = min(range(len(keys)), key=keys.__getitem__)
+            if self.oldest is None or keys[bottom] < snowflake(self.oldest):
+                self.oldest = batch.ids[bottom]
+        self.total_scraped += len(batch)
+        self.reached_known = self.reached_known or overlap
+        return batch, overlap
+
+    def scrolled(self, scroll: ScrollResult) -> bool:
+        """Account for one scroll; True once the channel start is reached.
+
+        A stalled scroll only means nothing new arrived this pass. It never
+        counts as reaching the start, because the watermark must not pass
+        history that was never loaded. After MAX_STALLED_SCROLLS stalls in a
+        row the scrape fails, and --resume continues from its checkpoint.
+        """
+        if scroll.at_top:
+            self.reached_known = True
+            return True
+        self._stalls = self._stalls + 1 if scroll.stalled else 0
+        if self._stalls >= MAX_STALLED_SCROLLS:
+            raise ScrollStalledError(
+                f"History stopped loading after {self._stalls} scrolls",
+                {"channel_id": self.channel_id, "checkpoint": self.oldest},
+            )
+        return False
+
+    @property
+    def watermark(self) -> MessageRow | None:
+        """The message to advance the channel watermark to, if it may advance."""
+        return self.newest if self.reached_known else None
+
+    def summary(
+        self,
+        job_id: int,
+        ingest: InsertResult,
+        scroll_wait_ms: float,
+        log: ComponentLogger,
+    ) -> dict[str, object]:
+        log.info(
+            "Scrape complete",
+            {
+                "job_id": job_id,
+                "messages": self.total_scraped,
+                "inserted": ingest.inserted,
+                "duplicates": ingest.duplicates,
+                "scroll_wait_ms": round(scroll_wait_ms),
+            },
+        )
+        return {
+            "job_id": job_id,
+            "status": "completed",
+            "messages_scraped": self.total_scraped,
+            "messages_inserted": ingest.inserted,
+            "duplicates": ingest.duplicates,
+            "scroll_wait_ms": round(scroll_wait_ms),
+        }
 
 
 class PlaywrightScrapeSession:
-    """End-to-end scrape: launch browser, extract messages, persist to DB."""
+    """End-to-end scrape: launch browser, extract messages, persist to DB.
+
+    A session normally owns its browser and database. Pass ``scraper`` and
+    ``db`` to borrow already-open ones instead (see ``ScrapeRun``); borrowed
+    resources are neither started nor closed by the session.
+
+    With ``capture=True`` messages are collected by a MutationObserver in
+    the page as Discord renders them and drained once per pass, instead of
+    re-reading the rendered list, so nodes recycled between passes are not
+    missed.
+
+    ``engine="network"`` reads the channel's history API responses instead
+    of the DOM (see ``network_capture``); rows then carry author IDs, edits,
+    pins, attachments and embeds. ``engine="columns"`` is the DOM engine
+    with IDs cleaned and empties dropped in the page, shipped as one
+    ``MessageColumns`` batch per pass. ``capture`` only applies to "dom".
+    """
 
     def __init__(
         self,
@@ -18,85 +201,205 @@ class PlaywrightScrapeSession:
         db_path: str = "data/dreader.db",
         headless: bool = False,
         max_scrolls: int = 10,
+        scroll_timeout_ms: int = 10_000,
         user_data_dir: str = "data/playwright-profile",
+        async_writes: bool = False,
+        scraper: PlaywrightDiscordScraper | None = None,
+        db: ScrapeDB | BackgroundWriter | None = None,
+        check_login: bool = True,
+        incremental: bool = False,
+        resume: bool = False,
+        capture: bool = False,
+        engine: str = "dom",
     ) -> None:
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
         self.server_id = server_id
         self.channel_id = channel_id
         self.server_name = server_name or server_id
         self.channel_name = channel_name or channel_id
         self.max_scrolls = max_scrolls
+        self.check_login = check_login
+        self.incremental = incremental
+        self.resume = resume
+        self.capture = capture
+        self.engine = engine
         self._log = create_logger("retrieval.session")
-        self._scraper = PlaywrightDiscordScraper(
+        self.metrics: ScrapeMetrics | None = None
+        self._owns_scraper = scraper is None
+        self._scraper = scraper or PlaywrightDiscordScraper(
             user_data_dir=user_data_dir,
             headless=headless,
+            scroll_timeout_ms=scroll_timeout_ms,
         )
-        self._db = ScrapeDB(db_path)
+        self._owns_db = db is None
+        self._db: ScrapeDB | BackgroundWriter
+        if db is not None:
+            self._db = db
+        else:
+            self._db = BackgroundWriter(db_path) if async_writes else ScrapeDB(db_path)
 
     def run(self) -> dict[str, object]:
         """Execute the full scrape. Returns summary dict."""
+        steps = self.steps()
+        while True:
+            try:
+                next(steps)
+            except StopIteration as done:
+                result: dict[str, object] = done.value
+                return result
+
+    def steps(self) -> Generator[None, None, dict[str, object]]:
+        """The scrape as a generator that pauses while a scroll is loading.
+
+        Each ``next()`` runs one pass up to the point where older history has
+        been requested, so a caller can drive several sessions on different
+        tabs in turn and let their page loads overlap (see ``ScrapeRun``).
+        The summary dict is the generator's return value.
+        """
         self._db.ensure_server(self.server_id, self.server_name)
         self._db.ensure_channel(self.channel_id, self.server_id, self.channel_name)
-        job_id = self._db.create_scrape_job(self.channel_id)
-        self._log.info("Scrape job created", {"job_id": job_id})
+        scrape_type = "incremental" if self.incremental else "full"
+        resume_from = self._db.find_resumable_job(self.channel_id) if self.resume else None
+        job_id = self._db.create_scrape_job(
+            self.channel_id,
+            scrape_type,
+            resumed_from_job_id=resume_from[0] if resume_from else None,
+        )
+        self._log.info("Scrape job created", {"job_id": job_id, "type": scrape_type})
+        oldest: str | None = None
+        if resume_from:
+            oldest = resume_from[1]
+            self._log.info(
+                "Resuming job",
+                {"resumed_from_job_id": resume_from[0], "checkpoint": oldest},
+            )
 
-        total_inserted = 0
-        seen_ids: set[str] = set()
+        known_id, _ = self._db.get_channel_watermark(self.channel_id)
+        progress = ScrapeProgress(
+            self.server_id, self.channel_id, known_id, oldest, self.incremental
+        )
+        scroll_wait_ms = 0.0
+        ingest = InsertResult()
+        pending: list[Future[InsertResult]] = []
+        metrics = self.metrics = ScrapeMetrics()
+        self._scraper.metrics = metrics
 
         try:
-            self._scraper.start()
-            self._scraper.navigate_to_channel(self.server_id, self.channel_id)
+            if self._owns_scraper:
+                with metrics.phase("launch"):
+                    self._scraper.start()
+            network = self.engine == "network"
+            if network:
+                self._scraper.start_network_capture(self.channel_id, self.server_id)
+            with metrics.phase("navigate"):
+                self._scraper.navigate_to_channel(self.server_id, self.channel_id, oldest)
 
-            if not self._scraper.wait_for_login(timeout=300):
-                self._db.update_job_status(job_id, "failed", "Login timeout")
-                return {"job_id": job_id, "status": "failed", "error": "login_timeout"}
+            if self.check_login:
+                with metrics.phase("login_wait"):
+                    logged_in = self._scraper.wait_for_login(timeout=300)
+                if not logged_in:
+                    self._db.update_job_status(job_id, "failed", "Login timeout")
+                    return {"job_id": job_id, "status": "failed", "error": "login_timeout"}
 
+            capture = self.capture and self.engine == "dom"
+            if capture:
+                self._scraper.start_capture()
             for scroll_num in range(self.max_scrolls + 1):
-                messages = self._scraper.extract_messages()
-                new_count = 0
-                for msg in messages:
-                    if not msg.message_id or msg.message_id in seen_ids:
-                        continue
-                    seen_ids.add(msg.message_id)
-                    self._db.insert_message(
-                        message_id=msg.message_id,
-                        channel_id=self.channel_id,
-                        author_id=msg.author or "unknown",
-                        author_name=msg.author or "unknown",
-                        content=msg.content,
-                        timestamp=msg.timestamp or "",
-                        server_id=self.server_id,
-                        reply_to_message_id=None,
+                batch: Sequence[MessageRow] | MessageColumns
+                if network:
+                    rows = self._scraper.drain_network_capture()
+                    with metrics.phase("dedupe"):
+                        batch, overlap = progress.add_rows(rows)
+                elif self.engine == "columns":
+                    cols = self._scraper.extract_new_columns(self.channel_id, self.server_id)
+                    with metrics.phase("dedupe"):
+                        batch, overlap = progress.add_columns(cols)
+                else:
+                    messages = (
+                        self._scraper.drain_capture()
+                        if capture
+                        else self._scraper.extract_new_messages()
                     )
-                    new_count += 1
-
-                total_inserted += new_count
-                if new_count > 0:
-                    self._db.increment_messages_scraped(job_id, new_count)
+                    with metrics.phase("dedupe"):
+                        batch, overlap = progress.add(messages)
+                if batch:
+                    with metrics.phase("db_write"):
+                        written = (
+                            self._db.insert_columns(
+                                batch, job_id=job_id, checkpoint=progress.oldest
+                            )
+                            if isinstance(batch, MessageColumns)
+                            else self._db.insert_messages(
+                                batch, job_id=job_id, checkpoint=progress.oldest
+                            )
+                        )
+                    if isinstance(written, Future):
+                        pending.append(written)
+                    else:
+                        ingest += written
+                # Everything between the watermark and the newest message was
+                # rendered in an overlapping pass; older history is archived.
+                done = self.incremental and overlap
+                waited_ms = 0.0
+                if not done and scroll_num < self.max_scrolls:
+                    pending_scroll = self._scraper.begin_scroll()
+                    yield
+                    scroll = self._scraper.finish_scroll(pending_scroll)
+                    waited_ms = scroll.waited_ms
+                    scroll_wait_ms += waited_ms
+                    metrics.add("scroll_wait", waited_ms)
+                    done = progress.scrolled(scroll)
                 self._log.info(
                     "Scroll pass",
-                    {"scroll": scroll_num, "new": new_count, "total": total_inserted},
+                    {
+                        "scroll": scroll_num,
+                        "new": len(batch),
+                        "total": progress.total_scraped,
+                        "waited_ms": round(waited_ms),
+                    },
                 )
+                if self.incremental and overlap:
+                    self._log.info(
+                        "Reached last known message", {"last_message_id": known_id}
+                    )
+                if done:
+                    break
 
-                if scroll_num < self.max_scrolls:
-                    at_top = self._scraper.scroll_up()
-                    if at_top:
-                        break
-
+            if capture:
+                self._scraper.stop_capture()
+            if network:
+                self._scraper.stop_network_capture()
+            if pending:
+                with metrics.phase("db_write"):
+                    for future in pending:
+                        ingest += future.result()
+            if progress.watermark is not None:
+                newest = progress.watermark
+                self._db.update_channel_watermark(
+                    self.channel_id, newest.message_id, newest.timestamp or None
+                )
             self._db.update_job_status(job_id, "completed")
-            self._log.info(
-                "Scrape complete",
-                {"job_id": job_id, "messages": total_inserted},
-            )
-            return {
-                "job_id": job_id,
-                "status": "completed",
-                "messages_scraped": total_inserted,
-            }
+            self._db.record_job_metrics(job_id, metrics.rows())
+            result = progress.summary(job_id, ingest, scroll_wait_ms, self._log)
+            self._log.info("Scrape metrics", {"job_id": job_id, **metrics.summary()})
+            result["metrics"] = metrics
+            return result
 
+        except (KeyboardInterrupt, GeneratorExit):
+            # Leave a failed (resumable) job behind instead of a stale "running";
+            # GeneratorExit is a driver abandoning ``steps()`` part-way.
+            self._db.update_job_status(job_id, "failed", "Interrupted")
+            self._log.error("Scrape interrupted", {"job_id": job_id})
+            raise
         except Exception as e:
             self._db.update_job_status(job_id, "failed", str(e))
+            self._db.record_job_metrics(job_id, metrics.rows())
             self._log.error("Scrape failed", {"job_id": job_id, "error": str(e)})
-            return {"job_id": job_id, "status": "failed", "error": str(e)}
+            return {"job_id": job_id, "status": "failed", "error": str(e), "metrics": metrics}
         finally:
-            self._scraper.close()
-            self._db.close()
+            self._scraper.metrics = None
+            if self._owns_scraper:
+                self._scraper.close()
+            if self._owns_db:
+                self._db.close()
@@ -0,0 +1,100 @@
+"""Full-text search over archived messages (FTS5 ``messages_fts``).
+
+The index is created and kept in sync by migration 0003. Queries go
+through the FTS index first and join back to ``messages`` by rowid, so
+cost scales with the number of matches rather than the archive size.
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+
+HIGHLIGHT_START = "\x1b[1m"
+HIGHLIGHT_END = "\x1b[0m"
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A single search result with a highlighted content snippet."""
+
+    message_id: str
+    channel_id: str
+    channel_name: str | None
+    author_name: str
+    timestamp: str
+    snippet: str
+    message_url: str
+
+
+def to_match_expression(text: str) -> str:
+    """Turn free text into an FTS5 query that ANDs each word as a literal.
+
+    Keeps user input such as ``c++`` or ``don't`` from being parsed as FTS5
+    syntax. Use ``raw=True`` on ``search_messages`` to pass operators through.
+    """
+    terms = [t.replace('"', '""') for t in text.split()]
+    return " ".join(f'"{t}"' for t in terms if t)
+
+
+def search_messages(
+    conn: sqlite3.Connection,
+    query: str,
+    *,
+    channel_id: str | None = None,
+    author: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    limit: int = 20,
+    raw: bool = False,
+    newest_first: bool = False,
+    highlight: tuple[str, str] = (HIGHLIGHT_START, HIGHLIGHT_END),
+) -> list[SearchHit]:
+    """Search message content and author names.
+
+    ``since``/``until`` are ISO timestamps compared against
+    ``messages.timestamp`` (inclusive/exclusive). Results are ordered by
+    BM25 relevance unless ``newest_first`` is set.
+    """
+    match = query if raw else to_match_expression(query)
+    if not match:
+        return []
+    where = ["messages_fts MATCH ?"]
+    params: list[object] = [highlight[0], highlight[1], match]
+    if channel_id:
+        where.append("m.channel_id = ?")
+        params.append(channel_id)
+    if author:
+        where.append("m.author_name = ? COLLATE NOCASE")
+        params.append(author)
+    if since:
+        where.append("m.timestamp >= ?")
+        params.append(since)
+    if until:
+        where.append("m.timestamp < ?")
+        params.append(until)
+    params.append(limit)
+    order = "m.timestamp DESC" if newest_first else "messages_fts.rank"
+    sql = f"""
+        SELECT m.id, m.channel_id, c.name, m.author_name, m.timestamp,
+               snippet(messages_fts, 0, ?, ?, '…', 16), m.message_url
+        FROM messages_fts
+        JOIN messages m ON m.rowid = messages_fts.rowid
+        LEFT JOIN channels c ON c.id = m.channel_id
+        WHERE {" AND ".join(where)}
+        ORDER BY {order}
+        LIMIT ?
+    """
+    return [SearchHit(*row) for row in conn.execute(sql, params)]
+
+
+def rebuild_index(conn: sqlite3.Connection) -> int:
+    """Rebuild ``messages_fts`` from ``messages``. Returns rows indexed.
+
+    Needed after bulk edits that bypass the triggers, or after ``VACUUM``
+    (which may renumber the rowids the index refers to).
+    """
+    with conn:
+        conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('rebuild')")
+        conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('optimize')")
+    row = conn.execute("SELECT COUNT(*) FROM messages").fetchone()
+    return int(row[0])
@@ -0,0 +1,96 @@
+"""Channel statistics served from maintained counters, not message scans.
+
+``channels.message_count`` and ``channel_activity_hourly`` are updated by
+``ScrapeDB.insert_messages`` in the same transaction as the inserts, so
+these queries cost O(channels) or O(hours) rather than a ``COUNT(*)`` over
+``messages``. ``rebuild_stats`` recomputes both from scratch, e.g. after
+rows were written by a tool that bypasses the Python ingest path.
+"""
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ChannelStats:
+    channel_id: str
+    channel_name: str
+    server_name: str | None
+    message_count: int
+    last_scraped: str | None
+    last_message_timestamp: str | None
+
+
+def channel_stats(conn: sqlite3.Connection) -> list[ChannelStats]:
+    rows = conn.execute(
+        """SELECT c.id, c.name, s.name, COALESCE(c.message_count, 0),
+                  c.last_scraped, c.last_message_timestamp
+           FROM channels c LEFT JOIN servers s ON s.id = c.server_id
+           ORDER BY s.name, c.name"""
+    )
+    return [ChannelStats(*row) for row in rows]
+
+
+def author_activity(
+    conn: sqlite3.Connection,
+    channel_id: str | None = None,
+    since: str | None = None,
+    until: str | None = None,
+    limit: int = 20,
+) -> list[tuple[str, int]]:
+    """Top authors by message count from the hourly rollup.
+
+    ``since``/``until`` are ISO timestamps truncated to the hour
+    (inclusive/exclusive).
+    """
+    where: list[str] = []
+    params: list[object] = []
+    if channel_id:
+        where.append("channel_id = ?")
+        params.append(channel_id)
+    if since:
+        where.append("hour >= ?")
+        params.append(since[:13])
+    if until:
+        where.append("hour < ?")
+        params.append(until[:13])
+    clause = f"WHERE {' AND '.join(where)}" if where else ""
+    params.append(limit)
+    rows = conn.execute(
+        f"""SELECT author_id, SUM(message_count) AS n
+            FROM channel_activity_hourly {clause}
+            GROUP BY author_id ORDER BY n DESC, author_id LIMIT ?""",
+        params,
+    )
+    return [(str(author), int(n)) for author, n in rows]
+
+
+def hourly_activity(
+    conn: sqlite3.Connection, channel_id: str, since: str | None = None
+) -> list[tuple[str, int]]:
+    """Messages per hour for one channel, oldest first."""
+    rows = conn.execute(
+        """SELECT hour, SUM(message_count) FROM channel_activity_hourly
+           WHERE channel_id = ? AND hour >= ?
+           GROUP BY hour ORDER BY hour""",
+        (channel_id, (since or "")[:13]),
+    )
+    return [(str(hour), int(n)) for hour, n in rows]
+
+
+def rebuild_stats(conn: sqlite3.Connection) -> None:
+    """Recompute channel counters and hourly rollups from ``messages``."""
+    with conn:
+        conn.execute("DELETE FROM channel_activity_hourly")
+        conn.execute(
+            """INSERT INTO channel_activity_hourly
+                 (channel_id, author_id, hour, message_count)
+               SELECT channel_id, author_id, substr(timestamp, 1, 13), COUNT(*)
+               FROM messages
+               GROUP BY channel_id, author_id, substr(timestamp, 1, 13)"""
+        )
+        conn.execute(
+            """UPDATE channels SET message_count =
+                 (SELECT COUNT(*) FROM messages m WHERE m.channel_id = channels.id)"""
+        )
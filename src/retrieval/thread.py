@@ -0,0 +1,156 @@
+"""Reply-graph and thread reconstruction for a channel.
+
+Unlike the TypeScript ThreadAnalyzer, which issues one ``getReplies`` query
+per node, the whole reply forest of a channel is built from a single
+ordered scan over ``idx_messages_channel_ts``. Depth, size and flatten then
+run against the in-memory adjacency index, and ``ThreadCache`` keeps that
+index per channel until the writer inserts into the channel again.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from .db import ScrapeDB
+from .writer import BackgroundWriter
+
+
+@dataclass(frozen=True, slots=True)
+class ThreadNode:
+    """Lightweight per-message entry of the adjacency index."""
+
+    message_id: str
+    author_name: str
+    timestamp: str
+    reply_to_message_id: str | None
+
+
+class ReplyForest:
+    """All reply trees of one channel, children ordered by time.
+
+    A message whose parent is missing from the channel (not yet scraped, or
+    deleted) is treated as a root so no message is unreachable.
+    """
+
+    def __init__(self, channel_id: str, nodes: list[ThreadNode]) -> None:
+        self.channel_id = channel_id
+        self.nodes: dict[str, ThreadNode] = {n.message_id: n for n in nodes}
+        self.children: dict[str, list[str]] = {}
+        self.roots: list[str] = []
+        for n in nodes:
+            parent = n.reply_to_message_id
+            if parent and parent in self.nodes and parent != n.message_id:
+                self.children.setdefault(parent, []).append(n.message_id)
+            else:
+                self.roots.append(n.message_id)
+        self._size: dict[str, int] = {}
+        self._depth: dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __contains__(self, message_id: object) -> bool:
+        return message_id in self.nodes
+
+    def replies(self, message_id: str) -> list[str]:
+        return self.children.get(message_id, [])
+
+    def threads(self) -> list[str]:
+        """Roots that have at least one reply, oldest first."""
+        return [r for r in self.roots if r in self.children]
+
+    def root_of(self, message_id: str) -> str:
+        current = message_id
+        seen: set[str] = set()
+        while current not in seen:
+            seen.add(current)
+            parent = self.nodes[current].reply_to_message_id
+            if not parent or parent not in self.nodes:
+                return current
+            current = parent
+        return current
+
+    def flatten(self, root_id: str) -> list[tuple[str, int]]:
+        """Pre-order walk of a thread as ``(message_id, level)``; root is level 0."""
+        out: list[tuple[str, int]] = []
+        stack = [(root_id, 0)]
+        seen: set[str] = set()
+        while stack:
+            message_id, level = stack.pop()
+            if message_id in seen:
+                continue
+            seen.add(message_id)
+            out.append((message_id, level))
+            for child in reversed(self.replies(message_id)):
+                stack.append((child, level + 1))
+        return out
+
+    def size(self, root_id: str) -> int:
+        """Number of messages in the subtree, the root included."""
+        self._compute(root_id)
+        return self._size[root_id]
+
+    def depth(self, root_id: str) -> int:
+        """Height of the subtree; a message without replies has depth 1."""
+        self._compute(root_id)
+        return self._depth[root_id]
+
+    def _compute(self, root_id: str) -> None:
+        if root_id in self._size:
+            return
+        # Children precede parents when a pre-order walk is reversed.
+        for message_id, _ in reversed(self.flatten(root_id)):
+            kids = [c for c in self.replies(message_id) if c in self._size]
+            self._size[message_id] = 1 + sum(self._size[c] for c in kids)
+            self._depth[message_id] = 1 + max((self._depth[c] for c in kids), default=0)
+
+
+def load_reply_forest(conn: sqlite3.Connection, channel_id: str) -> ReplyForest:
+    """Build a channel's reply forest from one indexed, time-ordered scan."""
+    rows = conn.execute(
+        """SELECT id, author_name, timestamp, reply_to_message_id
+           FROM messages WHERE channel_id = ?
+           ORDER BY timestamp, id""",
+        (channel_id,),
+    )
+    return ReplyForest(channel_id, [ThreadNode(*row) for row in rows])
+
+
+class ThreadCache:
+    """Per-channel LRU of reply forests, invalidated by the writer."""
+
+    def __init__(self, conn: sqlite3.Connection, max_channels: int = 16) -> None:
+        self._conn = conn
+        self._max_channels = max_channels
+        self._forests: OrderedDict[str, ReplyForest] = OrderedDict()
+        self._lock = threading.Lock()
+        self._generation = 0
+
+    def watch(self, writer: ScrapeDB | BackgroundWriter) -> None:
+        writer.add_insert_listener(self.invalidate)
+
+    def forest(self, channel_id: str) -> ReplyForest:
+        with self._lock:
+            cached = self._forests.get(channel_id)
+            if cached is not None:
+                self._forests.move_to_end(channel_id)
+                return cached
+            generation = self._generation
+        forest = load_reply_forest(self._conn, channel_id)
+        with self._lock:
+            if generation != self._generation:
+                return forest  # an insert landed mid-load; don't cache it
+            self._forests[channel_id] = forest
+            if len(self._forests) > self._max_channels:
+                self._forests.popitem(last=False)
+        return forest
+
+    def invalidate(self, channel_id: str | None = None) -> None:
+        with self._lock:
+            self._generation += 1
+            if channel_id is None:
+                self._forests.clear()
+            else:
+                self._forests.pop(channel_id, None)
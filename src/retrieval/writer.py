@@ -0,0 +1,161 @@
+"""Background SQLite writer — keeps the browser loop off the database.
+
+A dedicated thread owns a WAL-mode ``ScrapeDB`` connection and drains a
+bounded queue of write tasks. Message batches are fire-and-forget (the
+caller gets a Future), bookkeeping calls that return values block until
+the writer has run them. When the queue is full, ``insert_messages``
+blocks, so a slow disk throttles extraction instead of buffering without
+limit.
+"""
+from __future__ import annotations
+
+import queue
+import threading
+from collections.abc import Callable, Sequence
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+from .db import InsertResult, MessageColumns, MessageRow, ScrapeDB
+from .logger import create_logger
+
+T = TypeVar("T")
+
+_Task = tuple[Callable[[ScrapeDB], Any], "Future[Any]"]
+
+
+class BackgroundWriter:
+    """Drop-in replacement for ``ScrapeDB`` whose writes run on one thread.
+
+    Exposes the same methods as ``ScrapeDB``; ``insert_messages`` returns a
+    ``Future[InsertResult]`` instead of the result itself.
+    """
+
+    def __init__(self, db_path: str = "data/dreader.db", max_pending: int = 8) -> None:
+        self._db_path = db_path
+        self._queue: queue.Queue[_Task | None] = queue.Queue(maxsize=max_pending)
+        self._log = create_logger("retrieval.writer")
+        self._ready = threading.Event()
+        self._startup_error: BaseException | None = None
+        self._closed = False
+        self._thread = threading.Thread(
+            target=self._run, name="dreader-writer", daemon=True
+        )
+        self._thread.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise self._startup_error
+
+    def _run(self) -> None:
+        try:
+            db = ScrapeDB(self._db_path, wal=True)
+        except BaseException as e:  # surfaced to the constructor
+            self._startup_error = e
+            self._ready.set()
+            return
+        self._ready.set()
+        try:
+            while True:
+                task = self._queue.get()
+                if task is None:
+                    break
+                fn, future = task
+                if not future.set_running_or_notify_cancel():
+                    continue
+                try:
+                    future.set_result(fn(db))
+                except BaseException as e:
+                    self._log.error("Write failed", {"error": str(e)})
+                    future.set_exception(e)
+        finally:
+            db.close()
+
+    def submit(self, fn: Callable[[ScrapeDB], T]) -> Future[T]:
+        """Queue ``fn(db)`` for the writer thread. Blocks while the queue is full."""
+        if self._closed:
+            raise RuntimeError("BackgroundWriter is closed")
+        future: Future[T] = Future()
+        self._queue.put((fn, future))
+        return future
+
+    def insert_messages(
+        self,
+        rows: Sequence[MessageRow],
+        job_id: int | None = None,
+        checkpoint: str | None = None,
+    ) -> Future[InsertResult]:
+        batch = list(rows)
+        return self.submit(
+            lambda db: db.insert_messages(batch, job_id=job_id, checkpoint=checkpoint)
+        )
+
+    def insert_columns(
+        self,
+        batch: MessageColumns,
+        job_id: int | None = None,
+        checkpoint: str | None = None,
+    ) -> Future[InsertResult]:
+        return self.submit(
+            lambda db: db.insert_columns(batch, job_id=job_id, checkpoint=checkpoint)
+        )
+
+    def ensure_server(self, server_id: str, name: str) -> None:
+        self.submit(lambda db: db.ensure_server(server_id, name)).result()
+
+    def ensure_channel(self, channel_id: str, server_id: str, name: str) -> None:
+        self.submit(lambda db: db.ensure_channel(channel_id, server_id, name)).result()
+
+    def create_scrape_job(
+        self,
+        channel_id: str,
+        scrape_type: str = "full",
+        resumed_from_job_id: int | None = None,
+    ) -> int:
+        return self.submit(
+            lambda db: db.create_scrape_job(channel_id, scrape_type, resumed_from_job_id)
+        ).result()
+
+    def find_resumable_job(self, channel_id: str) -> tuple[int, str] | None:
+        return self.submit(lambda db: db.find_resumable_job(channel_id)).result()
+
+    def update_job_status(
+        self, job_id: int, status: str, error_message: str | None = None
+    ) -> None:
+        self.submit(
+            lambda db: db.update_job_status(job_id, status, error_message)
+        ).result()
+
+    def record_job_metrics(
+        self,
+        job_id: int,
+        rows: Sequence[tuple[str, str, float, int, float, float, float]],
+    ) -> None:
+        self.submit(lambda db: db.record_job_metrics(job_id, rows)).result()
+
+    def get_channel_watermark(self, channel_id: str) -> tuple[str | None, str | None]:
+        return self.submit(lambda db: db.get_channel_watermark(channel_id)).result()
+
+    def update_channel_watermark(
+        self, channel_id: str, message_id: str, timestamp: str | None
+    ) -> None:
+        self.submit(
+            lambda db: db.update_channel_watermark(channel_id, message_id, timestamp)
+        ).result()
+
+    def increment_messages_scraped(self, job_id: int, count: int) -> None:
+        self.submit(lambda db: db.increment_messages_scraped(job_id, count)).result()
+
+    def add_insert_listener(self, callback: Callable[[str], None]) -> None:
+        """Register an insert listener; it is invoked on the writer thread."""
+        self.submit(lambda db: db.add_insert_listener(callback)).result()
+
+    def flush(self) -> None:
+        """Block until every write queued so far has been committed."""
+        self.submit(lambda db: None).result()
+
+    def close(self) -> None:
+        """Drain outstanding writes, then stop the thread and close the DB."""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
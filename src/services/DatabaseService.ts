@@ -11,10 +11,28 @@ class DatabaseService {
     this.db.pragma('foreign_keys = ON');
   }
 
+  /**
+   * Apply pending migrations from ./migrations (shared with the Python
+   * ScrapeDB). The applied version lives in PRAGMA user_version, so an
+   * up-to-date database only costs one pragma read.
+   */
   initialize(): void {
-    const schemaPath = path.join(__dirname, 'schema.sql');
-    const schema = fs.readFileSync(schemaPath, 'utf-8');
-    this.db.exec(schema);
+    const migrationsDir = path.join(__dirname, 'migrations');
+    const migrations = fs.readdirSync(migrationsDir)
+      .map(name => ({ name, match: /^(\d+)_[\w-]+\.sql$/.exec(name) }))
+      .filter(m => m.match !== null)
+      .map(m => ({ version: parseInt(m.match![1], 10), file: path.join(migrationsDir, m.name) }))
+      .sort((a, b) => a.version - b.version);
+
+    const current = this.db.pragma('user_version', { simple: true }) as number;
+    for (const migration of migrations) {
+      if (migration.version <= current) continue;
+      const sql = fs.readFileSync(migration.file, 'utf-8');
+      this.db.transaction(() => {
+        this.db.exec(sql);
+        this.db.pragma(`user_version = ${migration.version}`);
+      }).immediate();
+    }
   }
 
   close(): void {
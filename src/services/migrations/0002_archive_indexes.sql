@@ -0,0 +1,9 @@
+-- Channel-ordered reads (pagination, exports, incremental scrapes) walk
+-- (channel_id, timestamp, id) instead of sorting the whole channel.
+CREATE INDEX IF NOT EXISTS idx_messages_channel_ts ON messages(channel_id, timestamp, id);
+
+-- Latest job per channel (resume, dashboards).
+CREATE INDEX IF NOT EXISTS idx_scrape_jobs_channel ON scrape_jobs(channel_id, started_at);
+
+-- The (channel_id, id) primary key already serves channel lookups.
+DROP INDEX IF EXISTS idx_messages_channel;
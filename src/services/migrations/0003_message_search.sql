@@ -0,0 +1,30 @@
+-- Full-text index over message content and author names. External-content
+-- table: rows live in messages, the index stores only tokens. Triggers keep
+-- it in sync for both the Python and TypeScript writers.
+CREATE VIRTUAL TABLE IF NOT EXISTS messages_fts USING fts5(
+  content,
+  author_name,
+  content='messages',
+  content_rowid='rowid',
+  tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_ai AFTER INSERT ON messages BEGIN
+  INSERT INTO messages_fts(rowid, content, author_name)
+  VALUES (new.rowid, new.content, new.author_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_ad AFTER DELETE ON messages BEGIN
+  INSERT INTO messages_fts(messages_fts, rowid, content, author_name)
+  VALUES ('delete', old.rowid, old.content, old.author_name);
+END;
+
+CREATE TRIGGER IF NOT EXISTS messages_fts_au AFTER UPDATE OF content, author_name ON messages BEGIN
+  INSERT INTO messages_fts(messages_fts, rowid, content, author_name)
+  VALUES ('delete', old.rowid, old.content, old.author_name);
+  INSERT INTO messages_fts(rowid, content, author_name)
+  VALUES (new.rowid, new.content, new.author_name);
+END;
+
+-- Index whatever was archived before this migration.
+INSERT INTO messages_fts(messages_fts) VALUES ('rebuild');
@@ -0,0 +1,9 @@
+-- High-water marks for incremental exports. last_rowid is the largest
+-- messages.rowid written by the named export, so the next run reads only
+-- rows inserted since (including backfilled older history).
+CREATE TABLE IF NOT EXISTS export_watermarks (
+  name TEXT PRIMARY KEY,
+  last_rowid INTEGER NOT NULL DEFAULT 0,
+  rows_exported INTEGER NOT NULL DEFAULT 0,
+  exported_at TIMESTAMP
+);
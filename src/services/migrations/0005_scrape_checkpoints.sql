@@ -0,0 +1,3 @@
+-- Oldest message a job has reached, saved with each ingested batch so a
+-- failed backfill can resume from there (see scrape_jobs.resumed_from_job_id).
+ALTER TABLE scrape_jobs ADD COLUMN checkpoint_message_id TEXT;
@@ -0,0 +1,20 @@
+-- Per-channel, per-author message counts by hour ('YYYY-MM-DDTHH').
+-- Maintained by the Python ingest path in the same transaction as the
+-- message inserts, alongside channels.message_count.
+CREATE TABLE IF NOT EXISTS channel_activity_hourly (
+  channel_id TEXT NOT NULL,
+  author_id TEXT NOT NULL,
+  hour TEXT NOT NULL,
+  message_count INTEGER NOT NULL DEFAULT 0,
+  PRIMARY KEY (channel_id, hour, author_id)
+) WITHOUT ROWID;
+
+-- Seed counters from whatever is already archived.
+DELETE FROM channel_activity_hourly;
+INSERT INTO channel_activity_hourly (channel_id, author_id, hour, message_count)
+SELECT channel_id, author_id, substr(timestamp, 1, 13), COUNT(*)
+FROM messages
+GROUP BY channel_id, author_id, substr(timestamp, 1, 13);
+
+UPDATE channels
+SET message_count = (SELECT COUNT(*) FROM messages m WHERE m.channel_id = channels.id);
@@ -0,0 +1,15 @@
+-- Per-phase timings and counters of a scrape job, one row per metric.
+-- unit is 'ms' for timed phases (total = summed duration, count = calls)
+-- or a counter unit such as 'bytes' (total = sum, count = samples).
+CREATE TABLE IF NOT EXISTS scrape_job_metrics (
+  job_id INTEGER NOT NULL,
+  metric TEXT NOT NULL,
+  unit TEXT NOT NULL,
+  total REAL NOT NULL,
+  count INTEGER NOT NULL,
+  p50 REAL,
+  p95 REAL,
+  max REAL,
+  PRIMARY KEY (job_id, metric),
+  FOREIGN KEY (job_id) REFERENCES scrape_jobs(id)
+) WITHOUT ROWID;
@@ -1,13 +1,58 @@
 """Shared fixtures for retrieval tests.
 
+``message_row`` and the ``db`` fixture give every archive test the same
+server (srv1) and channels (ch1 "general", ch2 "random"); modules that need
+seed messages override ``db`` and insert them on top.
+
 RAW_MESSAGES simulates the output of the batch DOM extraction (page.evaluate)
 that the scraper runs against Discord's message list. Adjust field values if
 the Task 2 probe reveals different DOM structure.
 """
 from __future__ import annotations
 
+from pathlib import Path
+
 import pytest
 
+from src.retrieval.db import MessageRow, ScrapeDB
+
+
+@pytest.fixture(autouse=True)
+def _log_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Keep loggers created by the code under test out of the real data/logs."""
+    monkeypatch.setenv("LOG_DIR", str(tmp_path / "logs"))
+
+
+def message_row(
+    message_id: str,
+    channel: str = "ch1",
+    *,
+    author: str = "alice",
+    content: str | None = None,
+    ts: str = "2026-04-28T12:00:00.000Z",
+    reply_to: str | None = None,
+) -> MessageRow:
+    """A stored-message row in srv1; content defaults to ``message <id>``."""
+    return MessageRow(
+        message_id=message_id,
+        channel_id=channel,
+        author_id=author,
+        author_name=author,
+        content=f"message {message_id}" if content is None else content,
+        timestamp=ts,
+        server_id="srv1",
+        reply_to_message_id=reply_to,
+    )
+
+
+@pytest.fixture()
+def db(tmp_path: Path) -> ScrapeDB:
+    scrape_db = ScrapeDB(str(tmp_path / "dreader.db"))
+    scrape_db.ensure_server("srv1", "TestServer")
+    scrape_db.ensure_channel("ch1", "srv1", "general")
+    scrape_db.ensure_channel("ch2", "srv1", "random")
+    return scrape_db
+
 
 @pytest.fixture()
 def raw_messages() -> list[dict]:
@@ -0,0 +1,93 @@
+"""Tests for the asyncio scraping engine (browser mocked)."""
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from pathlib import Path
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.retrieval.async_scraper import AsyncScrapeSession
+from src.retrieval.discord_playwright_scraper import DiscordMessage, ScrollResult
+from src.retrieval.writer import BackgroundWriter
+
+
+@pytest.fixture()
+def scraper() -> AsyncMock:
+    scraper = AsyncMock()
+    scraper.wait_for_login.return_value = True
+    scraper.extract_new_messages.side_effect = [
+        [DiscordMessage(content="hello", message_id="200", timestamp="2026-04-28T12:00:00Z")],
+        [DiscordMessage(content="older", message_id="100", timestamp="2026-04-28T11:00:00Z")],
+    ]
+    scraper.scroll_up.side_effect = [
+        ScrollResult(at_top=False, waited_ms=10.0),
+        ScrollResult(at_top=True, waited_ms=0.0),
+    ]
+    return scraper
+
+
+def _session(scraper: AsyncMock, db: BackgroundWriter) -> AsyncScrapeSession:
+    return AsyncScrapeSession(
+        server_id="srv1",
+        channel_id="ch1",
+        max_scrolls=5,
+        scraper=scraper,
+        db=db,
+        check_login=False,
+    )
+
+
+class TestAsyncScrapeSession:
+    def test_batches_are_written_through_writer(
+        self, tmp_path: Path, scraper: AsyncMock
+    ) -> None:
+        db_path = str(tmp_path / "dreader.db")
+        writer = BackgroundWriter(db_path)
+        session = _session(scraper, writer)
+
+        async def collect() -> list[list[str]]:
+            return [[r.message_id for r in batch] async for batch in session.batches()]
+
+        batches = asyncio.run(collect())
+        writer.close()
+
+        assert batches == [["200"], ["100"]]
+        assert session.result is not None
+        assert session.result["messages_inserted"] == 2
+        conn = sqlite3.connect(db_path)
+        status, scraped = conn.execute(
+            "SELECT status, messages_scraped FROM scrape_jobs"
+        ).fetchone()
+        watermark = conn.execute(
+            "SELECT last_message_id FROM channels WHERE id = 'ch1'"
+        ).fetchone()[0]
+        assert (status, scraped) == ("completed", 2)
+        assert watermark == "200"
+
+    def test_cancellation_fails_job(self, tmp_path: Path, scraper: AsyncMock) -> None:
+        db_path = str(tmp_path / "dreader.db")
+        writer = BackgroundWriter(db_path)
+
+        async def hang(*_: object) -> ScrollResult:
+            await asyncio.sleep(60)
+            raise AssertionError("not cancelled")
+
+        scraper.scroll_up.side_effect = hang
+
+        async def cancel_mid_scroll() -> None:
+            task = asyncio.create_task(_session(scraper, writer).run())
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(cancel_mid_scroll())
+        writer.close()
+
+        conn = sqlite3.connect(db_path)
+        status, error = conn.execute(
+            "SELECT status, error_message FROM scrape_jobs"
+        ).fetchone()
+        assert (status, error) == ("failed", "Cancelled")
@@ -0,0 +1,50 @@
+"""Smoke tests for the benchmark harness (the benchmarks themselves run separately)."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from benchmarks.retrieval import synthetic
+from benchmarks.retrieval.__main__ import compare, main
+from benchmarks.retrieval.cases import CASES
+
+
+class TestSynthetic:
+    def test_raw_messages_parse_like_page_output(self) -> None:
+        raw = synthetic.raw_messages(100)
+        rows = synthetic.rows(100)
+
+        assert len(raw) == 100
+        # Every 50th entry is unusable, as the page sometimes returns.
+        assert len(rows) == 98
+        assert len({r.message_id for r in rows}) == 98
+        assert synthetic.raw_messages(100) == raw
+
+    def test_scroll_passes_overlap(self) -> None:
+        passes = synthetic.scroll_passes(synthetic.messages(500), size=200, overlap=50)
+
+        assert passes[0][150:] == passes[1][:50]
+
+
+class TestHarness:
+    def test_compare_flags_slowdowns_beyond_tolerance(self) -> None:
+        baseline = {"parse/10": {"per_sec": 1000.0}, "log/10": {"per_sec": 1000.0}}
+        results = {
+            "parse/10": {"per_sec": 600.0},
+            "log/10": {"per_sec": 900.0},
+            "dedupe/10": {"per_sec": 1.0},
+        }
+
+        assert compare(results, baseline, tolerance=0.25) == ["parse/10"]
+
+    def test_every_case_runs_and_saves_baseline(self, tmp_path: Path) -> None:
+        baseline = tmp_path / "baseline.json"
+
+        args = ["--sizes", "50", "--repeat", "1", "--baseline", str(baseline)]
+        assert main([*args, "--save"]) == 0
+
+        saved = json.loads(baseline.read_text())
+        assert set(saved["results"]) == {
+            f"{name}/50" for name, case in CASES.items() if case.default
+        }
+        assert main([*args, "--tolerance", "1"]) == 0
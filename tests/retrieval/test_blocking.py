@@ -0,0 +1,53 @@
+"""Tests for resource blocking."""
+from __future__ import annotations
+
+from fnmatch import fnmatchcase
+from unittest.mock import MagicMock
+
+from src.retrieval.blocking import DEFAULT_URL_PATTERNS, TYPICAL_BYTES, ResourceBlocker
+from src.retrieval.discord_playwright_scraper import PlaywrightDiscordScraper
+
+
+def _blocked(url: str) -> bool:
+    # Chrome's patterns only use ``*``, which fnmatch reads the same way.
+    return any(fnmatchcase(url, p) for p in DEFAULT_URL_PATTERNS)
+
+
+class TestResourceBlocker:
+    def test_patterns_cover_media_hosts_and_file_types(self) -> None:
+        assert _blocked("https://cdn.discordapp.com/avatars/1/abc.webp?size=80")
+        assert _blocked("https://images-ext-2.discordapp.net/external/x")
+        assert _blocked("https://discord.com/assets/x.woff2")
+        assert _blocked("https://example.com/a.png")
+
+    def test_patterns_leave_app_traffic(self) -> None:
+        assert not _blocked("https://discord.com/channels/1/2")
+        assert not _blocked("https://discord.com/assets/web.1234.js")
+        assert not _blocked("https://discord.com/assets/x.css")
+        assert not _blocked("https://discord.com/api/v9/channels/1/messages?limit=50")
+
+    def test_counts_only_requests_it_blocked(self) -> None:
+        blocker = ResourceBlocker()
+        blocker.on_loading_failed({"type": "Image", "blockedReason": "inspector"})
+        blocker.on_loading_failed({"type": "Image", "blockedReason": "inspector"})
+        blocker.on_loading_failed({"type": "Font", "blockedReason": "inspector"})
+        blocker.on_loading_failed({"type": "Image", "errorText": "net::ERR_FAILED"})
+
+        assert blocker.summary()["blocked"] == {"image": 2, "font": 1}
+        assert blocker.est_bytes_saved == 2 * TYPICAL_BYTES["image"] + TYPICAL_BYTES["font"]
+
+
+class TestScraperInstall:
+    def test_every_page_gets_the_patterns_without_routing(self) -> None:
+        blocker = ResourceBlocker()
+        scraper = PlaywrightDiscordScraper(blocker=blocker)
+        scraper._context = MagicMock()
+        cdp = scraper._context.new_cdp_session.return_value
+
+        scraper._attach_page(MagicMock())
+        tab = scraper.open_tab()
+
+        assert tab.blocker is blocker
+        assert scraper._context.new_cdp_session.call_count == 2
+        cdp.send.assert_any_call("Network.setBlockedURLs", {"urls": list(DEFAULT_URL_PATTERNS)})
+        scraper._context.route.assert_not_called()
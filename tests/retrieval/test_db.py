@@ -0,0 +1,181 @@
+"""Tests for the ScrapeDB SQLite access layer."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+from src.retrieval.db import MessageColumns, ScrapeDB
+
+from .conftest import message_row
+
+
+class TestInsertMessages:
+    def test_counts_inserted(self, db: ScrapeDB) -> None:
+        result = db.insert_messages([message_row("1"), message_row("2"), message_row("3")])
+        assert result.inserted == 3
+        assert result.duplicates == 0
+
+    def test_counts_duplicates_per_batch(self, db: ScrapeDB) -> None:
+        db.insert_messages([message_row("1"), message_row("2")])
+        result = db.insert_messages([message_row("2"), message_row("3")])
+        assert result.inserted == 1
+        assert result.duplicates == 1
+
+    def test_empty_batch(self, db: ScrapeDB) -> None:
+        result = db.insert_messages([])
+        assert (result.inserted, result.duplicates) == (0, 0)
+
+    def test_increments_job_counter(self, db: ScrapeDB) -> None:
+        job_id = db.create_scrape_job("ch1")
+        db.insert_messages([message_row("1"), message_row("2")], job_id=job_id)
+        db.insert_messages([message_row("3")], job_id=job_id)
+        row = db._conn.execute(
+            "SELECT messages_scraped FROM scrape_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        assert row[0] == 3
+
+    def test_builds_message_url(self, db: ScrapeDB) -> None:
+        db.insert_messages([message_row("42")])
+        row = db._conn.execute(
+            "SELECT message_url FROM messages WHERE id = '42'"
+        ).fetchone()
+        assert row[0] == "https://discord.com/channels/srv1/ch1/42"
+
+
+def _columns(*ids: str) -> MessageColumns:
+    return MessageColumns(
+        channel_id="ch1",
+        server_id="srv1",
+        ids=list(ids),
+        authors=["alice"] * len(ids),
+        timestamps=["2026-04-28T12:00:00.000Z"] * len(ids),
+        contents=[f"message {i}" for i in ids],
+        reply_ids=[None] * len(ids),
+        attachment_urls=["[]"] * len(ids),
+    )
+
+
+class TestInsertColumns:
+    def test_same_rows_as_insert_messages(self, db: ScrapeDB, tmp_path: Path) -> None:
+        other = ScrapeDB(str(tmp_path / "rows.db"))
+        other.ensure_server("srv1", "TestServer")
+        other.ensure_channel("ch1", "srv1", "general")
+        db.insert_columns(_columns("1", "2"))
+        other.insert_messages([message_row("1"), message_row("2")])
+        query = "SELECT * FROM messages ORDER BY id"
+        assert db._conn.execute(query).fetchall() == other._conn.execute(query).fetchall()
+
+    def test_dedupes_and_counts(self, db: ScrapeDB) -> None:
+        job_id = db.create_scrape_job("ch1")
+        db.insert_columns(_columns("1", "2"), job_id=job_id, checkpoint="1")
+        result = db.insert_columns(_columns("2", "3", "3"), job_id=job_id)
+        assert (result.inserted, result.duplicates) == (1, 2)
+        scraped, checkpoint = db._conn.execute(
+            "SELECT messages_scraped, checkpoint_message_id FROM scrape_jobs"
+        ).fetchone()
+        assert (scraped, checkpoint) == (5, "1")
+        count = db._conn.execute(
+            "SELECT message_count FROM channels WHERE id = 'ch1'"
+        ).fetchone()[0]
+        assert count == 3
+
+    def test_page_attachments_match_row_encoding(self) -> None:
+        urls = ["https://cdn.discordapp.com/attachments/1/2/a.png", "https://x/b.png"]
+        raw = {
+            "ids": ["1", "2"],
+            "authors": ["alice", "alice"],
+            "timestamps": ["", ""],
+            "contents": ["", "hi"],
+            "reply_ids": [None, None],
+            # As JSON.stringify writes them: no spaces after separators.
+            "attachments": [json.dumps(urls, separators=(",", ":")), "[]"],
+        }
+        cols = MessageColumns.from_page("ch1", "srv1", raw)
+        # The DOM row path stores json.dumps() of the URL list.
+        assert cols.attachment_urls == [json.dumps(urls), json.dumps([])]
+
+    def test_notifies_listeners(self, db: ScrapeDB) -> None:
+        seen: list[str] = []
+        db.add_insert_listener(seen.append)
+        db.insert_columns(_columns("1"))
+        db.insert_columns(_columns("1"))
+        assert seen == ["ch1"]
+
+
+class TestInsertMessage:
+    def test_duplicate_returns_false(self, db: ScrapeDB) -> None:
+        kwargs = {
+            "message_id": "1",
+            "channel_id": "ch1",
+            "author_id": "alice",
+            "author_name": "alice",
+            "content": "hi",
+            "timestamp": "2026-04-28T12:00:00.000Z",
+            "server_id": "srv1",
+        }
+        assert db.insert_message(**kwargs) is True
+        assert db.insert_message(**kwargs) is False
+
+
+class TestChannelWatermark:
+    def test_only_moves_forward(self, db: ScrapeDB) -> None:
+        assert db.get_channel_watermark("ch1") == (None, None)
+        db.update_channel_watermark("ch1", "900", "2026-04-28T12:00:00.000Z")
+        db.update_channel_watermark("ch1", "1000", "2026-04-28T12:05:00.000Z")
+        db.update_channel_watermark("ch1", "950", "2026-04-28T12:02:00.000Z")
+        assert db.get_channel_watermark("ch1") == ("1000", "2026-04-28T12:05:00.000Z")
+
+
+class TestResumableJobs:
+    def test_failed_job_with_checkpoint_is_resumable(self, db: ScrapeDB) -> None:
+        job_id = db.create_scrape_job("ch1")
+        db.insert_messages([message_row("5")], job_id=job_id, checkpoint="5")
+        db.insert_messages([message_row("3")], job_id=job_id, checkpoint="3")
+        db.update_job_status(job_id, "failed", "Login timeout")
+        assert db.find_resumable_job("ch1") == (job_id, "3")
+
+    def test_completed_job_is_not_resumable(self, db: ScrapeDB) -> None:
+        job_id = db.create_scrape_job("ch1")
+        db.insert_messages([message_row("5")], job_id=job_id, checkpoint="5")
+        db.update_job_status(job_id, "completed")
+        assert db.find_resumable_job("ch1") is None
+
+    def test_resumed_job_links_to_previous(self, db: ScrapeDB) -> None:
+        first = db.create_scrape_job("ch1")
+        second = db.create_scrape_job("ch1", resumed_from_job_id=first)
+        row = db._conn.execute(
+            "SELECT resumed_from_job_id FROM scrape_jobs WHERE id = ?", (second,)
+        ).fetchone()
+        assert row[0] == first
+
+    def test_resume_failing_before_first_batch_stays_resumable(self, db: ScrapeDB) -> None:
+        first = db.create_scrape_job("ch1")
+        db.insert_messages([message_row("3")], job_id=first, checkpoint="3")
+        db.update_job_status(first, "failed", "Crashed")
+        second = db.create_scrape_job("ch1", resumed_from_job_id=first)
+        db.update_job_status(second, "failed", "Login timeout")
+
+        assert db.find_resumable_job("ch1") == (second, "3")
+        third = db.create_scrape_job("ch1", resumed_from_job_id=second)
+        db.insert_messages([message_row("2")], job_id=third, checkpoint="2")
+        assert db.find_resumable_job("ch1") == (third, "2")
+
+
+class TestJobMetrics:
+    def test_rows_replace_earlier_ones(self, db: ScrapeDB) -> None:
+        job_id = db.create_scrape_job("ch1")
+        db.record_job_metrics(job_id, [("extract", "ms", 10.0, 2, 4.0, 6.0, 6.0)])
+        db.record_job_metrics(
+            job_id,
+            [
+                ("extract", "ms", 30.0, 3, 10.0, 12.0, 12.0),
+                ("payload_bytes", "bytes", 2048.0, 3, 600.0, 900.0, 900.0),
+            ],
+        )
+
+        rows = db._conn.execute(
+            "SELECT metric, unit, total, count FROM scrape_job_metrics "
+            "WHERE job_id = ? ORDER BY metric",
+            (job_id,),
+        ).fetchall()
+        assert rows == [("extract", "ms", 30.0, 3), ("payload_bytes", "bytes", 2048.0, 3)]
@@ -0,0 +1,33 @@
+"""Tests for bounded seen-ID tracking."""
+from __future__ import annotations
+
+from src.retrieval.dedupe import SeenIdWindow
+
+
+class TestSeenIdWindow:
+    def test_first_pass_is_all_new(self) -> None:
+        seen = SeenIdWindow()
+        assert seen.filter_new(["100", "101", "102"]) == ["100", "101", "102"]
+
+    def test_older_pass_keeps_only_unseen(self) -> None:
+        seen = SeenIdWindow()
+        seen.filter_new(["100", "101", "102"])
+        # Rendered oldest-first: the older IDs must not be swallowed by the
+        # range widening from the first of them.
+        assert seen.filter_new(["97", "98", "99", "100", "101"]) == ["97", "98", "99"]
+        assert (seen.lo, seen.hi) == (97, 102)
+
+    def test_new_messages_below_list(self) -> None:
+        seen = SeenIdWindow()
+        seen.filter_new(["100", "101"])
+        assert seen.filter_new(["101", "105"]) == ["105"]
+
+    def test_duplicates_within_pass(self) -> None:
+        seen = SeenIdWindow()
+        assert seen.filter_new(["5", "5", "x", "x"]) == ["5", "x"]
+
+    def test_non_numeric_fallback_is_bounded(self) -> None:
+        seen = SeenIdWindow(max_other=2)
+        seen.filter_new(["a", "b", "c"])
+        assert "a" not in seen
+        assert "c" in seen
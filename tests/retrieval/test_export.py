@@ -0,0 +1,92 @@
+"""Tests for the streaming exporter."""
+from __future__ import annotations
+
+import gzip
+import json
+from datetime import UTC, datetime
+from pathlib import Path
+
+import pytest
+
+from src.retrieval.db import ScrapeDB
+from src.retrieval.errors import ExportError
+from src.retrieval.export import _chunk_sql, export_messages
+from src.retrieval.models import MessageRecord
+
+from .conftest import message_row
+
+
+@pytest.fixture()
+def db(db: ScrapeDB) -> ScrapeDB:
+    db.insert_messages(
+        [
+            message_row("1", author="user1"),
+            message_row("2", author="user2", reply_to="1"),
+            message_row("3", "ch2", author="user3"),
+        ]
+    )
+    return db
+
+
+def _read_gz(path: Path) -> list[dict[str, object]]:
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestExportMessages:
+    def test_jsonl_matches_message_record_shape(self, db: ScrapeDB, tmp_path: Path) -> None:
+        out = tmp_path / "out.jsonl.gz"
+        result = export_messages(db._conn, out, chunk_size=2)
+        records = _read_gz(out)
+
+        assert result.rows == 3
+        sample = MessageRecord(
+            raw_text="", captured_at=datetime.now(UTC), nav_index=0, channel_name="",
+            session_id="", author=None, discord_timestamp=None, is_reply=False,
+            reply_to_author=None, metadata_extraction_succeeded=True,
+            copy_attempt_count=0,
+        )
+        assert set(sample.to_dict()) <= set(records[0])
+        assert [r["nav_index"] for r in records] == [0, 1, 2]
+        assert records[1]["is_reply"] is True
+        assert records[1]["reply_to_author"] == "user1"
+        assert records[1]["channel_name"] == "general"
+
+    def test_channel_filter(self, db: ScrapeDB, tmp_path: Path) -> None:
+        out = tmp_path / "out.jsonl.gz"
+        export_messages(db._conn, out, channel_ids=["ch2"])
+        assert [r["message_id"] for r in _read_gz(out)] == ["3"]
+
+    def test_channel_chunks_walk_rowid(self, db: ScrapeDB) -> None:
+        plan = " ".join(
+            r[3] for r in db._conn.execute(f"EXPLAIN QUERY PLAN {_chunk_sql(1)}", (0, "ch1", 10))
+        )
+        # No per-chunk sort of the whole channel.
+        assert "USING INTEGER PRIMARY KEY" in plan
+        assert "TEMP B-TREE" not in plan
+
+    def test_watermark_exports_only_new_rows(self, db: ScrapeDB, tmp_path: Path) -> None:
+        first = export_messages(db._conn, tmp_path / "a.jsonl.gz", watermark="nightly")
+        db.insert_messages([message_row("4")])
+        second = export_messages(db._conn, tmp_path / "b.jsonl.gz", watermark="nightly")
+        third = export_messages(db._conn, tmp_path / "c.jsonl.gz", watermark="nightly")
+
+        assert (first.rows, second.rows, third.rows) == (3, 1, 0)
+        assert [r["message_id"] for r in _read_gz(tmp_path / "b.jsonl.gz")] == ["4"]
+
+    def test_plain_jsonl(self, db: ScrapeDB, tmp_path: Path) -> None:
+        out = tmp_path / "out.jsonl"
+        export_messages(db._conn, out)
+        assert len(out.read_text().splitlines()) == 3
+
+    def test_unknown_format(self, db: ScrapeDB, tmp_path: Path) -> None:
+        with pytest.raises(ExportError):
+            export_messages(db._conn, tmp_path / "out.csv", fmt="csv")
+
+    def test_parquet(self, db: ScrapeDB, tmp_path: Path) -> None:
+        pq = pytest.importorskip("pyarrow.parquet")
+        out = tmp_path / "out.parquet"
+        export_messages(db._conn, out, fmt="parquet", chunk_size=2)
+        table = pq.read_table(out)
+        assert table.num_rows == 3
+        assert table.column("message_id").to_pylist() == ["1", "2", "3"]
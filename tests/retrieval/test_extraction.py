@@ -1,11 +1,19 @@
 """Tests for message extraction logic."""
 from __future__ import annotations
 
+from unittest.mock import MagicMock
+
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+
 from src.retrieval.discord_playwright_scraper import (
     DiscordMessage,
+    PendingScroll,
+    PlaywrightDiscordScraper,
     clean_message_id,
+    clean_reply_id,
     parse_raw_messages,
 )
+from src.retrieval.metrics import ScrapeMetrics
 
 
 class TestCleanMessageId:
@@ -25,6 +33,20 @@ class TestCleanMessageId:
         assert clean_message_id("chat-1234567890") == "chat-1234567890"
 
 
+class TestCleanReplyId:
+    def test_bare_id(self) -> None:
+        assert clean_reply_id("1234567890") == "1234567890"
+
+    def test_dashed_id(self) -> None:
+        assert clean_reply_id("context-1234567890") == "1234567890"
+
+    def test_self_reference_dropped(self) -> None:
+        assert clean_reply_id("context-42", message_id="42") is None
+
+    def test_none_input(self) -> None:
+        assert clean_reply_id(None) is None
+
+
 class TestParseRawMessages:
     def test_parses_complete_message(self, raw_messages: list[dict]) -> None:
         result = parse_raw_messages(raw_messages)
@@ -49,6 +71,7 @@ class TestParseRawMessages:
         result = parse_raw_messages(raw_messages)
         msg = result[2]
         assert msg.is_reply is True
+        assert msg.reply_to_id == "1234567890"
         assert msg.author == "Bob"
 
     def test_skips_empty_content(self, raw_messages: list[dict]) -> None:
@@ -63,6 +86,114 @@ class TestParseRawMessages:
     def test_empty_input(self) -> None:
         assert parse_raw_messages([]) == []
 
+    def test_keeps_attachment_only_message(self) -> None:
+        url = "https://cdn.discordapp.com/attachments/1/2/cat.png"
+        raw = [{"id": "chat-messages-1-5", "content": "", "attachments": [url, None]}]
+        result = parse_raw_messages(raw)
+        assert len(result) == 1
+        assert result[0].attachment_urls == [url]
+
+
+class TestScrollUp:
+    def _scraper(self, page: MagicMock) -> PlaywrightDiscordScraper:
+        scraper = PlaywrightDiscordScraper(scroll_timeout_ms=500)
+        scraper._page = page
+        return scraper
+
+    def test_returns_when_history_renders(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = {"first_id": "chat-messages-1-5", "count": 50}
+        page.wait_for_function.return_value.json_value.return_value = "loaded"
+        result = self._scraper(page).scroll_up()
+        assert (result.at_top, result.stalled) == (False, False)
+        _, kwargs = page.wait_for_function.call_args
+        assert kwargs["arg"] == {"first_id": "chat-messages-1-5", "count": 50}
+        assert 0 < kwargs["timeout"] <= 500
+        page.wait_for_timeout.assert_not_called()
+
+    def test_channel_start_means_top(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = {"first_id": "chat-messages-1-5", "count": 50}
+        page.wait_for_function.return_value.json_value.return_value = "start"
+        result = self._scraper(page).scroll_up()
+        assert (result.at_top, result.stalled) == (True, False)
+
+    def test_timeout_is_a_stall_not_top(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = {"first_id": "chat-messages-1-5", "count": 50}
+        page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+        result = self._scraper(page).scroll_up()
+        assert (result.at_top, result.stalled) == (False, True)
+        assert result.waited_ms >= 0
+
+    def test_split_scroll_keeps_a_minimum_wait(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = {"first_id": "chat-messages-1-5", "count": 50}
+        scraper = PlaywrightDiscordScraper(scroll_timeout_ms=10_000)
+        scraper._page = page
+        pending = scraper.begin_scroll()
+        # Other tabs used up the whole budget meanwhile.
+        stale = PendingScroll(snapshot=pending.snapshot, started=pending.started - 60)
+        scraper.finish_scroll(stale)
+        assert page.wait_for_function.call_args.kwargs["timeout"] == 1000
+
+    def test_empty_channel_does_not_wait(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = {"first_id": None, "count": 0}
+        result = self._scraper(page).scroll_up()
+        assert result.at_top is True
+        page.wait_for_function.assert_not_called()
+
+
+class TestCapture:
+    def test_drain_keeps_whole_buffer(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = [
+            {"id": f"chat-messages-1-{i}", "content": f"m{i}"} for i in range(250)
+        ]
+        scraper = PlaywrightDiscordScraper()
+        scraper._page = page
+        # No 200-message cap: the buffer is already cleared page-side.
+        assert len(scraper.drain_capture()) == 250
+
+
+class TestDeltaExtraction:
+    def test_new_messages_are_not_capped(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = [
+            {"id": f"chat-messages-1-{i}", "content": f"m{i}"} for i in range(250)
+        ]
+        scraper = PlaywrightDiscordScraper()
+        scraper._page = page
+        # The page marked all 250 as seen; none may be dropped here.
+        assert len(scraper.extract_new_messages()) == 250
+
+    def test_columns_request_has_no_limit(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = {
+            "ids": [], "authors": [], "timestamps": [], "contents": [],
+            "reply_ids": [], "attachments": [],
+        }
+        scraper = PlaywrightDiscordScraper()
+        scraper._page = page
+        scraper.extract_new_columns("ch1", "srv1")
+        assert len(page.evaluate.call_args.args) == 1
+
+
+class TestMetrics:
+    def test_extract_and_parse_timed_separately(self) -> None:
+        page = MagicMock()
+        page.evaluate.return_value = [{"id": "chat-messages-1-5", "content": "hi"}]
+        scraper = PlaywrightDiscordScraper()
+        scraper._page = page
+        scraper.metrics = ScrapeMetrics()
+
+        scraper.extract_new_messages()
+
+        samples = scraper.metrics.samples
+        assert len(samples["extract"]) == len(samples["parse"]) == 1
+        assert samples["payload_bytes"] == [len('[{"id":"chat-messages-1-5","content":"hi"}]')]
+
 
 # Silence "unused import" — DiscordMessage imported as part of the module
 # contract under test.
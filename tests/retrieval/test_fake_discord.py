@@ -0,0 +1,150 @@
+"""End-to-end scroll-loop tests against the local fake Discord site.
+
+The history API tests run anywhere; the scroll-loop tests need a headless
+Chromium and are skipped without one.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+from collections.abc import Iterator
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from benchmarks.retrieval.fake_discord import FakeDiscord
+from src.retrieval.db import ScrapeDB
+from src.retrieval.discord_playwright_scraper import PlaywrightDiscordScraper
+from src.retrieval.scrape_session import PlaywrightScrapeSession
+
+
+class TestHistoryApi:
+    def test_pages_newest_first_before_cursor(self) -> None:
+        fake = FakeDiscord(messages=120)
+        ids = fake.message_ids
+
+        first = fake.history_page(50)
+        older = fake.history_page(50, before=first[-1]["id"])
+        last = fake.history_page(50, before=older[-1]["id"])
+
+        assert [m["id"] for m in first] == ids[70:][::-1]
+        assert [m["id"] for m in older] == ids[20:70][::-1]
+        assert len(last) == 20
+
+    def test_around_centres_on_message(self) -> None:
+        fake = FakeDiscord(messages=120)
+        target = fake.message_ids[60]
+
+        page = fake.history_page(50, around=target)
+
+        assert [m["id"] for m in page] == fake.message_ids[35:85][::-1]
+
+    def test_replies_carry_their_parent(self) -> None:
+        fake = FakeDiscord(messages=20)
+        reply = next(m for m in fake.history if m.get("message_reference"))
+
+        assert reply["type"] == 19
+        assert reply["referenced_message"]["id"] == reply["message_reference"]["message_id"]
+
+    def test_routes_api_and_channel_page(self) -> None:
+        fake = FakeDiscord(messages=120, latency_ms=7)
+        route = MagicMock()
+        route.request.url = (
+            f"https://discord.com/api/v9/channels/{fake.channel_id}/messages?limit=50"
+        )
+        fake._handle(route)
+        body = json.loads(route.fulfill.call_args.kwargs["body"])
+        assert len(body) == 50 and fake.api_requests == 1
+
+        route.request.url = f"https://discord.com/channels/{fake.server_id}/{fake.channel_id}"
+        fake._handle(route)
+        html = route.fulfill.call_args.kwargs["body"]
+        assert '"latency_ms": 7' in html and "__CONFIG__" not in html
+
+
+@pytest.fixture()
+def scraper(tmp_path: Path) -> Iterator[PlaywrightDiscordScraper]:
+    scraper = PlaywrightDiscordScraper(
+        user_data_dir=str(tmp_path / "profile"), headless=True, scroll_timeout_ms=1500
+    )
+    try:
+        scraper.start()
+    except Exception as e:
+        scraper.close()
+        pytest.skip(f"Chromium not available: {str(e).splitlines()[0]}")
+    try:
+        yield scraper
+    finally:
+        scraper.close()
+
+
+class TestScrollLoop:
+    @pytest.mark.parametrize(
+        ("engine", "capture"),
+        [("dom", False), ("dom", True), ("columns", False), ("network", False)],
+    )
+    def test_scrapes_whole_channel(
+        self, tmp_path: Path, scraper: PlaywrightDiscordScraper, engine: str, capture: bool
+    ) -> None:
+        # A window smaller than the channel forces nodes to be recycled.
+        fake = FakeDiscord(messages=300, page_size=50, latency_ms=20, window=120)
+        fake.install(scraper.page.context)
+        db_path = tmp_path / "dreader.db"
+        db = ScrapeDB(str(db_path))
+        session = PlaywrightScrapeSession(
+            server_id=fake.server_id,
+            channel_id=fake.channel_id,
+            max_scrolls=20,
+            scraper=scraper,
+            db=db,
+            engine=engine,
+            capture=capture,
+        )
+
+        result = session.run()
+        db.close()
+
+        assert result["status"] == "completed"
+        assert fake.api_requests == 7  # six full pages, then the empty one
+        conn = sqlite3.connect(db_path)
+        stored = {r[0] for r in conn.execute("SELECT id FROM messages")}
+        assert stored == set(fake.message_ids)
+
+    def test_login_timeout_without_chat_input(
+        self, scraper: PlaywrightDiscordScraper
+    ) -> None:
+        fake = FakeDiscord(messages=10, logged_in=False)
+        fake.install(scraper.page.context)
+        scraper.navigate_to_channel(fake.server_id, fake.channel_id)
+
+        assert scraper.wait_for_login(timeout=1) is False
+
+    @pytest.mark.parametrize("logged_in", [True, False])
+    def test_login_check_on_home_view(
+        self, scraper: PlaywrightDiscordScraper, logged_in: bool
+    ) -> None:
+        fake = FakeDiscord(messages=10, logged_in=logged_in)
+        fake.install(scraper.page.context)
+        scraper.open_home()
+
+        assert scraper.wait_for_server_list(timeout=1) is logged_in
+        assert fake.api_requests == 0
+
+    def test_channel_start_in_another_locale(self, scraper: PlaywrightDiscordScraper) -> None:
+        # Fewer messages than a page: the first load already reaches the start.
+        fake = FakeDiscord(messages=20, latency_ms=0)
+        fake.install(scraper.page.context)
+        scraper.navigate_to_channel(fake.server_id, fake.channel_id)
+        scraper.page.wait_for_selector("#channel-start:not([hidden])")
+        scraper.page.evaluate(
+            """() => {
+                const start = document.getElementById('channel-start');
+                start.querySelector('h3').textContent = 'Willkommen in #general!';
+                start.querySelector('div').textContent = 'Dies ist der Anfang des Kanals.';
+            }"""
+        )
+
+        result = scraper.scroll_up()
+
+        assert (result.at_top, result.stalled) == (True, False)
@@ -0,0 +1,83 @@
+"""Tests for the JSONL ComponentLogger and its shared background sink."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.retrieval.logger import ComponentLogger, _sink_for, flush_logs
+
+
+def _lines(log_dir: Path) -> list[str]:
+    (path,) = log_dir.glob("dreader-*.jsonl")
+    return path.read_text(encoding="utf-8").splitlines()
+
+
+class TestComponentLogger:
+    def test_lines_match_entry_json(self, tmp_path: Path) -> None:
+        log = ComponentLogger("retrieval.test", "info", str(tmp_path), use_console=False)
+        log.info("plain")
+        log.warn('quote " ünïcode', {"n": [1, 2.5, None], "é": {"ok": True}})
+        log.close()
+
+        lines = _lines(tmp_path)
+        entries = [json.loads(line) for line in lines]
+        expected = [
+            {
+                "timestamp": entries[0]["timestamp"],
+                "level": "info",
+                "component": "retrieval.test",
+                "message": "plain",
+            },
+            {
+                "timestamp": entries[1]["timestamp"],
+                "level": "warn",
+                "component": "retrieval.test",
+                "message": 'quote " ünïcode',
+                "data": {"n": [1, 2.5, None], "é": {"ok": True}},
+            },
+        ]
+        assert lines == [json.dumps(e) for e in expected]
+
+    def test_console_format(
+        self, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        log = ComponentLogger("retrieval.test", "info", str(tmp_path))
+        log.info("Navigated", {"url": "x"})
+        log.info("No data", {})
+        log.flush()
+
+        err = capsys.readouterr().err.splitlines()
+        assert err[0][8:] == ' INFO  [retrieval.test] Navigated {"url": "x"}'
+        assert err[1][8:] == " INFO  [retrieval.test] No data"
+
+    def test_level_filter_skips_formatting(self, tmp_path: Path) -> None:
+        log = ComponentLogger("retrieval.test", "info", str(tmp_path), use_console=False)
+        # Not JSON-serializable: would raise if a debug line were formatted.
+        log.debug("skipped", {"obj": object()})
+        log.info("kept")
+        log.close()
+
+        assert [json.loads(line)["message"] for line in _lines(tmp_path)] == ["kept"]
+
+    def test_children_share_one_sink(self, tmp_path: Path) -> None:
+        log = ComponentLogger("retrieval", "info", str(tmp_path), use_console=False)
+        child = log.child("session")
+        log.info("parent")
+        child.info("child")
+        flush_logs()
+
+        assert child._sink is log._sink is _sink_for(str(tmp_path))
+        components = [json.loads(line)["component"] for line in _lines(tmp_path)]
+        assert components == ["retrieval", "retrieval.session"]
+
+    def test_error_is_on_disk_when_call_returns(self, tmp_path: Path) -> None:
+        log = ComponentLogger("retrieval.test", "info", str(tmp_path), use_console=False)
+        for i in range(500):
+            log.info("batch", {"i": i})
+        log.error("boom")
+
+        lines = _lines(tmp_path)
+        assert len(lines) == 501
+        assert json.loads(lines[-1])["level"] == "error"
@@ -0,0 +1,188 @@
+"""Tests for log rotation, compression, retention and the logs query."""
+from __future__ import annotations
+
+import gzip
+import json
+from pathlib import Path
+
+import pytest
+
+from src.retrieval.cli import main
+from src.retrieval.logger import _LogSink
+from src.retrieval.logs import (
+    LogQuery,
+    compress_log,
+    iter_log_lines,
+    log_files,
+    maintain,
+    read_index,
+)
+
+
+def _line(
+    ts: str, component: str = "retrieval.session", level: str = "info", **data: object
+) -> str:
+    entry: dict[str, object] = {
+        "timestamp": ts,
+        "level": level,
+        "component": component,
+        "message": "m",
+    }
+    if data:
+        entry["data"] = data
+    return json.dumps(entry) + "\n"
+
+
+def _write_day(path: Path, day: str, hours: range, per_hour: int = 3) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for h in hours:
+            for i in range(per_hour):
+                f.write(_line(f"{day}T{h:02d}:0{i}:00.000Z", n=i))
+
+
+def _messages(log_dir: Path, query: LogQuery) -> list[str]:
+    return [entry["timestamp"] for entry, _ in iter_log_lines(log_dir, query)]
+
+
+class TestCompression:
+    def test_one_member_per_hour_with_index(self, tmp_path: Path) -> None:
+        path = tmp_path / "dreader-2026-05-01.jsonl"
+        _write_day(path, "2026-05-01", range(3))
+        original = path.read_bytes()
+
+        target = compress_log(path)
+
+        assert not path.exists()
+        assert gzip.decompress(target.read_bytes()) == original
+        index = read_index(target)
+        assert list(index) == ["2026-05-01T00", "2026-05-01T01", "2026-05-01T02"]
+        # Each offset starts a gzip member holding exactly that hour.
+        with open(target, "rb") as raw:
+            raw.seek(index["2026-05-01T01"])
+            first = gzip.GzipFile(fileobj=raw).readline()
+        assert json.loads(first)["timestamp"] == "2026-05-01T01:00:00.000Z"
+
+    def test_retention_deletes_old_and_compresses_closed(self, tmp_path: Path) -> None:
+        _write_day(tmp_path / "dreader-2026-03-01.jsonl", "2026-03-01", range(1))
+        _write_day(tmp_path / "dreader-2026-04-30.jsonl", "2026-04-30", range(1))
+        _write_day(tmp_path / "dreader-2026-05-01.1.jsonl", "2026-05-01", range(1))
+        _write_day(tmp_path / "dreader-2026-05-01.jsonl", "2026-05-01", range(1))
+
+        maintain(tmp_path, "2026-05-01", retention_days=30)
+
+        # Today's files, rotated part included, may still have a writer.
+        assert sorted(p.name for p in tmp_path.iterdir()) == [
+            "dreader-2026-04-30.jsonl.gz",
+            "dreader-2026-04-30.jsonl.gz.idx",
+            "dreader-2026-05-01.1.jsonl",
+            "dreader-2026-05-01.jsonl",
+        ]
+
+
+class TestRotation:
+    def test_sink_rotates_past_max_bytes(self, tmp_path: Path) -> None:
+        sink = _LogSink(tmp_path, max_bytes=1000)
+        for i in range(42):
+            sink.put("2026-05-01T10", _line(f"2026-05-01T10:00:{i:02d}.000Z", i=i))
+            sink.flush()
+        sink.stop()
+
+        names = [log.path.name for log in log_files(tmp_path)]
+        assert names[0] == "dreader-2026-05-01.1.jsonl"
+        assert names[-1] == "dreader-2026-05-01.jsonl"
+        # Nothing lost or reordered across the parts.
+        assert [e["data"]["i"] for e, _ in iter_log_lines(tmp_path, LogQuery())] == list(
+            range(42)
+        )
+
+        # Parts stay plain for the rest of the day, then are gzipped.
+        maintain(tmp_path, "2026-05-02")
+        assert all(log.compressed for log in log_files(tmp_path))
+        assert len(list(iter_log_lines(tmp_path, LogQuery()))) == 42
+
+    def test_other_writer_keeps_its_lines(self, tmp_path: Path) -> None:
+        # Stands in for the TypeScript logger's append handle on the same file.
+        active = tmp_path / "dreader-2026-05-01.jsonl"
+        other = open(active, "ab")
+        sink = _LogSink(tmp_path, max_bytes=200)
+        sink.put("2026-05-01T10", _line("2026-05-01T10:00:00.000Z", i=0))
+        sink.put("2026-05-01T10", _line("2026-05-01T10:00:01.000Z", i=1))
+        sink.flush()
+        other.write(_line("2026-05-01T10:00:02.000Z", i=2).encode())
+        other.close()
+        sink.put("2026-05-01T10", _line("2026-05-01T10:00:03.000Z", i=3))
+        sink.stop()
+
+        assert len(log_files(tmp_path)) == 2
+        found = sorted(e["data"]["i"] for e, _ in iter_log_lines(tmp_path, LogQuery()))
+        assert found == [0, 1, 2, 3]
+
+    def test_active_file_index_offsets(self, tmp_path: Path) -> None:
+        sink = _LogSink(tmp_path)
+        sink.put("2026-05-01T10", _line("2026-05-01T10:00:00.000Z"))
+        sink.flush()
+        sink.put("2026-05-01T11", _line("2026-05-01T11:00:00.000Z"))
+        sink.stop()
+
+        active = tmp_path / "dreader-2026-05-01.jsonl"
+        index = read_index(active)
+        with open(active, "rb") as f:
+            f.seek(index["2026-05-01T11"])
+            assert json.loads(f.readline())["timestamp"].startswith("2026-05-01T11")
+
+    def test_since_keeps_other_writers_earlier_lines(self, tmp_path: Path) -> None:
+        active = tmp_path / "dreader-2026-05-01.jsonl"
+        sink = _LogSink(tmp_path)
+        sink.put("2026-05-01T10", _line("2026-05-01T10:00:00.000Z", i=0))
+        sink.stop()
+        # The other writer logs hour 11 before the next scrape's sink indexes it.
+        with open(active, "ab") as other:
+            other.write(_line("2026-05-01T11:00:00.000Z", i=1).encode())
+        sink = _LogSink(tmp_path)
+        sink.put("2026-05-01T11", _line("2026-05-01T11:00:01.000Z", i=2))
+        sink.stop()
+
+        query = LogQuery(since="2026-05-01T11:00:00")
+        assert [e["data"]["i"] for e, _ in iter_log_lines(tmp_path, query)] == [1, 2]
+
+
+class TestQuery:
+    @pytest.fixture()
+    def log_dir(self, tmp_path: Path) -> Path:
+        old = tmp_path / "dreader-2026-04-30.jsonl"
+        _write_day(old, "2026-04-30", range(22, 24))
+        compress_log(old)
+        with open(tmp_path / "dreader-2026-05-01.jsonl", "w", encoding="utf-8") as f:
+            f.write(_line("2026-05-01T00:30:00.000Z", "retrieval", "debug"))
+            f.write(_line("2026-05-01T01:00:00.000Z", "retrieval.session", "warn", job={"id": 7}))
+            f.write(_line("2026-05-01T02:00:00.000Z", "retrievalx", "error", job={"id": 8}))
+        return tmp_path
+
+    def test_time_window_spans_gz_and_plain(self, log_dir: Path) -> None:
+        query = LogQuery(since="2026-04-30T23:01:00", until="2026-05-01T01:00:00")
+
+        assert _messages(log_dir, query) == [
+            "2026-04-30T23:01:00.000Z",
+            "2026-04-30T23:02:00.000Z",
+            "2026-05-01T00:30:00.000Z",
+        ]
+
+    def test_component_prefix_and_level(self, log_dir: Path) -> None:
+        query = LogQuery(since="2026-05-01", component="retrieval", min_level="info")
+
+        assert _messages(log_dir, query) == ["2026-05-01T01:00:00.000Z"]
+
+    def test_data_key_and_value(self, log_dir: Path) -> None:
+        assert len(_messages(log_dir, LogQuery(data={"job.id": None}))) == 2
+        assert _messages(log_dir, LogQuery(data={"job.id": "8"})) == [
+            "2026-05-01T02:00:00.000Z"
+        ]
+
+    def test_logs_command(self, log_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+        main(["logs", "--log-dir", str(log_dir), "--level", "warn", "--limit", "1"])
+        out = capsys.readouterr().out.splitlines()
+        assert [json.loads(line)["level"] for line in out] == ["warn"]
+
+        main(["logs", "--log-dir", str(log_dir), "--data", "job.id=8", "--pretty"])
+        out = capsys.readouterr().out.splitlines()
+        assert out == ['2026-05-01 02:00:00 ERROR [retrievalx] m {"job": {"id": 8}}']
@@ -0,0 +1,53 @@
+"""Tests for per-phase scrape metrics."""
+from __future__ import annotations
+
+from src.retrieval.metrics import ScrapeMetrics, payload_bytes, percentile
+
+
+class TestPercentile:
+    def test_nearest_rank(self) -> None:
+        samples = [float(n) for n in range(10, 0, -1)]
+        assert percentile(samples, 50) == 5.0
+        assert percentile(samples, 95) == 10.0
+        assert percentile([3.0], 95) == 3.0
+        assert percentile([], 50) == 0.0
+
+
+class TestScrapeMetrics:
+    def test_phase_times_each_call(self) -> None:
+        metrics = ScrapeMetrics()
+        for _ in range(3):
+            with metrics.phase("extract"):
+                pass
+        assert len(metrics.samples["extract"]) == 3
+        assert metrics.total("extract") >= 0
+
+    def test_rows_in_phase_order_with_units(self) -> None:
+        metrics = ScrapeMetrics()
+        metrics.add("scroll_wait", 100.0)
+        metrics.add("navigate", 40.0)
+        metrics.add("scroll_wait", 300.0)
+        metrics.add("payload_bytes", payload_bytes([{"id": "1"}]))
+
+        assert metrics.rows() == [
+            ("navigate", "ms", 40.0, 1, 40.0, 40.0, 40.0),
+            ("scroll_wait", "ms", 400.0, 2, 100.0, 300.0, 300.0),
+            ("payload_bytes", "bytes", 12.0, 1, 12.0, 12.0, 12.0),
+        ]
+        assert metrics.summary() == {
+            "navigate_ms": 40.0,
+            "scroll_wait_ms": 400.0,
+            "payload_bytes": 12,
+        }
+
+    def test_combine_and_breakdown(self) -> None:
+        a, b = ScrapeMetrics(), ScrapeMetrics()
+        a.add("db_write", 5.0)
+        b.add("db_write", 7.0)
+        b.add("scroll_wait", 1500.0)
+
+        merged = ScrapeMetrics.combine([a, b])
+
+        assert merged.samples["db_write"] == [5.0, 7.0]
+        assert merged.breakdown() == "scroll_wait 1.50s, db_write 12.0ms"
+        assert len(merged.table()) == 3
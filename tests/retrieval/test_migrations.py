@@ -0,0 +1,57 @@
+"""Tests for the versioned schema bootstrap."""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from src.retrieval.db import ScrapeDB
+from src.retrieval.migrations import (
+    MIGRATIONS_DIR,
+    apply_migrations,
+    latest_version,
+    schema_version,
+)
+
+
+class TestApplyMigrations:
+    def test_fresh_db_reaches_latest(self, tmp_path: Path) -> None:
+        conn = sqlite3.connect(str(tmp_path / "dreader.db"))
+        assert apply_migrations(conn) == latest_version()
+        assert schema_version(conn) == latest_version()
+        tables = {
+            r[0] for r in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        }
+        assert {"servers", "channels", "messages", "scrape_jobs"} <= tables
+
+    def test_up_to_date_db_runs_no_ddl(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "dreader.db")
+        ScrapeDB(db_path).close()
+
+        statements: list[str] = []
+        conn = sqlite3.connect(db_path)
+        conn.set_trace_callback(statements.append)
+        apply_migrations(conn)
+        assert statements == ["PRAGMA user_version"]
+
+    def test_upgrades_legacy_unversioned_db(self, tmp_path: Path) -> None:
+        conn = sqlite3.connect(str(tmp_path / "dreader.db"))
+        conn.executescript((MIGRATIONS_DIR / "0001_baseline.sql").read_text())
+        conn.execute(
+            "INSERT INTO servers (id, name) VALUES ('srv1', 'TestServer')"
+        )
+        conn.commit()
+        assert schema_version(conn) == 0
+
+        apply_migrations(conn)
+        assert schema_version(conn) == latest_version()
+        assert conn.execute("SELECT name FROM servers").fetchone()[0] == "TestServer"
+
+    def test_migrations_are_ordered(self, tmp_path: Path) -> None:
+        migrations = tmp_path / "migrations"
+        migrations.mkdir()
+        (migrations / "0001_a.sql").write_text("CREATE TABLE a (x INTEGER);")
+        (migrations / "0002_b.sql").write_text("INSERT INTO a VALUES (1);")
+        (migrations / "notes.txt").write_text("ignored")
+        conn = sqlite3.connect(":memory:")
+        assert apply_migrations(conn, migrations) == 2
+        assert conn.execute("SELECT x FROM a").fetchone()[0] == 1
@@ -0,0 +1,103 @@
+"""Tests for the network-response capture engine."""
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from src.retrieval.network_capture import (
+    NetworkCapture,
+    normalize_timestamp,
+    parse_api_messages,
+)
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+@pytest.fixture()
+def history_page() -> list[dict[str, Any]]:
+    """A recorded ``GET /api/v9/channels/987/messages`` payload, newest first."""
+    payload: list[dict[str, Any]] = json.loads(
+        (FIXTURES / "history_page.json").read_text(encoding="utf-8")
+    )
+    return payload
+
+
+class TestParseApiMessages:
+    def test_skips_system_messages(self, history_page: list[dict[str, Any]]) -> None:
+        rows = parse_api_messages(history_page, "987", "srv1")
+        assert [r.message_id for r in rows] == ["1234567893", "1234567891", "1234567890"]
+
+    def test_maps_full_row(self, history_page: list[dict[str, Any]]) -> None:
+        reply = parse_api_messages(history_page, "987", "srv1")[0]
+        assert reply.author_id == "42"
+        assert reply.author_name == "Bob"
+        assert reply.author_avatar_url == "https://cdn.discordapp.com/avatars/42/a1b2c3.png"
+        assert reply.reply_to_message_id == "1234567890"
+        assert reply.timestamp == "2026-04-28T12:03:00.250Z"
+        assert reply.edited_timestamp == "2026-04-28T12:05:10.000Z"
+        assert reply.is_pinned is True
+        assert json.loads(reply.attachment_urls) == [
+            "https://cdn.discordapp.com/attachments/987/555/plot.png"
+        ]
+        assert reply.has_attachments is True
+        assert reply.message_url == "https://discord.com/channels/srv1/987/1234567893"
+
+    def test_embeds_and_username_fallback(self, history_page: list[dict[str, Any]]) -> None:
+        link = parse_api_messages(history_page, "987", "srv1")[1]
+        assert link.author_name == "alice"
+        assert link.has_embeds is True
+        assert json.loads(link.embed_data)[0]["title"] == "Article"
+        assert link.edited_timestamp is None
+
+
+class TestNormalizeTimestamp:
+    def test_matches_dom_format(self) -> None:
+        assert normalize_timestamp("2026-04-28T12:00:00+00:00") == "2026-04-28T12:00:00.000Z"
+
+    def test_passes_through_unparseable(self) -> None:
+        assert normalize_timestamp("Today at 3:45 PM") == "Today at 3:45 PM"
+        assert normalize_timestamp(None) == ""
+
+
+@pytest.fixture()
+def page() -> Iterator[Any]:
+    sync_api = pytest.importorskip("playwright.sync_api")
+    with sync_api.sync_playwright() as pw:
+        try:
+            browser = pw.chromium.launch()
+        except Exception as e:
+            pytest.skip(f"Chromium not available: {str(e).splitlines()[0]}")
+        try:
+            yield browser.new_page()
+        finally:
+            browser.close()
+
+
+class TestNetworkCaptureInBrowser:
+    def test_captures_routed_history_response(
+        self, page: Any, history_page: list[dict[str, Any]]
+    ) -> None:
+        page.route(
+            "https://discord.com/api/v9/channels/*/messages*",
+            lambda route: route.fulfill(json=history_page),
+        )
+        page.route(
+            "https://discord.com/channels/srv1/987",
+            lambda route: route.fulfill(
+                content_type="text/html",
+                body="<script>fetch('/api/v9/channels/987/messages?limit=50')</script>",
+            ),
+        )
+        capture = NetworkCapture(page, "987", "srv1")
+        with page.expect_response("**/api/v9/channels/987/messages*"):
+            page.goto("https://discord.com/channels/srv1/987")
+
+        rows = capture.drain()
+        capture.close()
+
+        assert [r.message_id for r in rows] == ["1234567893", "1234567891", "1234567890"]
+        assert capture.drain() == []
@@ -0,0 +1,85 @@
+"""Tests for keyset pagination and the page cache."""
+from __future__ import annotations
+
+import pytest
+
+from src.retrieval.db import MessageRow, ScrapeDB
+from src.retrieval.query import MessageQuery, fetch_page, iter_channel_messages
+
+from .conftest import message_row
+
+
+def _nth(n: int, channel: str = "ch1") -> MessageRow:
+    """Seed message n: id 1000+n, one second after message n-1."""
+    return message_row(
+        f"{1000 + n}", channel, ts=f"2026-04-28T12:{n // 60:02d}:{n % 60:02d}.000Z"
+    )
+
+
+@pytest.fixture()
+def db(db: ScrapeDB) -> ScrapeDB:
+    db.insert_messages([_nth(n) for n in range(25)])
+    db.insert_messages([_nth(100, "ch2")])
+    return db
+
+
+class TestKeysetPagination:
+    def test_pages_cover_channel_without_overlap(self, db: ScrapeDB) -> None:
+        ids: list[str] = []
+        page = fetch_page(db._conn, "ch1", limit=10)
+        ids += [m.id for m in page.messages]
+        while page.next_cursor is not None:
+            page = fetch_page(db._conn, "ch1", after=page.next_cursor, limit=10)
+            ids += [m.id for m in page.messages]
+        assert ids == [f"{1000 + n}" for n in reversed(range(25))]
+
+    def test_oldest_first(self, db: ScrapeDB) -> None:
+        page = fetch_page(db._conn, "ch1", limit=3, newest_first=False)
+        assert [m.id for m in page.messages] == ["1000", "1001", "1002"]
+
+    def test_ties_on_timestamp_break_by_id(self, db: ScrapeDB) -> None:
+        same = MessageRow(
+            message_id="0999",
+            channel_id="ch1",
+            author_id="bob",
+            author_name="bob",
+            content="same second",
+            timestamp=_nth(0).timestamp,
+            server_id="srv1",
+        )
+        db.insert_messages([same])
+        first = fetch_page(db._conn, "ch1", limit=1, newest_first=False)
+        second = fetch_page(db._conn, "ch1", after=first.next_cursor, limit=1, newest_first=False)
+        assert [first.messages[0].id, second.messages[0].id] == ["0999", "1000"]
+
+    def test_iterator_streams_in_chunks(self, db: ScrapeDB) -> None:
+        streamed = list(iter_channel_messages(db._conn, "ch1", chunk_size=4))
+        assert len(streamed) == 25
+        assert streamed[0].id == "1000"
+
+
+class TestMessageQueryCache:
+    def test_repeat_page_is_cached(self, db: ScrapeDB) -> None:
+        query = MessageQuery(db._conn)
+        first = query.page("ch1", limit=5)
+        assert query.page("ch1", limit=5) is first
+        assert (query.hits, query.misses) == (1, 1)
+
+    def test_insert_invalidates_only_that_channel(self, db: ScrapeDB) -> None:
+        query = MessageQuery(db._conn)
+        query.watch(db)
+        ch1 = query.page("ch1", limit=5)
+        ch2 = query.page("ch2", limit=5)
+
+        db.insert_messages([_nth(30)])
+
+        assert query.page("ch2", limit=5) is ch2
+        refreshed = query.page("ch1", limit=5)
+        assert refreshed is not ch1
+        assert refreshed.messages[0].id == "1030"
+
+    def test_lru_eviction(self, db: ScrapeDB) -> None:
+        query = MessageQuery(db._conn, cache_pages=1)
+        first = query.page("ch1", limit=5)
+        query.page("ch2", limit=5)
+        assert query.page("ch1", limit=5) is not first
@@ -0,0 +1,117 @@
+"""Tests for recording scrapes and replaying them offline."""
+from __future__ import annotations
+
+import gzip
+import json
+import sqlite3
+from pathlib import Path
+from unittest.mock import MagicMock
+
+import pytest
+
+from src.retrieval.discord_playwright_scraper import PlaywrightDiscordScraper
+from src.retrieval.errors import RecordingError
+from src.retrieval.recording import Recorder, read_recording
+from src.retrieval.replay import load_channel_recordings, replay_recording
+
+
+def _raw(message_id: str, content: str) -> dict[str, object]:
+    return {
+        "id": f"chat-messages-ch1-{message_id}",
+        "author": "Alice",
+        "timestamp": "2026-04-28T12:00:00Z",
+        "content": content,
+        "reply_id": None,
+        "attachments": [],
+    }
+
+
+def _write_dom_recording(path: Path) -> None:
+    rec = Recorder(path)
+    login, tab = rec.new_tab(), rec.new_tab()
+    rec.record(login, "navigate", server_id="srv1", channel_id="ch1", message_id=None)
+    rec.record(tab, "navigate", server_id="srv1", channel_id="ch1", message_id=None)
+    rec.record(tab, "extract", raw=[_raw("300", "newest"), _raw("200", "middle")])
+    rec.record(tab, "scroll", at_top=False, waited_ms=120.0)
+    rec.record(tab, "extract", raw=[_raw("200", "middle"), _raw("100", "oldest")])
+    rec.record(tab, "scroll", at_top=True, waited_ms=500.0)
+    rec.record(tab, "extract", raw=[])
+    rec.close()
+
+
+class TestRecorder:
+    def test_scraper_records_page_results(self, tmp_path: Path) -> None:
+        path = tmp_path / "run.jsonl.gz"
+        rec = Recorder(path)
+        page = MagicMock()
+        page.evaluate.return_value = [_raw("300", "newest")]
+        scraper = PlaywrightDiscordScraper(recorder=rec)
+        scraper._page = page
+
+        assert [m.message_id for m in scraper.extract_new_messages()] == ["300"]
+        rec.close()
+
+        header, events = read_recording(path)
+        assert header["version"] == 1
+        assert list(events) == [
+            {"op": "extract", "tab": 1, "raw": [_raw("300", "newest")]}
+        ]
+
+    def test_unknown_version_is_rejected(self, tmp_path: Path) -> None:
+        path = tmp_path / "old.jsonl.gz"
+        with gzip.open(path, "wt") as f:
+            f.write(json.dumps({"version": 99}) + "\n")
+        with pytest.raises(RecordingError):
+            read_recording(path)
+
+
+class TestReplay:
+    def test_channels_split_by_navigation(self, tmp_path: Path) -> None:
+        path = tmp_path / "run.jsonl.gz"
+        _write_dom_recording(path)
+
+        channels = load_channel_recordings(path)
+
+        # The login check navigated but recorded nothing, so it is dropped.
+        assert len(channels) == 1
+        assert (channels[0].channel_id, channels[0].engine) == ("ch1", "dom")
+        assert channels[0].scrolls == 2
+
+    def test_replay_ingests_recorded_passes(self, tmp_path: Path) -> None:
+        path = tmp_path / "run.jsonl.gz"
+        db_path = tmp_path / "replay.db"
+        _write_dom_recording(path)
+
+        report = replay_recording(path, str(db_path))
+
+        assert (report.channels, report.passes) == (1, 3)
+        assert (report.inserted, report.messages) == (3, 3)
+        assert report.messages_per_sec > 0
+        conn = sqlite3.connect(db_path)
+        ids = [r[0] for r in conn.execute("SELECT id FROM messages ORDER BY id")]
+        assert ids == ["100", "200", "300"]
+
+    def test_replay_columns_recording(self, tmp_path: Path) -> None:
+        path = tmp_path / "run.jsonl.gz"
+        rec = Recorder(path)
+        tab = rec.new_tab()
+        rec.record(tab, "navigate", server_id="srv1", channel_id="ch1", message_id=None)
+        rec.record(
+            tab,
+            "columns",
+            raw={
+                "ids": ["200", "100"],
+                "authors": ["Alice", "Bob"],
+                "timestamps": ["2026-04-28T12:00:00Z", "2026-04-28T11:00:00Z"],
+                "contents": ["hi", "hello"],
+                "reply_ids": [None, None],
+                "attachments": ["[]", "[]"],
+            },
+        )
+        rec.record(tab, "scroll", at_top=True, waited_ms=0.0)
+        rec.close()
+
+        report = replay_recording(path)
+
+        assert load_channel_recordings(path)[0].engine == "columns"
+        assert report.inserted == 2
@@ -0,0 +1,156 @@
+"""Tests for ScrapeRun browser reuse across channels."""
+from __future__ import annotations
+
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from src.retrieval.cli import main
+from src.retrieval.db import InsertResult
+from src.retrieval.discord_playwright_scraper import DiscordMessage, ScrollResult
+from src.retrieval.registry import ChannelTarget
+from src.retrieval.scrape_run import ScrapeRun
+
+
+def _targets(n: int) -> list[ChannelTarget]:
+    return [
+        ChannelTarget(
+            channel_id=f"ch{i}",
+            channel_name=f"channel-{i}",
+            server_id="srv1",
+            server_name="TestServer",
+        )
+        for i in range(n)
+    ]
+
+
+@pytest.fixture()
+def mock_scraper() -> MagicMock:
+    scraper = MagicMock()
+    scraper.wait_for_server_list.return_value = True
+    scraper.page_healthy = True
+    scraper.extract_new_messages.return_value = [
+        DiscordMessage(content="hello", message_id="111"),
+    ]
+    scraper.finish_scroll.return_value = ScrollResult(at_top=True, waited_ms=0.0)
+    return scraper
+
+
+@pytest.fixture()
+def mock_db() -> MagicMock:
+    db = MagicMock()
+    db.create_scrape_job.return_value = 1
+    db.get_channel_watermark.return_value = (None, None)
+    db.insert_messages.side_effect = lambda rows, **kwargs: InsertResult(
+        inserted=len(rows)
+    )
+    return db
+
+
+@patch("src.retrieval.scrape_run.PlaywrightDiscordScraper")
+@patch("src.retrieval.scrape_run.ScrapeDB")
+class TestScrapeRun:
+    def test_launches_browser_once(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        mock_scraper_cls.return_value = mock_scraper
+        mock_db_cls.return_value = mock_db
+
+        results = list(ScrapeRun(_targets(3)).run())
+
+        assert [r["status"] for _, r in results] == ["completed"] * 3
+        mock_scraper.start.assert_called_once()
+        mock_scraper.wait_for_server_list.assert_called_once()
+        mock_scraper.close.assert_called_once()
+        mock_db.close.assert_called_once()
+        # Login is checked on the home view, so each channel loads only once.
+        mock_scraper.open_home.assert_called_once()
+        assert mock_scraper.navigate_to_channel.call_count == 3
+
+    def test_login_timeout_fails_all_targets(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        mock_scraper.wait_for_server_list.return_value = False
+        mock_scraper_cls.return_value = mock_scraper
+        mock_db_cls.return_value = mock_db
+
+        results = list(ScrapeRun(_targets(2)).run())
+
+        assert [r["error"] for _, r in results] == ["login_timeout"] * 2
+        mock_db.create_scrape_job.assert_not_called()
+        mock_scraper.close.assert_called_once()
+
+    def test_page_crash_reopens_tab_only(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        def crash_once() -> list[DiscordMessage]:
+            mock_scraper.extract_new_messages.side_effect = None
+            mock_scraper.page_healthy = False
+            raise RuntimeError("Target crashed")
+
+        def reopen() -> None:
+            mock_scraper.page_healthy = True
+
+        mock_scraper.extract_new_messages.side_effect = crash_once
+        mock_scraper.reopen_page.side_effect = reopen
+        mock_scraper_cls.return_value = mock_scraper
+        mock_db_cls.return_value = mock_db
+
+        results = list(ScrapeRun(_targets(2)).run())
+
+        assert [r["status"] for _, r in results] == ["completed", "completed"]
+        mock_scraper.reopen_page.assert_called_once()
+        mock_scraper.start.assert_called_once()
+
+    def test_concurrency_spreads_targets_across_tabs(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        calls: list[str] = []
+        tab = MagicMock()
+        tab.page_healthy = True
+        tab.extract_new_messages.return_value = [
+            DiscordMessage(content="hi", message_id="222"),
+        ]
+        tab.finish_scroll.return_value = ScrollResult(at_top=True, waited_ms=0.0)
+        mock_scraper.begin_scroll.side_effect = lambda: calls.append("begin-0")
+        mock_scraper.finish_scroll.side_effect = lambda _: (
+            calls.append("finish-0") or ScrollResult(at_top=True, waited_ms=0.0)
+        )
+        tab.begin_scroll.side_effect = lambda: calls.append("begin-1")
+        mock_scraper.open_tab.return_value = tab
+        mock_scraper_cls.return_value = mock_scraper
+        mock_db_cls.return_value = mock_db
+
+        results = list(ScrapeRun(_targets(3), concurrency=2).run())
+
+        assert sorted(t.channel_id for t, _ in results) == ["ch0", "ch1", "ch2"]
+        assert all(r["status"] == "completed" for _, r in results)
+        mock_scraper.open_tab.assert_called_once()
+        # Both tabs request history before either waits for it
+        assert calls[:3] == ["begin-0", "begin-1", "finish-0"]
+        assert tab.navigate_to_channel.call_count >= 1
+        tab.close.assert_called_once()
+        mock_scraper.close.assert_called_once()
+
+
+class TestScrapeCommand:
+    def test_capture_requires_dom_engine(self, capsys: pytest.CaptureFixture[str]) -> None:
+        with pytest.raises(SystemExit):
+            main(["--target", "ch1", "--engine", "columns", "--capture"])
+        assert "--capture only applies to --engine dom" in capsys.readouterr().err
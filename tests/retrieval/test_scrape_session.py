@@ -5,15 +5,17 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.retrieval.discord_playwright_scraper import DiscordMessage
-from src.retrieval.scrape_session import PlaywrightScrapeSession
+from src.retrieval.db import InsertResult, MessageColumns, MessageRow
+from src.retrieval.discord_playwright_scraper import DiscordMessage, ScrollResult
+from src.retrieval.metrics import ScrapeMetrics
+from src.retrieval.scrape_session import PlaywrightScrapeSession, ScrapeProgress
 
 
 @pytest.fixture()
 def mock_scraper() -> MagicMock:
     scraper = MagicMock()
     scraper.wait_for_login.return_value = True
-    scraper.extract_messages.return_value = [
+    scraper.extract_new_messages.return_value = [
         DiscordMessage(
             content="hello",
             author="Alice",
@@ -25,9 +27,12 @@ def mock_scraper() -> MagicMock:
             author="Bob",
             timestamp="2026-04-28T12:01:00Z",
             message_id="222",
+            is_reply=True,
+            reply_to_id="111",
         ),
     ]
-    scraper.scroll_up.return_value = True  # at top after first scroll
+    # At top after the first scroll
+    scraper.finish_scroll.return_value = ScrollResult(at_top=True, waited_ms=0.0)
     return scraper
 
 
@@ -35,7 +40,10 @@ def mock_scraper() -> MagicMock:
 def mock_db() -> MagicMock:
     db = MagicMock()
     db.create_scrape_job.return_value = 1
-    db.insert_message.return_value = True
+    db.get_channel_watermark.return_value = (None, None)
+    db.insert_messages.side_effect = lambda rows, **kwargs: InsertResult(
+        inserted=len(rows)
+    )
     return db
 
 
@@ -62,12 +70,38 @@ class TestPlaywrightScrapeSession:
 
         assert result["status"] == "completed"
         assert result["messages_scraped"] == 2
+        assert result["messages_inserted"] == 2
+        mock_db.insert_messages.assert_called_once()
+        rows = mock_db.insert_messages.call_args.args[0]
+        assert [r.reply_to_message_id for r in rows] == [None, "111"]
         mock_db.ensure_server.assert_called_once_with("srv1", "TestServer")
         mock_db.ensure_channel.assert_called_once_with("ch1", "srv1", "general")
         mock_scraper.start.assert_called_once()
         mock_scraper.close.assert_called_once()
         mock_db.close.assert_called_once()
 
+    def test_phase_metrics_in_result_and_db(
+        self, mock_scraper: MagicMock, mock_db: MagicMock
+    ) -> None:
+        mock_scraper.finish_scroll.side_effect = [
+            ScrollResult(at_top=False, waited_ms=120.0),
+            ScrollResult(at_top=True, waited_ms=500.0),
+        ]
+        session = PlaywrightScrapeSession(
+            server_id="srv1", channel_id="ch1", scraper=mock_scraper, db=mock_db
+        )
+
+        result = session.run()
+
+        metrics = result["metrics"]
+        assert isinstance(metrics, ScrapeMetrics)
+        assert metrics.samples["scroll_wait"] == [120.0, 500.0]
+        assert len(metrics.samples["dedupe"]) == 2  # one per pass
+        assert {"navigate", "login_wait", "db_write"} <= set(metrics.samples)
+        assert "launch" not in metrics.samples  # borrowed scraper
+        mock_db.record_job_metrics.assert_called_once_with(1, metrics.rows())
+        assert mock_scraper.metrics is None  # detached once the run is over
+
     @patch("src.retrieval.scrape_session.PlaywrightDiscordScraper")
     @patch("src.retrieval.scrape_session.ScrapeDB")
     def test_login_timeout(
@@ -102,10 +136,13 @@ class TestPlaywrightScrapeSession:
         scraper = MagicMock()
         scraper.wait_for_login.return_value = True
         # Same messages returned on both passes
-        scraper.extract_messages.return_value = [
+        scraper.extract_new_messages.return_value = [
             DiscordMessage(content="hello", message_id="111"),
         ]
-        scraper.scroll_up.side_effect = [False, True]  # not at top, then at top
+        scraper.finish_scroll.side_effect = [
+            ScrollResult(at_top=False, waited_ms=120.0),
+            ScrollResult(at_top=True, waited_ms=0.0),
+        ]
         mock_scraper_cls.return_value = scraper
         mock_db_cls.return_value = mock_db
 
@@ -116,6 +153,306 @@ class TestPlaywrightScrapeSession:
         )
         result = session.run()
 
-        # insert_message called only once despite two extraction passes
-        assert mock_db.insert_message.call_count == 1
+        # One batch despite two extraction passes; the repeat pass is empty
+        assert mock_db.insert_messages.call_count == 1
+        rows = mock_db.insert_messages.call_args.args[0]
+        assert [r.message_id for r in rows] == ["111"]
+        assert result["scroll_wait_ms"] == 120
+        assert result["status"] == "completed"
+
+    def test_borrowed_scraper_and_db_are_not_closed(
+        self,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        session = PlaywrightScrapeSession(
+            server_id="srv1",
+            channel_id="ch1",
+            scraper=mock_scraper,
+            db=mock_db,
+            check_login=False,
+        )
+        result = session.run()
+
+        assert result["status"] == "completed"
+        mock_scraper.start.assert_not_called()
+        mock_scraper.wait_for_login.assert_not_called()
+        mock_scraper.close.assert_not_called()
+        mock_db.close.assert_not_called()
+
+    def test_capture_mode_drains_observer_buffer(
+        self,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        mock_scraper.drain_capture.side_effect = [
+            [DiscordMessage(content="hello", message_id="111")],
+            [DiscordMessage(content="older", message_id="100")],
+        ]
+        mock_scraper.finish_scroll.side_effect = [
+            ScrollResult(at_top=False, waited_ms=0.0),
+            ScrollResult(at_top=True, waited_ms=0.0),
+        ]
+        session = PlaywrightScrapeSession(
+            server_id="srv1",
+            channel_id="ch1",
+            max_scrolls=5,
+            scraper=mock_scraper,
+            db=mock_db,
+            check_login=False,
+            capture=True,
+        )
+        result = session.run()
+
+        assert result["messages_scraped"] == 2
+        mock_scraper.start_capture.assert_called_once()
+        mock_scraper.stop_capture.assert_called_once()
+        mock_scraper.extract_new_messages.assert_not_called()
+
+    def test_steps_pause_while_history_loads(
+        self,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        session = PlaywrightScrapeSession(
+            server_id="srv1",
+            channel_id="ch1",
+            scraper=mock_scraper,
+            db=mock_db,
+            check_login=False,
+        )
+        steps = session.steps()
+        next(steps)
+        mock_scraper.begin_scroll.assert_called_once()
+        mock_scraper.finish_scroll.assert_not_called()
+
+        # A driver abandoning the session leaves a failed, resumable job
+        steps.close()
+        mock_db.update_job_status.assert_called_with(1, "failed", "Interrupted")
+
+    @patch("src.retrieval.scrape_session.PlaywrightDiscordScraper")
+    @patch("src.retrieval.scrape_session.ScrapeDB")
+    def test_incremental_stops_at_watermark(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        scraper = MagicMock()
+        scraper.wait_for_login.return_value = True
+        scraper.extract_new_messages.return_value = [
+            DiscordMessage(content="old", message_id="100", timestamp="t100"),
+            DiscordMessage(content="new", message_id="300", timestamp="t300"),
+        ]
+        scraper.finish_scroll.return_value = ScrollResult(at_top=False, waited_ms=0.0)
+        mock_scraper_cls.return_value = scraper
+        mock_db.get_channel_watermark.return_value = ("200", "t200")
+        mock_db_cls.return_value = mock_db
+
+        session = PlaywrightScrapeSession(
+            server_id="srv1", channel_id="ch1", max_scrolls=10, incremental=True
+        )
+        result = session.run()
+
+        assert result["status"] == "completed"
+        mock_db.create_scrape_job.assert_called_once_with(
+            "ch1", "incremental", resumed_from_job_id=None
+        )
+        scraper.finish_scroll.assert_not_called()
+        rows = mock_db.insert_messages.call_args.args[0]
+        assert [r.message_id for r in rows] == ["300"]
+        mock_db.update_channel_watermark.assert_called_once_with("ch1", "300", "t300")
+
+    @patch("src.retrieval.scrape_session.PlaywrightDiscordScraper")
+    @patch("src.retrieval.scrape_session.ScrapeDB")
+    def test_watermark_held_when_run_leaves_a_gap(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        scraper = MagicMock()
+        scraper.wait_for_login.return_value = True
+        scraper.extract_new_messages.return_value = [
+            DiscordMessage(content="new", message_id="300"),
+        ]
+        # Never reaches the top
+        scraper.finish_scroll.return_value = ScrollResult(at_top=False, waited_ms=0.0)
+        mock_scraper_cls.return_value = scraper
+        mock_db.get_channel_watermark.return_value = ("200", "t200")
+        mock_db_cls.return_value = mock_db
+
+        session = PlaywrightScrapeSession(
+            server_id="srv1", channel_id="ch1", max_scrolls=1, incremental=True
+        )
+        result = session.run()
+
         assert result["status"] == "completed"
+        mock_db.update_channel_watermark.assert_not_called()
+
+    @patch("src.retrieval.scrape_session.PlaywrightDiscordScraper")
+    @patch("src.retrieval.scrape_session.ScrapeDB")
+    def test_stalled_scrolls_fail_without_moving_watermark(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        scraper = MagicMock()
+        scraper.wait_for_login.return_value = True
+        scraper.extract_new_messages.side_effect = [
+            [DiscordMessage(content="new", message_id="300")],
+            [],
+            [],
+        ]
+        # A slow history fetch: not the channel start.
+        scraper.finish_scroll.return_value = ScrollResult(
+            at_top=False, waited_ms=10_000.0, stalled=True
+        )
+        mock_scraper_cls.return_value = scraper
+        mock_db.get_channel_watermark.return_value = ("200", "t200")
+        mock_db_cls.return_value = mock_db
+
+        session = PlaywrightScrapeSession(
+            server_id="srv1", channel_id="ch1", max_scrolls=10, incremental=True
+        )
+        result = session.run()
+
+        assert result["status"] == "failed"
+        assert scraper.finish_scroll.call_count == 3
+        mock_db.update_channel_watermark.assert_not_called()
+        mock_db.update_job_status.assert_called_once_with(
+            1, "failed", "History stopped loading after 3 scrolls"
+        )
+
+    @patch("src.retrieval.scrape_session.PlaywrightDiscordScraper")
+    @patch("src.retrieval.scrape_session.ScrapeDB")
+    def test_resume_continues_from_checkpoint(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        mock_scraper_cls.return_value = mock_scraper
+        mock_db.find_resumable_job.return_value = (7, "150")
+        mock_db_cls.return_value = mock_db
+
+        session = PlaywrightScrapeSession(server_id="srv1", channel_id="ch1", resume=True)
+        result = session.run()
+
+        assert result["status"] == "completed"
+        mock_db.create_scrape_job.assert_called_once_with(
+            "ch1", "full", resumed_from_job_id=7
+        )
+        mock_scraper.navigate_to_channel.assert_called_once_with("srv1", "ch1", "150")
+        # Batch IDs 111/222 are older than the checkpoint, so it moves down
+        assert mock_db.insert_messages.call_args.kwargs["checkpoint"] == "111"
+
+    @patch("src.retrieval.scrape_session.PlaywrightDiscordScraper")
+    @patch("src.retrieval.scrape_session.ScrapeDB")
+    def test_interrupt_marks_job_failed(
+        self,
+        mock_db_cls: MagicMock,
+        mock_scraper_cls: MagicMock,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        mock_scraper.extract_new_messages.side_effect = KeyboardInterrupt
+        mock_scraper_cls.return_value = mock_scraper
+        mock_db_cls.return_value = mock_db
+
+        session = PlaywrightScrapeSession(server_id="srv1", channel_id="ch1")
+        with pytest.raises(KeyboardInterrupt):
+            session.run()
+
+        mock_db.update_job_status.assert_called_with(1, "failed", "Interrupted")
+        mock_scraper.close.assert_called_once()
+
+    def test_network_engine_ingests_api_rows(
+        self,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        row = MessageRow(
+            message_id="300",
+            channel_id="ch1",
+            author_id="42",
+            author_name="Bob",
+            content="from the API",
+            timestamp="2026-04-28T12:00:00.000Z",
+            server_id="srv1",
+            is_pinned=True,
+        )
+        mock_scraper.drain_network_capture.return_value = [row]
+        session = PlaywrightScrapeSession(
+            server_id="srv1",
+            channel_id="ch1",
+            scraper=mock_scraper,
+            db=mock_db,
+            check_login=False,
+            engine="network",
+        )
+        result = session.run()
+
+        assert result["messages_scraped"] == 1
+        assert mock_db.insert_messages.call_args.args[0] == [row]
+        mock_scraper.start_network_capture.assert_called_once_with("ch1", "srv1")
+        mock_scraper.stop_network_capture.assert_called_once()
+        mock_scraper.extract_new_messages.assert_not_called()
+
+    def test_columns_engine_inserts_columnar_batch(
+        self,
+        mock_scraper: MagicMock,
+        mock_db: MagicMock,
+    ) -> None:
+        mock_scraper.extract_new_columns.return_value = MessageColumns(
+            "ch1", "srv1", ["111"], ["Alice"], ["2026-04-28T12:00:00.000Z"],
+            ["hello"], [None], ["[]"],
+        )
+        mock_db.insert_columns.side_effect = lambda batch, **kwargs: InsertResult(
+            inserted=len(batch)
+        )
+        session = PlaywrightScrapeSession(
+            server_id="srv1",
+            channel_id="ch1",
+            scraper=mock_scraper,
+            db=mock_db,
+            check_login=False,
+            engine="columns",
+            capture=True,
+        )
+        result = session.run()
+
+        assert result["messages_inserted"] == 1
+        mock_scraper.extract_new_columns.assert_called_with("ch1", "srv1")
+        mock_db.insert_messages.assert_not_called()
+        # Capture is a dom-engine mode; nothing would drain its buffer here.
+        mock_scraper.start_capture.assert_not_called()
+
+
+class TestScrapeProgress:
+    def test_rows_carry_attachment_urls(self) -> None:
+        url = "https://cdn.discordapp.com/attachments/1/2/cat.png"
+        progress = ScrapeProgress("srv1", "ch1", known_id=None)
+        batch, overlap = progress.add(
+            [DiscordMessage(content="", message_id="5", attachment_urls=[url])]
+        )
+        assert not overlap
+        assert batch[0].attachment_urls == f'["{url}"]'
+        assert batch[0].has_attachments is True
+
+    def test_columns_keep_only_new_and_track_bounds(self) -> None:
+        cols = MessageColumns(
+            "ch1", "srv1", ["101", "102", "103"], ["a", "b", "c"],
+            ["t1", "t2", "t3"], ["x", "y", "z"], [None, "101", None], ["[]"] * 3,
+        )
+        progress = ScrapeProgress("srv1", "ch1", known_id="101", incremental=True)
+        batch, overlap = progress.add_columns(cols)
+        assert overlap
+        assert batch.ids == ["102", "103"]
+        assert batch.reply_ids == ["101", None]
+        assert progress.newest is not None and progress.newest.message_id == "103"
+        assert progress.oldest == "102"
+        again, _ = progress.add_columns(cols)
+        assert len(again) == 0
@@ -0,0 +1,89 @@
+"""Tests for FTS5 message search."""
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from src.retrieval.cli import main
+from src.retrieval.db import ScrapeDB
+from src.retrieval.search import rebuild_index, search_messages, to_match_expression
+
+from .conftest import message_row
+
+
+@pytest.fixture()
+def db(db: ScrapeDB) -> ScrapeDB:
+    db.insert_messages(
+        [
+            message_row(
+                "1", author="Alice", content="the deploy failed again",
+                ts="2026-04-01T10:00:00.000Z",
+            ),
+            message_row(
+                "2", author="Bob", content="deploy is green now",
+                ts="2026-04-02T10:00:00.000Z",
+            ),
+            message_row(
+                "3", author="Alice", content="lunch anyone?",
+                ts="2026-04-03T10:00:00.000Z",
+            ),
+            message_row(
+                "4", "ch2", author="Carol", content="deploy notes posted",
+                ts="2026-04-04T10:00:00.000Z",
+            ),
+        ]
+    )
+    return db
+
+
+class TestSearchMessages:
+    def test_triggers_index_new_rows(self, db: ScrapeDB) -> None:
+        hits = search_messages(db._conn, "deploy")
+        assert {h.message_id for h in hits} == {"1", "2", "4"}
+
+    def test_channel_filter(self, db: ScrapeDB) -> None:
+        hits = search_messages(db._conn, "deploy", channel_id="ch2")
+        assert [h.message_id for h in hits] == ["4"]
+        assert hits[0].channel_name == "random"
+
+    def test_author_filter_is_case_insensitive(self, db: ScrapeDB) -> None:
+        hits = search_messages(db._conn, "deploy", author="alice")
+        assert [h.message_id for h in hits] == ["1"]
+
+    def test_time_window(self, db: ScrapeDB) -> None:
+        hits = search_messages(
+            db._conn,
+            "deploy",
+            since="2026-04-02T00:00:00.000Z",
+            until="2026-04-04T00:00:00.000Z",
+        )
+        assert [h.message_id for h in hits] == ["2"]
+
+    def test_snippet_highlights_terms(self, db: ScrapeDB) -> None:
+        hits = search_messages(db._conn, "lunch", highlight=("[", "]"))
+        assert hits[0].snippet == "[lunch] anyone?"
+
+    def test_newest_first(self, db: ScrapeDB) -> None:
+        hits = search_messages(db._conn, "deploy", newest_first=True)
+        assert [h.message_id for h in hits] == ["4", "2", "1"]
+
+    def test_free_text_is_quoted(self) -> None:
+        assert to_match_expression('c++ "x') == '"c++" """x"'
+
+    def test_rebuild_restores_index(self, db: ScrapeDB) -> None:
+        db._conn.execute("INSERT INTO messages_fts(messages_fts) VALUES ('delete-all')")
+        assert search_messages(db._conn, "deploy") == []
+        assert rebuild_index(db._conn) == 4
+        assert len(search_messages(db._conn, "deploy")) == 3
+
+
+class TestSearchCommand:
+    def test_prints_hits(
+        self, db: ScrapeDB, tmp_path: Path, capsys: pytest.CaptureFixture[str]
+    ) -> None:
+        db.close()
+        main(["search", "lunch", "--db-path", str(tmp_path / "dreader.db")])
+        out = capsys.readouterr().out
+        assert "#general  Alice: **lunch** anyone?" in out
+        assert "1 result(s)" in out
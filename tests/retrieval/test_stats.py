@@ -0,0 +1,66 @@
+"""Tests for ingest-maintained channel stats and activity rollups."""
+from __future__ import annotations
+
+import pytest
+
+from src.retrieval.db import ScrapeDB
+from src.retrieval.stats import (
+    author_activity,
+    channel_stats,
+    hourly_activity,
+    rebuild_stats,
+)
+
+from .conftest import message_row
+
+
+@pytest.fixture()
+def db(db: ScrapeDB) -> ScrapeDB:
+    db.insert_messages(
+        [
+            message_row("1", author="alice", ts="2026-04-28T12:00:00.000Z"),
+            message_row("2", author="alice", ts="2026-04-28T12:30:00.000Z"),
+            message_row("3", author="bob", ts="2026-04-28T13:05:00.000Z"),
+            message_row("4", "ch2", author="carol", ts="2026-04-28T13:10:00.000Z"),
+        ]
+    )
+    return db
+
+
+class TestIngestRollups:
+    def test_channel_counts(self, db: ScrapeDB) -> None:
+        counts = {c.channel_id: c.message_count for c in channel_stats(db._conn)}
+        assert counts == {"ch1": 3, "ch2": 1}
+
+    def test_duplicates_not_counted(self, db: ScrapeDB) -> None:
+        db.insert_messages(
+            [
+                message_row("3", author="bob", ts="2026-04-28T13:05:00.000Z"),
+                message_row("5", author="bob", ts="2026-04-28T13:20:00.000Z"),
+            ]
+        )
+        counts = {c.channel_id: c.message_count for c in channel_stats(db._conn)}
+        assert counts["ch1"] == 4
+        assert hourly_activity(db._conn, "ch1") == [("2026-04-28T12", 2), ("2026-04-28T13", 2)]
+
+    def test_author_activity(self, db: ScrapeDB) -> None:
+        assert author_activity(db._conn, "ch1") == [("alice", 2), ("bob", 1)]
+        assert author_activity(db._conn, since="2026-04-28T13:00:00.000Z") == [
+            ("bob", 1),
+            ("carol", 1),
+        ]
+
+    def test_completed_job_sets_last_scraped(self, db: ScrapeDB) -> None:
+        job_id = db.create_scrape_job("ch1")
+        db.update_job_status(job_id, "completed")
+        scraped = {c.channel_id: c.last_scraped for c in channel_stats(db._conn)}
+        assert scraped["ch1"] is not None
+        assert scraped["ch2"] is None
+
+    def test_rebuild_matches_incremental(self, db: ScrapeDB) -> None:
+        before = (channel_stats(db._conn), author_activity(db._conn))
+        db._conn.execute("DELETE FROM channel_activity_hourly")
+        db._conn.execute("UPDATE channels SET message_count = 0")
+        db._conn.commit()
+        rebuild_stats(db._conn)
+        assert (channel_stats(db._conn), author_activity(db._conn)) == before
@@ -0,0 +1,68 @@
+"""Tests for reply-forest thread reconstruction."""
+from __future__ import annotations
+
+import pytest
+
+from src.retrieval.db import ScrapeDB
+from src.retrieval.thread import ThreadCache, load_reply_forest
+
+from .conftest import message_row
+
+
+def _at(minute: int) -> str:
+    return f"2026-04-28T12:{minute:02d}:00.000Z"
+
+
+@pytest.fixture()
+def db(db: ScrapeDB) -> ScrapeDB:
+    # 1 ─┬─ 2 ── 4
+    #    └─ 3
+    # 5 (standalone), 6 replies to a message we never scraped
+    db.insert_messages(
+        [
+            message_row("1", ts=_at(0)),
+            message_row("2", ts=_at(1), reply_to="1"),
+            message_row("3", ts=_at(2), reply_to="1"),
+            message_row("4", ts=_at(3), reply_to="2"),
+            message_row("5", ts=_at(4)),
+            message_row("6", ts=_at(5), reply_to="999"),
+        ]
+    )
+    return db
+
+
+class TestReplyForest:
+    def test_roots_include_orphans(self, db: ScrapeDB) -> None:
+        forest = load_reply_forest(db._conn, "ch1")
+        assert forest.roots == ["1", "5", "6"]
+        assert forest.threads() == ["1"]
+
+    def test_size_and_depth(self, db: ScrapeDB) -> None:
+        forest = load_reply_forest(db._conn, "ch1")
+        assert forest.size("1") == 4
+        assert forest.depth("1") == 3
+        assert forest.size("5") == 1
+        assert forest.depth("5") == 1
+
+    def test_flatten_is_preorder_by_time(self, db: ScrapeDB) -> None:
+        forest = load_reply_forest(db._conn, "ch1")
+        assert forest.flatten("1") == [("1", 0), ("2", 1), ("4", 2), ("3", 1)]
+
+    def test_root_of(self, db: ScrapeDB) -> None:
+        forest = load_reply_forest(db._conn, "ch1")
+        assert forest.root_of("4") == "1"
+        assert forest.root_of("6") == "6"
+
+
+class TestThreadCache:
+    def test_reuses_forest_until_insert(self, db: ScrapeDB) -> None:
+        cache = ThreadCache(db._conn)
+        cache.watch(db)
+        first = cache.forest("ch1")
+        assert cache.forest("ch1") is first
+
+        db.insert_messages([message_row("7", ts=_at(6), reply_to="4")])
+
+        refreshed = cache.forest("ch1")
+        assert refreshed is not first
+        assert refreshed.depth("1") == 4
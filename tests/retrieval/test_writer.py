@@ -0,0 +1,47 @@
+"""Tests for the background SQLite writer."""
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from src.retrieval.writer import BackgroundWriter
+
+from .conftest import message_row
+
+
+class TestBackgroundWriter:
+    def test_batches_commit_in_order(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "dreader.db")
+        writer = BackgroundWriter(db_path, max_pending=1)
+        writer.ensure_server("srv1", "TestServer")
+        writer.ensure_channel("ch1", "srv1", "general")
+        job_id = writer.create_scrape_job("ch1")
+        first = writer.insert_messages([message_row("1"), message_row("2")], job_id=job_id)
+        second = writer.insert_messages([message_row("2"), message_row("3")], job_id=job_id)
+        writer.close()
+
+        assert first.result().inserted == 2
+        assert second.result().inserted == 1
+        assert second.result().duplicates == 1
+        conn = sqlite3.connect(db_path)
+        count = conn.execute("SELECT COUNT(*) FROM messages").fetchone()[0]
+        assert count == 3
+
+    def test_uses_wal_journal(self, tmp_path: Path) -> None:
+        db_path = str(tmp_path / "dreader.db")
+        writer = BackgroundWriter(db_path)
+        writer.flush()
+        conn = sqlite3.connect(db_path)
+        mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        writer.close()
+        assert mode == "wal"
+
+    def test_write_error_reaches_future(self, tmp_path: Path) -> None:
+        writer = BackgroundWriter(str(tmp_path / "dreader.db"))
+
+        def boom(db: object) -> None:
+            raise ValueError("boom")
+
+        future = writer.submit(boom)
+        writer.close()
+        assert isinstance(future.exception(), ValueError)